@@ -0,0 +1,228 @@
+"""
+Benchmark the sync and async clients against a local simulated TV.
+
+Usage: python -m benchmarks.run [--iterations N] [--image-size BYTES] [--json]
+
+A simulated TV (samsungtvws.simulator) runs in a separate process so client
+timings and memory peaks are not mixed up with the server side. It replays
+the channel frames recorded in tests/fixtures. Each scenario runs twice:
+once for timing and once under tracemalloc for the memory peak.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from samsungtvws import SamsungTVWS
+from samsungtvws.art import SamsungTVArt
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.remote import SendRemoteKey
+
+Metrics = dict[str, float]
+Scenario = Callable[[], Metrics]
+
+
+def _summary(prefix: str, samples: list[float]) -> Metrics:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return {
+        f"{prefix}_median_ms": statistics.median(samples) * 1000,
+        f"{prefix}_p95_ms": p95 * 1000,
+    }
+
+
+def _throughput(prefix: str, size: int, elapsed: float) -> Metrics:
+    return {f"{prefix}_mb_s": size / elapsed / 1_000_000}
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, "tests", "fixtures")
+
+
+class SimulatorProcess:
+    """Run samsungtvws.simulator in a child process on a free port."""
+
+    def __init__(self) -> None:
+        self.process: subprocess.Popen[str] | None = None
+        self.port = 0
+
+    def __enter__(self) -> SimulatorProcess:
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "samsungtvws.simulator",
+                "--count",
+                "1",
+                "--frames",
+                FIXTURES_DIR,
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=ROOT_DIR,
+        )
+        assert self.process.stdout
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("TV simulator failed to start")
+        self.port = int(line.rsplit(":", 1)[1])
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        if self.process:
+            self.process.terminate()
+            self.process.wait()
+
+
+class Benchmarks:
+    def __init__(self, port: int, iterations: int, image_size: int) -> None:
+        self.port = port
+        self.iterations = iterations
+        self.image = os.urandom(image_size)
+
+    def scenarios(self) -> dict[str, Scenario]:
+        return {
+            "sync_connect": self.sync_connect,
+            "sync_keys": self.sync_keys,
+            "async_connect": lambda: asyncio.run(self.async_connect()),
+            "async_keys": lambda: asyncio.run(self.async_keys()),
+            "art_rtt": self.art_rtt,
+            "art_upload": self.art_upload,
+            "art_thumbnail": self.art_thumbnail,
+        }
+
+    # -------------------------
+    # Sync remote
+    # -------------------------
+    def _remote(self) -> SamsungTVWS:
+        return SamsungTVWS("127.0.0.1", port=self.port, key_press_delay=0)
+
+    def sync_connect(self) -> Metrics:
+        samples = []
+        for _ in range(self.iterations):
+            tv = self._remote()
+            start = time.perf_counter()
+            tv.open()
+            samples.append(time.perf_counter() - start)
+            tv.close()
+        return _summary("connect", samples)
+
+    def sync_keys(self) -> Metrics:
+        count = self.iterations * 10
+        with self._remote() as tv:
+            tv.open()
+            start = time.perf_counter()
+            for _ in range(count):
+                tv.send_command(SendRemoteKey.click("KEY_VOLUP"))
+            elapsed = time.perf_counter() - start
+        return {"keys_per_s": count / elapsed}
+
+    # -------------------------
+    # Async remote
+    # -------------------------
+    def _async_remote(self) -> SamsungTVWSAsyncRemote:
+        return SamsungTVWSAsyncRemote("127.0.0.1", port=self.port, key_press_delay=0)
+
+    async def async_connect(self) -> Metrics:
+        samples = []
+        for _ in range(self.iterations):
+            tv = self._async_remote()
+            start = time.perf_counter()
+            await tv.open()
+            samples.append(time.perf_counter() - start)
+            await tv.close()
+        return _summary("connect", samples)
+
+    async def async_keys(self) -> Metrics:
+        count = self.iterations * 10
+        async with self._async_remote() as tv:
+            await tv.open()
+            start = time.perf_counter()
+            for _ in range(count):
+                await tv.send_command(SendRemoteKey.click("KEY_VOLUP"))
+            elapsed = time.perf_counter() - start
+        return {"keys_per_s": count / elapsed}
+
+    # -------------------------
+    # Art (sync only)
+    # -------------------------
+    def _art(self) -> SamsungTVArt:
+        return SamsungTVArt("127.0.0.1", port=self.port, timeout=30, key_press_delay=0)
+
+    def art_rtt(self) -> Metrics:
+        samples = []
+        with self._art() as art:
+            for _ in range(self.iterations):
+                start = time.perf_counter()
+                art.get_api_version()
+                samples.append(time.perf_counter() - start)
+        return _summary("rtt", samples)
+
+    def art_upload(self) -> Metrics:
+        with self._art() as art:
+            start = time.perf_counter()
+            art.upload(self.image, file_type="jpg")
+            elapsed = time.perf_counter() - start
+        return _throughput("upload", len(self.image), elapsed)
+
+    def art_thumbnail(self) -> Metrics:
+        with self._art() as art:
+            content_id = art.upload(self.image, file_type="jpg")
+            start = time.perf_counter()
+            art.get_thumbnail(content_id)
+            elapsed = time.perf_counter() - start
+        return _throughput("thumbnail", len(self.image), elapsed)
+
+
+def _measure_peak(scenario: Scenario) -> float:
+    tracemalloc.start()
+    try:
+        scenario()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run(iterations: int, image_size: int) -> dict[str, Metrics]:
+    results: dict[str, Metrics] = {}
+    with SimulatorProcess() as tv:
+        bench = Benchmarks(tv.port, iterations, image_size)
+        for name, scenario in bench.scenarios().items():
+            metrics = scenario()
+            metrics["peak_kib"] = _measure_peak(scenario)
+            results[name] = metrics
+    return results
+
+
+def _print_table(results: dict[str, Metrics]) -> None:
+    for name, metrics in results.items():
+        values = ", ".join(f"{key}={value:.2f}" for key, value in metrics.items())
+        print(f"{name:<15} {values}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="samsungtvws benchmarks")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--image-size", type=int, default=8 * 1024 * 1024)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations, args.image_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ import wakeonlan
 sys.path.append("../")
 
 from samsungtvws import SamsungTVWS  # noqa: E402
+from samsungtvws.command import SamsungTVWaitForEventCommand  # noqa: E402
+from samsungtvws.event import ED_APPS_LAUNCH_EVENT  # noqa: E402
+from samsungtvws.remote import ChannelEmitCommand, SendRemoteKey  # noqa: E402
 
 # Increase debug level
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +37,16 @@ logging.info(apps)
 # Open app (Spotify)
 tv.run_app("3201606009684")
 
+# Open app (Spotify) and press enter as soon as the TV reports the launch
+# (instead of a fixed SamsungTVSleepCommand, waits at most 10 seconds)
+tv.send_command(
+    [
+        ChannelEmitCommand.launch_app("3201606009684"),
+        SamsungTVWaitForEventCommand(ED_APPS_LAUNCH_EVENT, timeout=10),
+        SendRemoteKey.enter(),
+    ]
+)
+
 # Get app status (Spotify)
 app = tv.rest_app_status("3201606009684")
 logging.info(app)
@@ -6,7 +6,33 @@ Copyright (C) 2019 DSR! <xchwarze@gmail.com>
 SPDX-License-Identifier: LGPL-3.0
 """
 
-from .art import SamsungTVArt
-from .remote import SamsungTVWS
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .art import SamsungTVArt
+    from .remote import SamsungTVWS
 
 __all__ = ["SamsungTVWS", "SamsungTVArt"]
+
+# Loaded on first access (PEP 562): importing the package stays cheap and
+# does not pull in websocket-client and requests until they are needed.
+_LAZY_ATTRIBUTES = {
+    "SamsungTVArt": ".art",
+    "SamsungTVWS": ".remote",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
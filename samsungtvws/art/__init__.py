@@ -7,5 +7,17 @@ SPDX-License-Identifier: LGPL-3.0
 """
 
 from .art import SamsungTVArt
+from .catalog import ArtCatalog
+from .d2d import TransferProgress
+from .dedupe import UploadIndex
+from .preprocess import ImagePreprocessor
+from .rotation import ArtRotator
 
-__all__ = ["SamsungTVArt"]
+__all__ = [
+    "ArtCatalog",
+    "ArtRotator",
+    "ImagePreprocessor",
+    "SamsungTVArt",
+    "TransferProgress",
+    "UploadIndex",
+]
@@ -9,23 +9,38 @@ SPDX-License-Identifier: LGPL-3.0
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from contextlib import AbstractContextManager, closing, contextmanager, nullcontext
 from datetime import datetime
 import json
 import logging
 import os
 import socket
+import time
 from typing import IO, Any, cast
 import uuid
 
 import websocket
 
-from .. import exceptions, helper
+from .. import exceptions
 from ..command import SamsungTVCommand
 from ..connection import SamsungTVWSConnection
 from ..event import D2D_SERVICE_MESSAGE_EVENT, MS_CHANNEL_READY_EVENT
-from ..helper import generate_connection_id, get_ssl_context
+from ..helper import generate_connection_id
+from ..instrumentation import Span, Trace
 from ..rest import SamsungTVRest
+from .catalog import ArtCatalog
+from .d2d import (
+    D2DTransfer,
+    ProgressMonitor,
+    TransferCallback,
+    file_name,
+    open_d2d_socket,
+)
+from .dedupe import UploadIndex
+from .export import METADATA_NAME, THUMBNAIL_DIR, LibraryWriter
+from .preprocess import ImagePreprocessor
+from .retry import RetryPolicy
 
 # for typing
 JsonObj = dict[str, Any]
@@ -33,6 +48,9 @@ WsFrame = dict[str, Any]
 
 _LOGGING = logging.getLogger(__name__)
 ART_ENDPOINT = "com.samsung.art-app"
+# Image upload transports
+UPLOAD_WS_BINARY = "ws_binary"
+UPLOAD_D2D = "d2d"
 
 
 class ArtChannelEmitCommand(SamsungTVCommand):
@@ -75,6 +93,14 @@ class SamsungTVArt(SamsungTVWSConnection):
             name=name,
         )
         self._rest_api: SamsungTVRest | None = None
+        self._trace: Trace | None = None
+        # Set to skip uploads of images the TV already has
+        self.upload_index: UploadIndex | None = None
+        # Set to retry failed upload transfers
+        self.retry_policy: RetryPolicy | None = None
+        self._catalog: ArtCatalog | None = None
+        # Upload transport that worked last, kept across reconnections
+        self._upload_transport: str | None = None
 
     def open(self) -> websocket.WebSocket:
         super().open()
@@ -85,8 +111,46 @@ class SamsungTVArt(SamsungTVWSConnection):
             self.close()
             raise exceptions.ConnectionFailure(frame)
 
+        # Events may have been missed while disconnected
+        self._catalog = None
         return self.connection
 
+    def _websocket_event(self, event: str, response: dict[str, Any]) -> None:
+        super()._websocket_event(event, response)
+        if self._catalog is not None and event == D2D_SERVICE_MESSAGE_EVENT:
+            payload = self._decode_d2d_payload(response)
+            if payload:
+                self._catalog.apply_event(payload)
+
+    @contextmanager
+    def trace(self, callback: Callable[[Span], None] | None = None) -> Iterator[Trace]:
+        """
+        Record spans for the phases of the Art operations run inside the block.
+
+            with art.trace() as trace:
+                art.upload("image.jpg")
+            print(trace.breakdown())
+
+        Every request gets a "request" span for the send (including the
+        key_press_delay) and a span named after the awaited event for the TV
+        reply; uploads and thumbnails add "d2d_connect" and "d2d_send" or
+        "d2d_recv". The trace is stored on the connection, so it is not
+        re-entrant across threads sharing one SamsungTVArt.
+        """
+        previous = self._trace
+        self._trace = trace = Trace(callback)
+        try:
+            yield trace
+        finally:
+            self._trace = previous
+
+    def _span(
+        self, name: str, **attributes: Any
+    ) -> AbstractContextManager[Span | None]:
+        if self._trace is None:
+            return nullcontext()
+        return self._trace.span(name, **attributes)
+
     def _new_request_uuid(self) -> str:
         """Return a fresh uuid to correlate a single request/response."""
         return str(uuid.uuid4())
@@ -99,7 +163,7 @@ class SamsungTVArt(SamsungTVWSConnection):
         assert self.connection
         try:
             raw = self.connection.recv()
-            frame = helper.process_api_response(raw)
+            frame = self._parse_frame(raw)
 
             # Always propagate events to keep internal connection state in sync
             event = frame.get("event", "*")
@@ -131,52 +195,26 @@ class SamsungTVArt(SamsungTVWSConnection):
 
     def _open_d2d_socket(self, conn_info: JsonObj) -> socket.socket:
         """Open a TCP socket to the TV D2D endpoint (optionally TLS-wrapped)."""
-        raw_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-        # Best-effort timeout: avoid hanging forever on connect/recv.
-        # Samsung's D2D endpoint can be flaky depending on firmware.
-        if self.timeout is not None:
-            try:
-                raw_sock.settimeout(self.timeout)
-            except OSError:
-                pass
-
-        sock = (
-            get_ssl_context().wrap_socket(raw_sock)
-            if conn_info.get("secured", False)
-            else raw_sock
-        )
-        sock.connect((conn_info["ip"], int(conn_info["port"])))
-
-        # Ensure recv/send timeout is applied to the final socket
-        if self.timeout is not None:
-            try:
-                sock.settimeout(self.timeout)
-            except OSError:
-                pass
-
-        return sock
-
-    def _recv_d2d_file(self, sock: socket.socket) -> tuple[str, bytearray, int, int]:
-        """Receive a single D2D file payload."""
-        header_len = int.from_bytes(self._recv_exact(sock, 4), "big")
-        header = json.loads(self._recv_exact(sock, header_len))
-
-        size = int(header["fileLength"])
-        name = f"{header['fileID']}.{header['fileType']}"
-        data = self._recv_exact(sock, size)
-
-        return name, bytearray(data), int(header["num"]), int(header["total"])
-
-    def _recv_exact(self, sock: socket.socket, size: int) -> bytes:
-        """Receive exactly `size` bytes from socket or fail."""
-        buf = bytearray()
-        while len(buf) < size:
-            chunk = sock.recv(size - len(buf))
-            if not chunk:
-                raise exceptions.ConnectionFailure({"reason": "socket closed"})
-            buf.extend(chunk)
-        return bytes(buf)
+        return open_d2d_socket(conn_info, self.timeout)
+
+    def _open_d2d_transfer(self, conn_info: JsonObj) -> D2DTransfer:
+        with self._span("d2d_connect", ip=conn_info.get("ip")):
+            return D2DTransfer(self._open_d2d_socket(conn_info), self.stats)
+
+    def _iter_d2d_files(
+        self, payload: JsonObj, progress: ProgressMonitor | None = None
+    ) -> Generator[tuple[str, bytearray], None, None]:
+        """Receive the files announced by a D2D payload, as they arrive."""
+        on_header = progress.on_header if progress is not None else None
+        with self._open_d2d_transfer(self._parse_conn_info(payload)) as transfer:
+            total = 1
+            current = -1
+            while current + 1 < total:
+                with self._span("d2d_recv"):
+                    header, data = transfer.recv_file(progress, on_header)
+                current = int(header["num"])
+                total = int(header["total"])
+                yield file_name(header), data
 
     def _wait_for_d2d(
         self,
@@ -244,11 +282,27 @@ class SamsungTVArt(SamsungTVWSConnection):
         payload["id"] = req_id
         payload["request_id"] = req_id
 
-        self.send_command(ArtChannelEmitCommand.art_app_request(payload))
+        with self._span("request", request=payload.get("request")):
+            self.send_command(ArtChannelEmitCommand.art_app_request(payload))
+        # RTT is measured from the frame send, not including key_press_delay
+        sent_at = self._last_command_sent
 
         if not wait_for_event:
             return None
 
+        with self._span(wait_for_sub_event or "response"):
+            return self._wait_for_art_response(
+                payload, sent_at, wait_for_event, wait_for_sub_event
+            )
+
+    def _wait_for_art_response(
+        self,
+        payload: JsonObj,
+        sent_at: float,
+        wait_for_event: str,
+        wait_for_sub_event: str | None,
+    ) -> Any:
+
         # Non-D2D waits return the websocket frame as-is.
         if wait_for_event != D2D_SERVICE_MESSAGE_EVENT:
             if wait_for_sub_event:
@@ -259,12 +313,20 @@ class SamsungTVArt(SamsungTVWSConnection):
             while True:
                 event, frame = self._recv_frame()
                 if event == wait_for_event:
+                    self._record_request(payload, sent_at)
                     return frame
 
-        return self._wait_for_d2d(
-            request_uuid=req_id,
+        response = self._wait_for_d2d(
+            request_uuid=payload["request_id"],
             wait_for_sub_event=wait_for_sub_event,
         )
+        self._record_request(payload, sent_at)
+        return response
+
+    def _record_request(self, payload: JsonObj, sent_at: float) -> None:
+        self.stats.record_request(
+            str(payload.get("request", "unknown")), time.monotonic() - sent_at
+        )
 
     # -------------------------
     # Generic getters / setters
@@ -340,20 +402,30 @@ class SamsungTVArt(SamsungTVWSConnection):
         """Return device info payload."""
         return self._request_json("get_device_info")
 
-    def available(self, category=None):
-        """Return available content list, optionally filtered by category id."""
-        data = self._request_json("get_content_list", category=category)
-        content_list = json.loads(data["content_list"])
+    def catalog(self, refresh: bool = False) -> ArtCatalog:
+        """
+        Return the cached, indexed content list.
 
-        if not category:
-            return content_list
+        It is fetched on first use, kept current from the TV events received
+        on this connection and fetched again when an event leaves it stale
+        or `refresh` is set.
+        """
+        if refresh or self._catalog is None or self._catalog.stale:
+            # The whole list, categories are filtered from the cache
+            data = self._request_json("get_content_list", category=None)
+            self._catalog = ArtCatalog(json.loads(data["content_list"]))
+        return self._catalog
 
-        result = []
-        for item in content_list:
-            if item.get("category_id") == category:
-                result.append(item)
+    def available(self, category=None, refresh=False):
+        """
+        Return available content list, optionally filtered by category id.
 
-        return result
+        The items are copies taken from catalog(), filtered by category
+        locally. Changes made on the TV that this connection did not get an
+        event for show up only after the catalog is fetched again: pass
+        `refresh` for an up to date list.
+        """
+        return [dict(item) for item in self.catalog(refresh).items(category or None)]
 
     def get_current(self):
         """Return current artwork payload."""
@@ -497,21 +569,34 @@ class SamsungTVArt(SamsungTVWSConnection):
         return self._set_value("set_color_temperature", value)
 
     def get_thumbnail_list(
-        self, content_id_list: str | Sequence[str] | None = None
+        self,
+        content_id_list: str | Sequence[str] | None = None,
+        progress: TransferCallback | None = None,
     ) -> dict[str, bytearray]:
-        """Fetch one or more thumbnails via D2D socket."""
+        """
+        Fetch one or more thumbnails via D2D socket.
+
+        `progress` is called with a TransferProgress as each one arrives.
+        """
         if content_id_list is None:
             content_id_list = []
         if isinstance(content_id_list, str):
             content_id_list = [content_id_list]
 
-        req_list = [{"content_id": cid} for cid in content_id_list]
-        d2d_id = self._new_request_uuid()
+        monitor = None
+        if progress is not None:
+            monitor = ProgressMonitor(progress, "recv")
+        with self._span("get_thumbnail_list", count=len(content_id_list)):
+            return dict(self._iter_thumbnail_list(content_id_list, monitor))
 
+    def _iter_thumbnail_list(
+        self, content_id_list: Sequence[str], progress: ProgressMonitor | None
+    ) -> Iterator[tuple[str, bytearray]]:
+        d2d_id = self._new_request_uuid()
         payload = self._send_art_request(
             {
                 "request": "get_thumbnail_list",
-                "content_id_list": req_list,
+                "content_id_list": [{"content_id": cid} for cid in content_id_list],
                 "conn_info": {
                     "d2d_mode": "socket",
                     "connection_id": generate_connection_id(),
@@ -522,64 +607,81 @@ class SamsungTVArt(SamsungTVWSConnection):
         )
 
         assert payload
-        sock = self._open_d2d_socket(self._parse_conn_info(payload))
-
-        thumbnails: dict[str, bytearray] = {}
-        try:
-            total = 1
-            current = -1
+        yield from self._iter_d2d_files(payload, progress)
 
-            while current + 1 < total:
-                name, data, current, total = self._recv_d2d_file(sock)
-                thumbnails[name] = data
-        finally:
-            sock.close()
+    def export_library(
+        self,
+        dest: str,
+        category: str | None = None,
+        chunk_size: int = 32,
+        progress: TransferCallback | None = None,
+    ) -> int:
+        """
+        Back up the content list and every thumbnail to `dest`, a directory
+        or a tar archive (.tar, .tar.gz, .tgz, .tar.bz2 or .tar.xz).
 
-        return thumbnails
+        The content list goes to metadata.json and the thumbnails to
+        thumbnails/<content_id>.<type>. Thumbnails are fetched `chunk_size`
+        at a time and written as each one arrives, so memory use does not
+        grow with the library. Returns the number of thumbnails written.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        items = self.available(category, refresh=True)
+        content_ids = [item["content_id"] for item in items]
+        metadata = {
+            "version": 1,
+            "host": self.host,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "content_list": items,
+        }
+        monitor = None
+        if progress is not None:
+            monitor = ProgressMonitor(progress, "recv")
+            monitor.files_count = len(content_ids)
+
+        count = 0
+        with (
+            self._span("export_library", count=len(content_ids)),
+            LibraryWriter(dest) as writer,
+        ):
+            writer.add(METADATA_NAME, json.dumps(metadata, indent=2).encode("utf-8"))
+            for start in range(0, len(content_ids), chunk_size):
+                chunk = content_ids[start : start + chunk_size]
+                if monitor is not None:
+                    monitor.files_base = start
+                with self._span("get_thumbnail_list", count=len(chunk)):
+                    for name, data in self._iter_thumbnail_list(chunk, monitor):
+                        # Names come from the TV, keep them inside the export
+                        writer.add(f"{THUMBNAIL_DIR}/{os.path.basename(name)}", data)
+                        count += 1
+        return count
 
     def get_thumbnail(
         self,
         content_id_list: str | Sequence[str] | None = None,
         as_dict: bool = False,
+        progress: TransferCallback | None = None,
     ) -> dict[str, bytearray] | list[bytearray] | bytearray | None:
-        """Fetch thumbnail(s) via D2D socket."""
+        """Fetch thumbnail(s) via D2D socket, one request each."""
         if content_id_list is None:
             content_id_list = []
         if isinstance(content_id_list, str):
             content_id_list = [content_id_list]
 
         result: dict[str, bytearray] = {}
-
-        for cid in content_id_list:
-            d2d_id = self._new_request_uuid()
-            payload = self._send_art_request(
-                {
-                    "request": "get_thumbnail",
-                    "content_id": cid,
-                    "conn_info": {
-                        "d2d_mode": "socket",
-                        "connection_id": generate_connection_id(),
-                        "id": d2d_id,
-                    },
-                },
-                request_uuid=d2d_id,
-            )
-
-            assert payload
-
-            # API 0.97: thumbnail bytes come inline in the WS frame
-            inline = payload.get("binary")
-            if isinstance(inline, (bytes, bytearray)) and inline:
-                result[cid] = bytearray(inline)
-                continue
-
-            # Newer APIs: thumbnail comes via D2D socket
-            sock = self._open_d2d_socket(self._parse_conn_info(payload))
-            try:
-                name, data, _, _ = self._recv_d2d_file(sock)
+        monitor = None
+        if progress is not None:
+            monitor = ProgressMonitor(progress, "recv")
+            monitor.files_count = len(content_id_list)
+
+        for index, cid in enumerate(content_id_list):
+            if monitor is not None:
+                monitor.files_base = index
+            with self._span("get_thumbnail", content_id=cid):
+                name, data = self._get_single_thumbnail(cid, monitor)
                 result[name] = data
-            finally:
-                sock.close()
 
         if as_dict:
             return result
@@ -590,6 +692,37 @@ class SamsungTVArt(SamsungTVWSConnection):
 
         return None
 
+    def _get_single_thumbnail(
+        self, content_id: str, progress: ProgressMonitor | None = None
+    ) -> tuple[str, bytearray]:
+        d2d_id = self._new_request_uuid()
+        payload = self._send_art_request(
+            {
+                "request": "get_thumbnail",
+                "content_id": content_id,
+                "conn_info": {
+                    "d2d_mode": "socket",
+                    "connection_id": generate_connection_id(),
+                    "id": d2d_id,
+                },
+            },
+            request_uuid=d2d_id,
+        )
+
+        assert payload
+
+        # API 0.97: thumbnail bytes come inline in the WS frame
+        inline = payload.get("binary")
+        if isinstance(inline, (bytes, bytearray)) and inline:
+            if progress is not None:
+                progress.start_file(content_id)
+                progress(len(inline), len(inline))
+            return content_id, bytearray(inline)
+
+        # Newer APIs: thumbnail comes via D2D socket
+        with closing(self._iter_d2d_files(payload, progress)) as files:
+            return next(files)
+
     def _upload_ws_binary_send_image(
         self,
         *,
@@ -643,6 +776,7 @@ class SamsungTVArt(SamsungTVWSConnection):
 
         payload = len(header).to_bytes(2, "big") + header + data
         self.connection.send_binary(payload)
+        self.stats.record_frame_sent(len(payload))
 
     def upload(
         self,
@@ -651,10 +785,24 @@ class SamsungTVArt(SamsungTVWSConnection):
         portrait_matte: str = "shadowbox_polar",
         file_type: str = "png",
         date: str | None = None,
+        preprocessor: ImagePreprocessor | None = None,
+        progress: TransferCallback | None = None,
+        source_hash: str | None = None,
     ) -> str:
-        """Upload an image and return the new content_id."""
+        """
+        Upload an image and return the new content_id.
+
+        With a preprocessor the image is resized and recompressed to JPEG
+        before it is sent. With an upload_index, images the TV already has
+        are not sent again: their existing content_id is returned. Pass the
+        sha256 of the original image as `source_hash` when `file` was
+        preprocessed beforehand, the index is keyed on the original.
+        `progress` is called with a TransferProgress while the image is sent.
+        """
+        name = "image"
         # Load bytes
         if isinstance(file, str):
+            name = os.path.basename(file)
             _, ext = os.path.splitext(file)
             if ext:
                 file_type = ext[1:]
@@ -668,7 +816,17 @@ class SamsungTVArt(SamsungTVWSConnection):
         else:
             data = bytes(file)
 
-        file_size = len(data)
+        source = bytes(data)
+        if self.upload_index is not None:
+            content_id = self.upload_index.lookup(source, source_hash)
+            if content_id is not None:
+                _LOGGING.debug("Already uploaded as %s, skipping", content_id)
+                return content_id
+
+        if preprocessor is not None:
+            data = preprocessor.process(source)
+            file_type = "jpg"
+
         ft = file_type.lower()
         if ft == "jpeg":
             ft = "jpg"
@@ -676,77 +834,208 @@ class SamsungTVArt(SamsungTVWSConnection):
         if date is None:
             date = datetime.now().strftime("%Y:%m:%d %H:%M:%S")
 
+        monitor = None
+        if progress is not None:
+            monitor = ProgressMonitor(progress, "send")
+            monitor.start_file(name)
+        content_id = self._upload_data(
+            bytes(data),
+            file_type=ft,
+            date=date,
+            matte=matte,
+            portrait_matte=portrait_matte,
+            progress=monitor,
+        )
+        if self.upload_index is not None:
+            self.upload_index.add(source, content_id, source_hash)
+        return content_id
+
+    def _upload_transports(self) -> list[str]:
+        """Return the upload transports, the one expected to work first."""
+        if self._upload_transport is None:
+            # Art API 0.97 (observed via SmartThings): direct WS binary upload.
+            # Newer firmwares: D2D socket handshake.
+            api_version = None
+            try:
+                with self._span("api_version") as span:
+                    api_version = self.get_api_version()
+                    if span:
+                        span.attributes["version"] = api_version
+            except exceptions.ResponseError:
+                # If api_version lookup fails, continue with the socket upload approach.
+                pass
+            self._upload_transport = (
+                UPLOAD_WS_BINARY if api_version == "0.97" else UPLOAD_D2D
+            )
+        if self._upload_transport == UPLOAD_WS_BINARY:
+            return [UPLOAD_WS_BINARY, UPLOAD_D2D]
+        return [UPLOAD_D2D, UPLOAD_WS_BINARY]
+
+    def _upload_data(
+        self,
+        data: bytes,
+        *,
+        file_type: str,
+        date: str,
+        matte: str,
+        portrait_matte: str,
+        progress: ProgressMonitor | None = None,
+    ) -> str:
+        file_size = len(data)
+        policy = self.retry_policy or RetryPolicy(attempts=1)
+
+        with self._span("upload", size=file_size, file_type=file_type) as span:
+            transports = self._upload_transports()
+            attempt = 1
+            failures = 0
+            while True:
+                transport = transports[0]
+                if progress is not None:
+                    progress.start_file(progress.name)
+                sent = False
+                try:
+                    request_uuid = self._upload_over(
+                        transport,
+                        data=data,
+                        file_type=file_type,
+                        date=date,
+                        matte=matte,
+                        portrait_matte=portrait_matte,
+                        progress=progress,
+                    )
+                    sent = True
+                    with self._span("image_added"):
+                        done = self._wait_for_d2d(
+                            request_uuid=request_uuid,
+                            wait_for_sub_event="image_added",
+                        )
+                    content_id = cast(str, done["content_id"])
+                except exceptions.ResponseError:
+                    if transport != UPLOAD_WS_BINARY:
+                        raise
+                    # Refused by this firmware, the socket upload may work
+                    _LOGGING.debug("WS binary upload refused, switching to D2D")
+                    transports.reverse()
+                    failures = 0
+                    continue
+                except Exception as err:
+                    # Once the image is sent the TV may have stored it, and
+                    # sending it again could add it twice
+                    if sent or not policy.should_retry(err, attempt):
+                        raise
+                    failures += 1
+                    if failures >= policy.switch_after:
+                        transports.reverse()
+                        failures = 0
+                    delay = policy.delay(attempt)
+                    _LOGGING.warning(
+                        "Upload over %s failed (%s), retrying over %s in %.1fs",
+                        transport,
+                        err,
+                        transports[0],
+                        delay,
+                    )
+                    # Start over on a fresh connection, without the replies
+                    # still pending for the failed attempt
+                    self.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+                # Start with what worked on the next upload
+                self._upload_transport = transport
+                if span:
+                    span.attributes.update(transport=transport, attempts=attempt)
+                return content_id
+
+    def _upload_over(
+        self,
+        transport: str,
+        *,
+        data: bytes,
+        file_type: str,
+        date: str,
+        matte: str,
+        portrait_matte: str,
+        progress: ProgressMonitor | None,
+    ) -> str | None:
+        """
+        Send the image, return the request_uuid the TV answers image_added
+        with (None when it does not tell).
+        """
         upload_id = self._new_request_uuid()
+        if transport == UPLOAD_D2D:
+            self._upload_d2d(
+                upload_id=upload_id,
+                data=data,
+                file_type=file_type,
+                date=date,
+                matte=matte,
+                portrait_matte=portrait_matte,
+                progress=progress,
+            )
+            return None
 
-        # Art API 0.97 (observed via SmartThings): direct WS binary upload.
-        # Newer firmwares: D2D socket handshake.
-        try:
-            if self.get_api_version() == "0.97":
-                self._upload_ws_binary_send_image(
-                    upload_id=upload_id,
-                    data=data,
-                    matte=matte,
-                    file_type=ft,
-                )
-                done = self._wait_for_d2d(
-                    request_uuid=upload_id,
-                    wait_for_sub_event="image_added",
-                )
-                return cast(str, done["content_id"])
-        except exceptions.ResponseError:
-            # If api_version lookup fails, continue with the socket upload approach.
-            pass
+        with self._span("ws_binary_send"):
+            self._upload_ws_binary_send_image(
+                upload_id=upload_id,
+                data=data,
+                matte=matte,
+                file_type=file_type,
+            )
+        if progress is not None:
+            # A single frame, only its completion is known
+            progress(len(data), len(data))
+        return upload_id
 
-        ready = self._send_art_request(
-            {
-                "request": "send_image",
+    def _upload_d2d(
+        self,
+        *,
+        upload_id: str,
+        data: bytes,
+        file_type: str,
+        date: str,
+        matte: str,
+        portrait_matte: str,
+        progress: ProgressMonitor | None = None,
+    ) -> None:
+        """Send image bytes through the D2D socket handshake."""
+        file_size = len(data)
+        request = {
+            "request": "send_image",
+            "id": upload_id,
+            "request_id": upload_id,
+            "file_type": file_type,
+            "file_size": file_size,
+            "image_date": date,
+            "matte_id": matte or "none",
+            "portrait_matte_id": portrait_matte or "none",
+            "conn_info": {
+                "d2d_mode": "socket",
+                "connection_id": generate_connection_id(),
                 "id": upload_id,
-                "request_id": upload_id,
-                "file_type": ft,
-                "file_size": file_size,
-                "image_date": date,
-                "matte_id": matte or "none",
-                "portrait_matte_id": portrait_matte or "none",
-                "conn_info": {
-                    "d2d_mode": "socket",
-                    "connection_id": generate_connection_id(),
-                    "id": upload_id,
-                },
             },
+        }
+        ready = self._send_art_request(
+            request,
             wait_for_sub_event="ready_to_use",
             request_uuid=upload_id,
         )
         assert ready
 
         conn_info = self._parse_conn_info(ready)
-        header = json.dumps(
-            {
-                "num": 0,
-                "total": 1,
-                "fileLength": file_size,
-                "fileName": "image",
-                "fileType": ft,
-                "secKey": conn_info["key"],
-                "version": "0.0.1",
-            }
-        ).encode("ascii")
-
-        sock = self._open_d2d_socket(conn_info)
-        try:
-            sock.sendall(len(header).to_bytes(4, "big"))
-            sock.sendall(header)
-            sock.sendall(data)
-        finally:
-            try:
-                sock.close()
-            except OSError:
-                pass
-
-        done = self._wait_for_d2d(
-            request_uuid=None,
-            wait_for_sub_event="image_added",
-        )
-        return cast(str, done["content_id"])
+        header = {
+            "num": 0,
+            "total": 1,
+            "fileLength": file_size,
+            "fileName": "image",
+            "fileType": file_type,
+            "secKey": conn_info["key"],
+            "version": "0.0.1",
+        }
+        with self._open_d2d_transfer(conn_info) as transfer:
+            with self._span("d2d_send", size=file_size):
+                transfer.send_file(header, data, progress)
 
     def delete(self, content_id: str) -> bool:
         """Delete a single artwork by content id."""
@@ -773,7 +1062,10 @@ class SamsungTVArt(SamsungTVWSConnection):
         if not isinstance(returned, list):
             return False
 
-        return cast(list[object], returned) == cast(list[object], content_id_list)
+        deleted = cast(list[object], returned) == cast(list[object], content_id_list)
+        if deleted and self.upload_index is not None:
+            self.upload_index.discard(item["content_id"] for item in content_id_list)
+        return deleted
 
     def select_image(
         self, content_id: str, category: str | None = None, show: bool = True
@@ -0,0 +1,114 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import json
+import logging
+from typing import Any
+
+_LOGGING = logging.getLogger(__name__)
+
+# Events that change items in ways the event itself does not describe
+_INVALIDATING_EVENTS = {"image_added", "matte_changed"}
+
+
+def _content_ids(payload: dict[str, Any]) -> list[str]:
+    content_id_list = payload.get("content_id_list", [])
+    if isinstance(content_id_list, str):
+        content_id_list = json.loads(content_id_list)
+    return [
+        item["content_id"] if isinstance(item, dict) else str(item)
+        for item in content_id_list
+    ]
+
+
+class ArtCatalog:
+    """
+    Content list of a Frame TV, indexed by content_id, category, matte and
+    favourite flag.
+
+    SamsungTVArt.catalog() keeps one per connection and applies the
+    image_deleted and favorite_changed events to it. Events that do not
+    carry enough data to update it (image_added, matte_changed) mark it
+    stale, and it is fetched again on next use. Lookups return the cached
+    item dicts, which must not be modified.
+    """
+
+    def __init__(self, content_list: Iterable[dict[str, Any]] = ()) -> None:
+        self.stale = False
+        self._items: dict[str, dict[str, Any]] = {}
+        self._by_category: dict[str, dict[str, dict[str, Any]]] = {}
+        self._by_matte: dict[str, dict[str, dict[str, Any]]] = {}
+        self._favourites: dict[str, dict[str, Any]] = {}
+        for item in content_list:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self._items.values())
+
+    def __contains__(self, content_id: object) -> bool:
+        return content_id in self._items
+
+    def get(self, content_id: str) -> dict[str, Any] | None:
+        return self._items.get(content_id)
+
+    def items(self, category: str | None = None) -> list[dict[str, Any]]:
+        """Return every item, or the items of one category_id."""
+        if category is None:
+            return list(self._items.values())
+        return list(self._by_category.get(category, {}).values())
+
+    def with_matte(self, matte_id: str) -> list[dict[str, Any]]:
+        return list(self._by_matte.get(matte_id, {}).values())
+
+    def favourites(self) -> list[dict[str, Any]]:
+        return list(self._favourites.values())
+
+    def add(self, item: dict[str, Any]) -> None:
+        content_id = item["content_id"]
+        self.remove(content_id)
+        self._items[content_id] = item
+        self._by_category.setdefault(item.get("category_id", ""), {})[content_id] = item
+        self._by_matte.setdefault(item.get("matte_id", ""), {})[content_id] = item
+        if item.get("favorite") == "on":
+            self._favourites[content_id] = item
+
+    def remove(self, content_id: str) -> None:
+        item = self._items.pop(content_id, None)
+        if item is None:
+            return
+        self._by_category.get(item.get("category_id", ""), {}).pop(content_id, None)
+        self._by_matte.get(item.get("matte_id", ""), {}).pop(content_id, None)
+        self._favourites.pop(content_id, None)
+
+    def apply_event(self, payload: dict[str, Any]) -> None:
+        """Update the catalog from a D2D service message payload."""
+        event = payload.get("event")
+        if event in _INVALIDATING_EVENTS:
+            self.stale = True
+        elif event == "image_deleted":
+            try:
+                content_ids = _content_ids(payload)
+            except (ValueError, KeyError, TypeError) as err:
+                _LOGGING.debug("Unreadable image_deleted event: %s", err)
+                self.stale = True
+                return
+            for content_id in content_ids:
+                self.remove(content_id)
+        elif event == "favorite_changed":
+            item = self._items.get(payload.get("content_id", ""))
+            if item is None:
+                self.stale = True
+                return
+            # Replace the item, do not modify a dict handed out by a lookup
+            self.add({**item, "favorite": payload.get("status", "off")})
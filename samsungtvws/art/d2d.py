@@ -0,0 +1,350 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import contextlib
+import json
+import socket
+import time
+from typing import Any, TypeVar
+
+from .. import exceptions
+from ..helper import get_ssl_context
+from ..instrumentation import ConnectionStats
+
+_T = TypeVar("_T")
+
+JsonObj = dict[str, Any]
+# Called with (bytes done, bytes total) while a file goes through
+ProgressCallback = Callable[[int, int], None]
+HeaderCallback = Callable[[JsonObj], None]
+
+HEADER_LENGTH_SIZE = 4
+CHUNK_SIZE = 256 * 1024
+
+
+def encode_header(header: JsonObj) -> tuple[bytes, bytes]:
+    """Return the big-endian length prefix and the JSON header of a file."""
+    encoded = json.dumps(header).encode("ascii")
+    return len(encoded).to_bytes(HEADER_LENGTH_SIZE, "big"), encoded
+
+
+def file_name(header: JsonObj) -> str:
+    return f"{header['fileID']}.{header['fileType']}"
+
+
+class TransferProgress:
+    """Progress report of an Art upload or thumbnail download."""
+
+    __slots__ = (
+        "bytes_done",
+        "bytes_per_second",
+        "bytes_total",
+        "direction",
+        "files_done",
+        "files_total",
+        "name",
+    )
+
+    def __init__(
+        self,
+        direction: str,
+        name: str,
+        bytes_done: int,
+        bytes_total: int,
+        files_done: int,
+        files_total: int,
+        bytes_per_second: float,
+    ) -> None:
+        self.direction = direction
+        self.name = name
+        # Bytes of the current file
+        self.bytes_done = bytes_done
+        self.bytes_total = bytes_total
+        self.files_done = files_done
+        self.files_total = files_total
+        # Instantaneous throughput, over the last ProgressMonitor.window
+        self.bytes_per_second = bytes_per_second
+
+    def __repr__(self) -> str:
+        return (
+            f"TransferProgress({self.direction} {self.name}: "
+            f"{self.bytes_done}/{self.bytes_total} bytes, "
+            f"{self.files_done}/{self.files_total} files, "
+            f"{self.bytes_per_second:.0f} B/s)"
+        )
+
+
+TransferCallback = Callable[[TransferProgress], None]
+
+
+class ProgressMonitor:
+    """
+    Turn the byte counts of a D2D transfer into TransferProgress reports.
+
+    Call start_file() (or pass on_header to recv_file) before each file,
+    then use the monitor as the ProgressCallback of the transfer. When the
+    files of a batch come in separate transfers, set files_base to the
+    index of the current transfer and files_count to the batch size.
+    """
+
+    def __init__(
+        self, callback: TransferCallback, direction: str, window: float = 1.0
+    ) -> None:
+        self.callback = callback
+        self.direction = direction
+        self.window = window
+        self.name = ""
+        self.file_num = 0
+        self.files_total = 1
+        self.files_base = 0
+        self.files_count: int | None = None
+        self._samples: deque[tuple[float, int]] = deque()
+
+    def start_file(self, name: str, num: int = 0, total: int = 1) -> None:
+        self.name = name
+        self.file_num = num
+        self.files_total = total
+        self._samples.clear()
+        self._samples.append((time.monotonic(), 0))
+
+    def on_header(self, header: JsonObj) -> None:
+        self.start_file(file_name(header), int(header["num"]), int(header["total"]))
+
+    def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        samples = self._samples
+        samples.append((now, done))
+        # Keep one sample older than the window to measure across it
+        while len(samples) > 2 and samples[1][0] <= now - self.window:
+            samples.popleft()
+        start, start_done = samples[0]
+        rate = (done - start_done) / (now - start) if now > start else 0.0
+
+        self.callback(
+            TransferProgress(
+                self.direction,
+                self.name,
+                done,
+                total,
+                self.files_base + self.file_num + int(done >= total),
+                self.files_count or self.files_total,
+                rate,
+            )
+        )
+
+
+def open_d2d_socket(conn_info: JsonObj, timeout: float | None = None) -> socket.socket:
+    """
+    Connect to the D2D endpoint of a conn_info payload, over TLS when it is
+    secured. `timeout` applies to the connect and to every send and recv.
+    """
+    sock = socket.create_connection(
+        (conn_info["ip"], int(conn_info["port"])), timeout=timeout
+    )
+    if not conn_info.get("secured", False):
+        return sock
+    try:
+        # The wrapped socket keeps the timeout
+        return get_ssl_context().wrap_socket(sock)
+    except BaseException:
+        sock.close()
+        raise
+
+
+class D2DTransfer:
+    """
+    Blocking file transfers over a D2D socket.
+
+    A file is framed as a 4 byte big-endian header length, a JSON header
+    carrying at least fileLength, and the payload. Transfers are recorded
+    in `stats` when given.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        stats: ConnectionStats | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.sock = sock
+        self.stats = stats
+        self.chunk_size = chunk_size
+
+    def __enter__(self) -> D2DTransfer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            self.sock.close()
+
+    def send_file(
+        self, header: JsonObj, data: bytes, progress: ProgressCallback | None = None
+    ) -> None:
+        length, encoded = encode_header(header)
+        self.sock.sendall(length)
+        self.sock.sendall(encoded)
+
+        start = time.monotonic()
+        if progress is None:
+            # A single call, the kernel does the chunking
+            self.sock.sendall(data)
+        else:
+            view = memoryview(data)
+            for offset in range(0, len(view), self.chunk_size):
+                chunk = view[offset : offset + self.chunk_size]
+                self.sock.sendall(chunk)
+                progress(offset + len(chunk), len(view))
+        if self.stats is not None:
+            self.stats.record_d2d_transfer("send", len(data), time.monotonic() - start)
+
+    def recv_file(
+        self,
+        progress: ProgressCallback | None = None,
+        on_header: HeaderCallback | None = None,
+    ) -> tuple[JsonObj, bytearray]:
+        """Receive one file, returning its header and payload."""
+        header_length = int.from_bytes(self._recv_exact(HEADER_LENGTH_SIZE), "big")
+        header = json.loads(self._recv_exact(header_length))
+        if on_header is not None:
+            on_header(header)
+
+        start = time.monotonic()
+        data = self._recv_exact(int(header["fileLength"]), progress)
+        if self.stats is not None:
+            self.stats.record_d2d_transfer("recv", len(data), time.monotonic() - start)
+        return header, data
+
+    def _recv_exact(
+        self, size: int, progress: ProgressCallback | None = None
+    ) -> bytearray:
+        # Receive straight into the result, no per-chunk copies
+        data = bytearray(size)
+        view = memoryview(data)
+        received = 0
+        while received < size:
+            count = self.sock.recv_into(view[received:])
+            if not count:
+                raise exceptions.ConnectionFailure({"reason": "socket closed"})
+            received += count
+            if progress is not None:
+                progress(received, size)
+        return data
+
+
+class AsyncD2DTransfer:
+    """
+    asyncio counterpart of D2DTransfer over a stream reader/writer pair.
+
+    Payloads are written in `chunk_size` pieces so drain() applies
+    backpressure, and every read and drain is bounded by `timeout`.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        stats: ConnectionStats | None = None,
+        timeout: float | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.stats = stats
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+    @classmethod
+    async def connect(
+        cls,
+        conn_info: JsonObj,
+        timeout: float | None = None,
+        stats: ConnectionStats | None = None,
+    ) -> AsyncD2DTransfer:
+        ssl_context = get_ssl_context() if conn_info.get("secured", False) else None
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                conn_info["ip"], int(conn_info["port"]), ssl=ssl_context
+            ),
+            timeout,
+        )
+        return cls(reader, writer, stats=stats, timeout=timeout)
+
+    async def __aenter__(self) -> AsyncD2DTransfer:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        self.writer.close()
+        with contextlib.suppress(OSError, asyncio.TimeoutError):
+            await self._wait(self.writer.wait_closed())
+
+    async def _wait(self, awaitable: Awaitable[_T]) -> _T:
+        return await asyncio.wait_for(awaitable, self.timeout)
+
+    async def send_file(
+        self, header: JsonObj, data: bytes, progress: ProgressCallback | None = None
+    ) -> None:
+        length, encoded = encode_header(header)
+        self.writer.write(length + encoded)
+
+        start = time.monotonic()
+        view = memoryview(data)
+        for offset in range(0, len(view), self.chunk_size):
+            chunk = view[offset : offset + self.chunk_size]
+            self.writer.write(chunk)
+            await self._wait(self.writer.drain())
+            if progress is not None:
+                progress(offset + len(chunk), len(view))
+        await self._wait(self.writer.drain())
+        if self.stats is not None:
+            self.stats.record_d2d_transfer("send", len(data), time.monotonic() - start)
+
+    async def recv_file(
+        self,
+        progress: ProgressCallback | None = None,
+        on_header: HeaderCallback | None = None,
+    ) -> tuple[JsonObj, bytearray]:
+        """Receive one file, returning its header and payload."""
+        header_length = int.from_bytes(
+            await self._read_exactly(HEADER_LENGTH_SIZE), "big"
+        )
+        header = json.loads(await self._read_exactly(header_length))
+        if on_header is not None:
+            on_header(header)
+
+        start = time.monotonic()
+        size = int(header["fileLength"])
+        data = bytearray()
+        while len(data) < size:
+            chunk = await self._wait(
+                self.reader.read(min(self.chunk_size, size - len(data)))
+            )
+            if not chunk:
+                raise exceptions.ConnectionFailure({"reason": "socket closed"})
+            data += chunk
+            if progress is not None:
+                progress(len(data), size)
+        if self.stats is not None:
+            self.stats.record_d2d_transfer("recv", size, time.monotonic() - start)
+        return header, data
+
+    async def _read_exactly(self, size: int) -> bytes:
+        try:
+            return await self._wait(self.reader.readexactly(size))
+        except asyncio.IncompleteReadError as err:
+            raise exceptions.ConnectionFailure({"reason": "socket closed"}) from err
@@ -0,0 +1,188 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+
+from .preprocess import _load_pillow
+
+_LOGGING = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(data: bytes | bytearray) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """content_hash() of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def perceptual_hash(data: bytes) -> int:
+    """64 bit difference hash, stable across resizing and recompression."""
+    Image, _ = _load_pillow()
+    with Image.open(io.BytesIO(data)) as image:
+        pixels = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            right = pixels[row * 9 + column + 1]
+            value = (value << 1) | int(left > right)
+    return value
+
+
+class UploadIndex:
+    """
+    Content hash to content_id index of the artworks on one TV.
+
+    SamsungTVArt.upload consults it (see `SamsungTVArt.upload_index`) and
+    returns the known content_id instead of transferring an image twice.
+    Uploads are indexed by sha256 of the original image, before any
+    preprocessing, so the same source matches whatever preprocess settings
+    it was sent with. Only exact matches are skipped by default.
+
+    Thumbnails added with add_thumbnails() (requires Pillow) are indexed by
+    perceptual hash, which also catches images stored by other clients.
+    With `match_similar`, lookup() returns the artwork whose thumbnail
+    differs in at most `max_distance` of 64 bits. Crops, recolourings and
+    near-identical photos may match too, so this is opt-in.
+
+    With a `path`, the index is loaded from and saved to that JSON file.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_distance: int = 3,
+        match_similar: bool = False,
+    ) -> None:
+        self.path = path
+        self.max_distance = max_distance
+        self.match_similar = match_similar
+        self._hashes: dict[str, str] = {}
+        self._perceptual: dict[str, int] = {}
+        if path is not None:
+            self._load(path)
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._hashes = dict(data["hashes"])
+            self._perceptual = {
+                content_id: int(value, 16)
+                for content_id, value in data["perceptual"].items()
+            }
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as err:
+            _LOGGING.warning("Ignoring invalid upload index %s: %s", path, err)
+
+    def save(self) -> None:
+        """Write the index file atomically, if the index has one."""
+        if self.path is None:
+            return
+        data = {
+            "version": 1,
+            "hashes": self._hashes,
+            "perceptual": {
+                content_id: f"{value:016x}"
+                for content_id, value in self._perceptual.items()
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+    def __len__(self) -> int:
+        return len(self.content_ids())
+
+    def content_ids(self) -> set[str]:
+        return set(self._hashes.values()) | set(self._perceptual)
+
+    def lookup(self, data: bytes, digest: str | None = None) -> str | None:
+        """
+        Return the content_id of an image the TV already has. `digest` is
+        the content_hash() of the original image when `data` was
+        preprocessed from it.
+        """
+        content_id = self._hashes.get(digest or content_hash(data))
+        if content_id is not None or not self.match_similar or not self._perceptual:
+            return content_id
+
+        try:
+            value = perceptual_hash(data)
+        except Exception as err:
+            # No Pillow, or not an image Pillow can read
+            _LOGGING.debug("No perceptual hash for lookup: %s", err)
+            return None
+        distance, content_id = min(
+            (bin(value ^ known).count("1"), known_id)
+            for known_id, known in self._perceptual.items()
+        )
+        return content_id if distance <= self.max_distance else None
+
+    def add(self, data: bytes, content_id: str, digest: str | None = None) -> None:
+        self._hashes[digest or content_hash(data)] = content_id
+        self.save()
+
+    def without_thumbnail(self, content_ids: Iterable[str]) -> list[str]:
+        """Return the content_ids whose thumbnail is not indexed yet."""
+        return [cid for cid in content_ids if cid not in self._perceptual]
+
+    def add_thumbnails(self, thumbnails: Mapping[str, bytes]) -> None:
+        """
+        Index the perceptual hashes of thumbnails, as returned by
+        SamsungTVArt.get_thumbnail_list ("<content_id>.<type>": data).
+        """
+        for name, data in thumbnails.items():
+            content_id, _ = os.path.splitext(name)
+            try:
+                self._perceptual[content_id] = perceptual_hash(bytes(data))
+            except OSError as err:
+                _LOGGING.debug("Skipping thumbnail %s: %s", name, err)
+        self.save()
+
+    def discard(self, content_ids: Iterable[str]) -> None:
+        """Forget deleted artworks."""
+        discarded = set(content_ids)
+        self._hashes = {
+            key: content_id
+            for key, content_id in self._hashes.items()
+            if content_id not in discarded
+        }
+        for content_id in discarded:
+            self._perceptual.pop(content_id, None)
+        self.save()
+
+    def retain(self, content_ids: Iterable[str]) -> None:
+        """Forget every artwork that is not in content_ids (the TV library)."""
+        self.discard(self.content_ids() - set(content_ids))
@@ -0,0 +1,122 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import logging
+import os
+import tarfile
+import tempfile
+import time
+from typing import IO
+
+_LOGGING = logging.getLogger(__name__)
+
+METADATA_NAME = "metadata.json"
+THUMBNAIL_DIR = "thumbnails"
+
+# Streamed tar modes: members are written one after the other, no seeking
+_ARCHIVE_MODES = {
+    ".tar": "w|",
+    ".tar.gz": "w|gz",
+    ".tgz": "w|gz",
+    ".tar.bz2": "w|bz2",
+    ".tar.xz": "w|xz",
+}
+
+
+def archive_mode(dest: str) -> str | None:
+    """Return the tarfile mode for an archive path, None for a directory."""
+    lower = dest.lower()
+    for suffix, mode in _ARCHIVE_MODES.items():
+        if lower.endswith(suffix):
+            return mode
+    return None
+
+
+class LibraryWriter:
+    """
+    Write the files of an Art library export as they come.
+
+    `dest` is a tar archive when it ends with .tar, .tar.gz, .tgz, .tar.bz2
+    or .tar.xz, a directory otherwise. Archives are written to a temporary
+    file, renamed to `dest` only once the export is complete.
+    """
+
+    def __init__(self, dest: str) -> None:
+        self.dest = dest
+        self._tar: tarfile.TarFile | None = None
+        self._fileobj: IO[bytes] | None = None
+        self._temp_path: str | None = None
+
+        mode = archive_mode(dest)
+        if mode is None:
+            os.makedirs(os.path.join(dest, THUMBNAIL_DIR), exist_ok=True)
+            return
+
+        directory = os.path.dirname(os.path.abspath(dest))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, self._temp_path = tempfile.mkstemp(
+            dir=directory, suffix=".tmp"
+        )
+        self._fileobj = os.fdopen(file_descriptor, "wb")
+        try:
+            self._tar = tarfile.open(fileobj=self._fileobj, mode=mode)  # type: ignore[call-overload]
+        except BaseException:
+            self._discard()
+            raise
+
+    def __enter__(self) -> LibraryWriter:
+        return self
+
+    def __exit__(self, exc_type: type | None, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def add(self, name: str, data: bytes | bytearray) -> None:
+        """Write one file, `name` being relative to the export root."""
+        if self._tar is not None:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._tar.addfile(info, io.BytesIO(data))
+            return
+
+        with open(os.path.join(self.dest, *name.split("/")), "wb") as f:
+            f.write(data)
+
+    def close(self) -> None:
+        if self._temp_path is None:
+            return
+        self._close_archive()
+        os.replace(self._temp_path, self.dest)
+        self._temp_path = None
+
+    def _close_archive(self) -> None:
+        tar, self._tar = self._tar, None
+        fileobj, self._fileobj = self._fileobj, None
+        try:
+            if tar is not None:
+                tar.close()
+        finally:
+            # TarFile does not close a file object it was given
+            if fileobj is not None:
+                fileobj.close()
+
+    def _discard(self) -> None:
+        with contextlib.suppress(Exception):
+            self._close_archive()
+        if self._temp_path is not None:
+            _LOGGING.debug("Discarding incomplete export %s", self.dest)
+            with contextlib.suppress(OSError):
+                os.remove(self._temp_path)
+            self._temp_path = None
@@ -0,0 +1,172 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from typing import Any
+
+_LOGGING = logging.getLogger(__name__)
+
+# Frame panels are 4K UHD, larger images are downsampled by the TV anyway
+PANEL_SIZE = (3840, 2160)
+
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "samsungtvws", "images")
+
+
+def _load_pillow() -> Any:
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as err:
+        raise ImportError(
+            "Image preprocessing requires Pillow (pip install samsungtvws[image])"
+        ) from err
+    return Image, ImageOps
+
+
+def shrink_image(data: bytes, size: tuple[int, int], quality: int) -> bytes:
+    """
+    Fit an image within `size` (swapped for portrait images) and return it
+    as a JPEG without metadata. Images are never enlarged.
+    """
+    Image, ImageOps = _load_pillow()
+    with Image.open(io.BytesIO(data)) as source:
+        # Apply the EXIF rotation, the tag itself is dropped below
+        image = ImageOps.exif_transpose(source)
+        width, height = size
+        if image.height > image.width:
+            width, height = height, width
+        image.thumbnail((width, height), Image.Resampling.LANCZOS)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        output = io.BytesIO()
+        # No exif/icc_profile arguments: the metadata is not written
+        image.save(output, format="JPEG", quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def _cache_path(
+    cache_dir: str, content_hash: str, size: tuple[int, int], quality: int
+) -> str:
+    return os.path.join(cache_dir, f"{content_hash}-{size[0]}x{size[1]}-q{quality}.jpg")
+
+
+def _write_cache(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(data)
+        # Workers may race on the same image, the rename keeps entries whole
+        os.replace(temp_path, path)
+    except OSError as err:
+        _LOGGING.debug("Failed to cache %s: %s", path, err)
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+
+
+def _preprocess(
+    data: bytes, size: tuple[int, int], quality: int, cache_dir: str | None
+) -> bytes:
+    if cache_dir is None:
+        return shrink_image(data, size, quality)
+
+    path = _cache_path(cache_dir, hashlib.sha256(data).hexdigest(), size, quality)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    result = shrink_image(data, size, quality)
+    _write_cache(path, result)
+    return result
+
+
+def _preprocess_file(
+    path: str, size: tuple[int, int], quality: int, cache_dir: str | None
+) -> bytes:
+    # Runs in the worker processes: the parent never reads the source
+    with open(path, "rb") as f:
+        return _preprocess(f.read(), size, quality, cache_dir)
+
+
+class ImagePreprocessor:
+    """
+    Shrink images before they are uploaded to the Frame.
+
+    Images are fitted to the panel resolution, recompressed to JPEG at
+    `quality` and stripped of their EXIF metadata. Results are cached by
+    source content hash in `cache_dir` (default: the per-user cache dir)
+    unless use_cache is False. Requires Pillow.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int] = PANEL_SIZE,
+        quality: int = 90,
+        cache_dir: str | None = None,
+        use_cache: bool = True,
+        max_workers: int | None = None,
+    ) -> None:
+        if not 1 <= quality <= 95:
+            raise ValueError("quality must be between 1 and 95")
+        if min(size) < 1:
+            raise ValueError("size must be positive")
+        _load_pillow()
+        self.size = size
+        self.quality = quality
+        self.cache_dir = (cache_dir or default_cache_dir()) if use_cache else None
+        self.max_workers = max_workers
+
+    def process(self, data: bytes) -> bytes:
+        """Preprocess image bytes in this process."""
+        return _preprocess(data, self.size, self.quality, self.cache_dir)
+
+    def process_file(self, path: str) -> bytes:
+        """Read and preprocess a file in this process."""
+        return _preprocess_file(path, self.size, self.quality, self.cache_dir)
+
+    def process_files(self, paths: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        """
+        Preprocess files in a process pool, yielding (path, JPEG bytes) in
+        order as soon as each one is ready.
+        """
+        paths = list(paths)
+        if len(paths) < 2 or self.max_workers == 1:
+            for path in paths:
+                yield (
+                    path,
+                    _preprocess_file(path, self.size, self.quality, self.cache_dir),
+                )
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                _preprocess_file,
+                paths,
+                [self.size] * len(paths),
+                [self.quality] * len(paths),
+                [self.cache_dir] * len(paths),
+            )
+            yield from zip(paths, results)
@@ -0,0 +1,73 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import random
+
+import websocket
+
+from .. import exceptions
+
+# Transfer failures worth another attempt. ResponseError is the TV turning
+# the request down and is raised as is.
+RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+    exceptions.ConnectionFailure,
+    OSError,
+    websocket.WebSocketException,
+)
+
+
+class RetryPolicy:
+    """
+    How SamsungTVArt.upload retries a failed transfer.
+
+    Only the transfer is retried, with a fresh connection and send_image
+    handshake: the image is not read or preprocessed again. Failures after
+    the image was sent, while waiting for image_added, are raised: the TV
+    may have stored it already. Retry n waits
+    base_delay * 2 ** (n - 1) seconds, at most max_delay, shortened by up
+    to `jitter` (a fraction) so clients do not retry in step. After
+    `switch_after` failures in a row, the other transport (WS binary or
+    D2D socket) is tried.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.25,
+        switch_after: int = 2,
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("delays must not be negative")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        if switch_after < 1:
+            raise ValueError("switch_after must be at least 1")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.switch_after = switch_after
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether to retry after `attempt` (from 1) failed with `error`."""
+        if attempt >= self.attempts:
+            return False
+        if isinstance(error, exceptions.UnauthorizedError):
+            return False
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after `attempt` (from 1) failed."""
+        delay = min(self.max_delay, self.base_delay * 2.0 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
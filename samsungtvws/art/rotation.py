@@ -0,0 +1,160 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator, Sequence
+import logging
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from .. import exceptions
+from .retry import RETRYABLE_ERRORS
+
+if TYPE_CHECKING:
+    from .art import SamsungTVArt
+
+_LOGGING = logging.getLogger(__name__)
+
+
+class ArtRotator:
+    """
+    Rotate local images on a Frame TV every `interval` seconds.
+
+    The Art connection is kept open between ticks and the next `lookahead`
+    images are uploaded while the current one is shown, so a tick is a
+    single select_image request. Images are shown in order, or shuffled
+    again on each pass with `shuffle`. Each image is uploaded once, later
+    passes select the content_id it got (set art.upload_index to also reuse
+    the images uploaded by previous runs). `upload_arguments` are passed to
+    art.upload().
+
+    Ticks are scheduled on a fixed clock: a slow upload delays the next
+    tick only if it takes longer than the interval. A select that fails
+    because the connection was dropped is sent again on a new connection.
+    If that fails too, the error is logged and the image is shown at the
+    next tick.
+    """
+
+    def __init__(
+        self,
+        art: SamsungTVArt,
+        images: Sequence[str],
+        interval: float,
+        lookahead: int = 2,
+        shuffle: bool = False,
+        show: bool = True,
+        upload_arguments: dict[str, Any] | None = None,
+    ) -> None:
+        if not images:
+            raise ValueError("images must not be empty")
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        if lookahead < 0:
+            raise ValueError("lookahead must not be negative")
+        self.art = art
+        self.images = list(images)
+        self.interval = interval
+        self.lookahead = lookahead
+        self.shuffle = shuffle
+        self.show = show
+        self.upload_arguments = upload_arguments or {}
+        # path: content_id of the images uploaded so far
+        self.uploaded: dict[str, str] = {}
+        self.current: str | None = None
+        self._order = self._iter_order()
+        # (path, content_id) of the images ready to be selected
+        self._ready: deque[tuple[str, str]] = deque()
+        # Taken from the order, not uploaded yet (the upload failed)
+        self._pending: str | None = None
+        self._stop = threading.Event()
+
+    def _iter_order(self) -> Iterator[str]:
+        previous = None
+        while True:
+            images = list(self.images)
+            if self.shuffle:
+                random.shuffle(images)
+                # Do not show the same image twice across passes
+                if len(images) > 1 and images[0] == previous:
+                    images.append(images.pop(0))
+            yield from images
+            previous = images[-1]
+
+    def _prepare(self) -> tuple[str, str]:
+        path = self._pending or next(self._order)
+        self._pending = path
+        content_id = self.uploaded.get(path)
+        if content_id is None:
+            content_id = self.art.upload(path, **self.upload_arguments)
+            self.uploaded[path] = content_id
+            _LOGGING.debug("Uploaded %s -> %s", path, content_id)
+        self._pending = None
+        return path, content_id
+
+    def _fill(self, count: int) -> None:
+        while len(self._ready) < count:
+            self._ready.append(self._prepare())
+
+    def _select(self, content_id: str) -> None:
+        try:
+            self.art.select_image(content_id, show=self.show)
+        except exceptions.UnauthorizedError:
+            raise
+        except RETRYABLE_ERRORS as err:
+            # The TV drops idle Art connections between ticks: reconnect and
+            # try once more, so that does not cost the tick
+            _LOGGING.debug("Art connection lost (%s), reconnecting", err)
+            self.art.close()
+            self.art.select_image(content_id, show=self.show)
+
+    def tick(self) -> str:
+        """Show the next image and upload the ones after it. Returns its content_id."""
+        self._fill(1)
+        path, content_id = self._ready.popleft()
+        try:
+            self._select(content_id)
+        except exceptions.ResponseError:
+            # Deleted on the TV since it was uploaded: upload it next pass
+            self.uploaded.pop(path, None)
+            raise
+        except BaseException:
+            # Not shown, try it again on the next tick
+            self._ready.appendleft((path, content_id))
+            raise
+        self.current = content_id
+        self._fill(self.lookahead)
+        return content_id
+
+    def stop(self) -> None:
+        """Make run() return, from another thread or a callback."""
+        self._stop.set()
+
+    def run(self, ticks: int | None = None) -> None:
+        """Rotate until stop() is called, or for `ticks` ticks."""
+        self._stop.clear()
+        deadline = time.monotonic()
+        count = 0
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except exceptions.ResponseError as err:
+                _LOGGING.warning("Art rotation tick failed: %s", err)
+            except RETRYABLE_ERRORS as err:
+                _LOGGING.warning("Art rotation tick failed, reconnecting: %s", err)
+                self.art.close()
+
+            count += 1
+            if ticks is not None and count >= ticks:
+                return
+            # Late ticks are not caught up on, the schedule moves instead
+            deadline = max(deadline + self.interval, time.monotonic())
+            self._stop.wait(deadline - time.monotonic())
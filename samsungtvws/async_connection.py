@@ -13,6 +13,8 @@ from collections.abc import Awaitable, Sequence
 import contextlib
 import json
 import logging
+import sys
+import time
 from types import TracebackType
 from typing import (
     Any,
@@ -23,13 +25,23 @@ from websockets.asyncio.client import ClientConnection, connect
 from websockets.exceptions import ConnectionClosed
 from websockets.protocol import State
 
-from . import connection, exceptions, helper
-from .command import SamsungTVCommand, SamsungTVSleepCommand
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as asyncio_timeout
+else:
+    from async_timeout import timeout as asyncio_timeout
+
+from . import connection, exceptions
+from .command import (
+    SamsungTVCommand,
+    SamsungTVSleepCommand,
+    SamsungTVWaitForEventCommand,
+)
 from .event import (
     IGNORE_EVENTS_AT_STARTUP,
     MS_CHANNEL_CONNECT_EVENT,
     MS_CHANNEL_UNAUTHORIZED,
 )
+from .framelog import log_frame
 from .helper import get_ssl_context
 
 _LOGGING = logging.getLogger(__name__)
@@ -39,6 +51,30 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
     connection: ClientConnection | None
     _recv_loop: asyncio.Task[None] | None
 
+    def __init__(
+        self,
+        host: str,
+        *,
+        endpoint: str,
+        token: str | None = None,
+        token_file: str | None = None,
+        port: int = 8001,
+        timeout: float | None = None,
+        key_press_delay: float = 1,
+        name: str = "SamsungTvRemote",
+    ):
+        super().__init__(
+            host,
+            endpoint=endpoint,
+            token=token,
+            token_file=token_file,
+            port=port,
+            timeout=timeout,
+            key_press_delay=key_press_delay,
+            name=name,
+        )
+        self._event_futures: dict[str, set[asyncio.Future[dict[str, Any]]]] = {}
+
     async def __aenter__(self) -> SamsungTVWSAsyncConnection:
         return self
 
@@ -58,6 +94,7 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
         url = self._format_websocket_url(self.endpoint)
 
         _LOGGING.debug("WS url %s", url)
+        start = time.monotonic()
         connect_kwargs: dict[str, Any] = {}
         if self._is_ssl_connection():
             connect_kwargs["ssl"] = get_ssl_context()
@@ -66,7 +103,7 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
         event: str | None = None
         while event is None or event in IGNORE_EVENTS_AT_STARTUP:
             data = await connection.recv()
-            response = helper.process_api_response(data)
+            response = self._parse_frame(data)
             event = response.get("event", "*")
             assert event
             self._websocket_event(event, response)
@@ -81,6 +118,7 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
             raise exceptions.ConnectionFailure(response)
 
         self._check_for_token(response)
+        self.stats.record_handshake(time.monotonic() - start)
 
         self.connection = connection
         return connection
@@ -107,7 +145,7 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
         with contextlib.suppress(ConnectionClosed):
             while True:
                 data = await connection.recv()
-                response = helper.process_api_response(data)
+                response = self._parse_frame(data)
                 event = response.get("event", "*")
                 self._websocket_event(event, response)
                 if callback:
@@ -115,6 +153,59 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
                     if awaitable:
                         await awaitable
 
+    def _websocket_event(self, event: str, response: dict[str, Any]) -> None:
+        """Handle websocket event and resolve any event waiter."""
+        super()._websocket_event(event, response)
+        for future in self._event_futures.pop(event, set()):
+            if not future.done():
+                future.set_result(response)
+
+    async def wait_for_event(
+        self,
+        event: str,
+        timeout: float | None = None,
+        since: float | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Wait until `event` is received from the TV.
+
+        Events received after `since` (a time.monotonic() value, defaults to now)
+        are accepted, so callers can pass the time a command was sent to avoid
+        missing a fast reply. Returns the event payload, or None on timeout.
+        """
+        if self.connection is None:
+            self.connection = await self.open()
+
+        if since is None:
+            since = time.monotonic()
+
+        response = self._seen_event(event, since)
+        if response is not None:
+            return response
+
+        try:
+            async with asyncio_timeout(timeout):
+                if self._recv_loop:
+                    # The listening task dispatches every event, just wait for it
+                    future: asyncio.Future[dict[str, Any]] = (
+                        asyncio.get_running_loop().create_future()
+                    )
+                    self._event_futures.setdefault(event, set()).add(future)
+                    try:
+                        return await future
+                    finally:
+                        self._event_futures.get(event, set()).discard(future)
+
+                while True:
+                    data = await self.connection.recv()
+                    frame = self._parse_frame(data)
+                    frame_event = frame.get("event", "*")
+                    self._websocket_event(frame_event, frame)
+                    if frame_event == event:
+                        return frame
+        except asyncio.TimeoutError:
+            return None
+
     async def close(self) -> None:
         if self.connection:
             await self.connection.close()
@@ -152,8 +243,8 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
 
         await self.send_commands([command], key_press_delay)
 
-    @staticmethod
     async def _send_command(
+        self,
         connection: ClientConnection,
         command: SamsungTVCommand | dict[str, Any],
         delay: float,
@@ -162,14 +253,29 @@ class SamsungTVWSAsyncConnection(connection.SamsungTVWSBaseConnection):
             await asyncio.sleep(command.delay)
             return
 
+        if isinstance(command, SamsungTVWaitForEventCommand):
+            # Accept the event if it already arrived after the previous command
+            response = await self.wait_for_event(
+                command.event, command.timeout, since=self._last_command_sent
+            )
+            if response is None:
+                _LOGGING.debug("Timeout waiting for event %s", command.event)
+            return
+
         if isinstance(command, SamsungTVCommand):
             payload = command.get_payload()
         else:
             payload = json.dumps(command)
-        _LOGGING.debug("SamsungTVWS websocket command: %s", payload)
-        await connection.send(payload)
+        await self._send_payload(connection, payload)
 
         await asyncio.sleep(delay)
 
+    async def _send_payload(self, connection: ClientConnection, payload: str) -> None:
+        """Send an already serialized command frame."""
+        log_frame(_LOGGING, "SamsungTVWS websocket command: %s", payload)
+        await connection.send(payload)
+        self.stats.record_frame_sent(len(payload))
+        self._last_command_sent = time.monotonic()
+
     def is_alive(self) -> bool:
         return self.connection is not None and self.connection.state is not State.CLOSED
@@ -8,10 +8,11 @@ SPDX-License-Identifier: LGPL-3.0
 
 from __future__ import annotations
 
+import asyncio
 from asyncio import Future, TimeoutError as AsyncioTimeoutError
 import logging
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 if sys.version_info >= (3, 11):
     from asyncio import timeout
@@ -21,6 +22,9 @@ else:
 from . import async_connection, remote, rest
 from .event import ED_INSTALLED_APP_EVENT, parse_installed_app
 
+if TYPE_CHECKING:
+    from .macro import SamsungTVMacro
+
 _LOGGING = logging.getLogger(__name__)
 
 
@@ -63,6 +67,23 @@ class SamsungTVWSAsyncRemote(async_connection.SamsungTVWSAsyncConnection):
             return None
         return parse_installed_app(response)
 
+    async def run_macro(self, macro: SamsungTVMacro) -> None:
+        """Run a compiled macro, on the schedule of SamsungTVMacro.schedule()."""
+        if self.connection is None:
+            self.connection = await self.open()
+
+        _LOGGING.debug("Running macro %s (%d steps)", macro.name, len(macro))
+        for delay, step in macro.schedule(self.key_press_delay):
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if step.wait_event:
+                await self.wait_for_event(
+                    step.wait_event, step.timeout, since=self._last_command_sent
+                )
+            elif step.payload is not None:
+                await self._send_payload(self.connection, step.payload)
+
     def _websocket_event(self, event: str, response: dict[str, Any]) -> None:
         """Handle websocket event."""
         super()._websocket_event(event, response)
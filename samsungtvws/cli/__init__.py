@@ -1,11 +1,16 @@
-from . import (
-    apps as _apps,  # noqa: F401
-    art as _art,  # noqa: F401
-    remote as _remote,  # noqa: F401
-    rest as _rest,  # noqa: F401
-    shortcuts as _shortcuts,  # noqa: F401
-    wol as _wol,  # noqa: F401
-)
+# Command modules register themselves on first use, see main.COMMAND_MODULES
+import sys
+
 from .main import cli
 
-__all__ = ["cli"]
+__all__ = ["cli", "main"]
+
+
+def main() -> None:
+    """`samsungtv` entry point, hands the command to a running daemon if any."""
+    from .daemon import forward_to_daemon
+
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    cli(prog_name="samsungtv")
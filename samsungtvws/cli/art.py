@@ -8,13 +8,17 @@ SPDX-License-Identifier: LGPL-3.0
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import json
+import logging
 import os
 import random
+import sys
 import tempfile
-from typing import Any
-import urllib.parse
-import urllib.request
+from typing import IO, Any, cast
 
 import typer
 
@@ -22,6 +26,13 @@ from samsungtvws import exceptions
 
 from .main import cli, get_tv
 
+_LOGGING = logging.getLogger(__name__)
+
+# Category of the photos uploaded by art-sync
+_MY_PHOTOS_CATEGORY = "MY-C0002"
+# Journal records folded into the art-sync state file at once
+_JOURNAL_COMPACT_EVERY = 50
+
 
 def _require_art_supported(ctx: typer.Context) -> None:
     tv = get_tv(ctx)
@@ -32,42 +43,6 @@ def _require_art_supported(ctx: typer.Context) -> None:
         raise typer.Exit(code=2)
 
 
-def _download_url_to_temp_path(image_url: str) -> tuple[str, str]:
-    parsed_url = urllib.parse.urlparse(image_url)
-    _, url_extension = os.path.splitext(parsed_url.path)
-
-    inferred_file_type = url_extension[1:].lower() if url_extension else "jpg"
-    if inferred_file_type == "jpeg":
-        inferred_file_type = "jpg"
-
-    file_descriptor, temp_path = tempfile.mkstemp(
-        prefix="samsungtvws-art-",
-        suffix=f".{inferred_file_type}",
-    )
-    os.close(file_descriptor)
-
-    request = urllib.request.Request(
-        image_url,
-        headers={"User-Agent": "samsungtvws-cli/1.0"},
-        method="GET",
-    )
-
-    try:
-        with (
-            urllib.request.urlopen(request, timeout=60) as response,
-            open(temp_path, "wb") as output_file,
-        ):
-            output_file.write(response.read())
-    except Exception:
-        try:
-            os.remove(temp_path)
-        except OSError:
-            pass
-        raise
-
-    return temp_path, inferred_file_type
-
-
 def _versioned_state(files: None | dict[str, Any] = None) -> dict[str, Any]:
     return {"version": 1, "files": {} if not files else files}
 
@@ -94,29 +69,147 @@ def _load_state_file(state_file_path: str) -> dict[str, Any]:
 
 
 def _save_state_file(state_file_path: str, state: dict[str, Any]) -> None:
-    with open(state_file_path, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    # Write a sibling file and rename it over the old one: readers see the
+    # previous state or the new one, never a truncated file
+    directory = os.path.dirname(os.path.abspath(state_file_path))
+    file_descriptor, temp_path = tempfile.mkstemp(
+        prefix=".samsungtvws-art-sync-", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, state_file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
 
 
-def _file_fingerprint(path: str) -> dict[str, Any]:
-    stat = os.stat(path)
-    fingerprint: dict[str, Any] = {
+class _ArtSyncState(MutableMapping[str, Any]):
+    """
+    Cached files of an art-sync state file, journaled as they change.
+
+    Every change is appended to `<state file>.journal` and synced to disk,
+    so an interrupted sync resumes where it stopped. The journal is folded
+    into the state file every `compact_every` changes and on close.
+    """
+
+    def __init__(
+        self, state_file_path: str, compact_every: int = _JOURNAL_COMPACT_EVERY
+    ) -> None:
+        self.state_file_path = state_file_path
+        self.journal_path = f"{state_file_path}.journal"
+        self.compact_every = compact_every
+        self._files: dict[str, Any] = _load_state_file(state_file_path)["files"]
+        self._journal: IO[str] | None = None
+        self._pending = 0
+        if self._replay_journal():
+            # Resuming: start from a clean state file, and never append
+            # after a torn record
+            self.compact()
+
+    def _replay_journal(self) -> int:
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+
+        replayed = 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+                path = record["path"]
+                entry = record["entry"]
+            except (ValueError, KeyError, TypeError):
+                # Torn last write of an interrupted run
+                _LOGGING.debug("Ignoring journal record: %r", line)
+                continue
+            if entry is None:
+                self._files.pop(path, None)
+            else:
+                self._files[path] = entry
+            replayed += 1
+        return replayed
+
+    def _append(self, path: str, entry: dict[str, Any] | None) -> None:
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        record = {"path": path, "entry": entry}
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Write the state file atomically and start a new journal."""
+        _save_state_file(self.state_file_path, _versioned_state(self._files))
+        # A crash before this point replays records the state file already has
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.journal_path)
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._pending or not os.path.isfile(self.state_file_path):
+            self.compact()
+
+    def __enter__(self) -> _ArtSyncState:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __getitem__(self, path: str) -> Any:
+        return self._files[path]
+
+    def __setitem__(self, path: str, entry: dict[str, Any]) -> None:
+        if self._files.get(path) == entry:
+            return
+        self._files[path] = entry
+        self._append(path, entry)
+
+    def __delitem__(self, path: str) -> None:
+        del self._files[path]
+        self._append(path, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+def _stat_fingerprint(stat: os.stat_result) -> dict[str, Any]:
+    return {
         "size": int(stat.st_size),
         "mtime_ns": int(stat.st_mtime_ns),
+        "inode": int(stat.st_ino),
     }
-    return fingerprint
+
+
+def _file_fingerprint(path: str) -> dict[str, Any]:
+    return _stat_fingerprint(os.stat(path))
 
 
 def _fingerprint_matches(cached: dict[str, Any], current: dict[str, Any]) -> bool:
     if cached.get("size") != current.get("size"):
         return False
-    if cached.get("mtime_ns") != current.get("mtime_ns"):
-        return False
-    return True
+    if cached.get("mtime_ns") == current.get("mtime_ns"):
+        return True
+    # Touched, copied or restored, but still the same content
+    content_hash = current.get("sha256")
+    return content_hash is not None and cached.get("sha256") == content_hash
 
 
 def _cached_content_id(
-    cached_files: dict[str, Any],
+    cached_files: MutableMapping[str, Any],
     image_path: str,
     fingerprint: dict[str, Any],
     *,
@@ -133,28 +226,114 @@ def _cached_content_id(
     return content_id if isinstance(content_id, str) else None
 
 
-def _iter_image_paths(
+def _scan_image_files(
     root_dir: str, recursive: bool, allowed_extensions: set[str]
-) -> list[str]:
-    image_paths: list[str] = []
-
-    if recursive:
-        for directory_path, _, file_names in os.walk(root_dir):
-            for file_name in file_names:
-                _, ext = os.path.splitext(file_name)
-                if ext[1:].lower() in allowed_extensions:
-                    image_paths.append(os.path.join(directory_path, file_name))
-    else:
-        for file_name in os.listdir(root_dir):
-            full_path = os.path.join(root_dir, file_name)
-            if not os.path.isfile(full_path):
+) -> dict[str, dict[str, Any]]:
+    """Map every image below root_dir, sorted by path, to its stat fingerprint."""
+    fingerprints: dict[str, dict[str, Any]] = {}
+    pending = [root_dir]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                    continue
+                _, ext = os.path.splitext(entry.name)
+                if ext[1:].lower() not in allowed_extensions or not entry.is_file():
+                    continue
+                # DirEntry.stat() reuses what scandir already read where it can
+                fingerprints[entry.path] = _stat_fingerprint(entry.stat())
+
+    return dict(sorted(fingerprints.items()))
+
+
+def _stat_key(fingerprint: dict[str, Any]) -> tuple[Any, ...] | None:
+    if fingerprint.get("inode") is None:
+        return None
+    return (fingerprint["inode"], fingerprint.get("size"), fingerprint.get("mtime_ns"))
+
+
+def _hash_image_files(
+    fingerprints: dict[str, dict[str, Any]],
+    cached_files: MutableMapping[str, Any],
+    image_paths: list[str],
+    *,
+    workers: int,
+    refresh: bool,
+) -> None:
+    """
+    Add the content hash to the fingerprints of image_paths.
+
+    Files with the inode, size and mtime of a cached entry (unchanged or
+    renamed) reuse its hash, the rest are read in a thread pool.
+    """
+    known_hashes: dict[tuple[Any, ...], str] = {}
+    if not refresh:
+        for cached_entry in cached_files.values():
+            if not isinstance(cached_entry, dict):
                 continue
-            _, ext = os.path.splitext(file_name)
-            if ext[1:].lower() in allowed_extensions:
-                image_paths.append(full_path)
+            key = _stat_key(cached_entry)
+            if key is not None and isinstance(cached_entry.get("sha256"), str):
+                known_hashes[key] = cached_entry["sha256"]
+
+    to_hash: list[str] = []
+    for image_path in image_paths:
+        fingerprint = fingerprints[image_path]
+        key = _stat_key(fingerprint)
+        if key in known_hashes:
+            fingerprint["sha256"] = known_hashes[key]
+        else:
+            to_hash.append(image_path)
+
+    if not to_hash:
+        return
+    from samsungtvws.art.dedupe import file_hash
 
-    image_paths.sort()
-    return image_paths
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for image_path, content_hash in zip(to_hash, executor.map(file_hash, to_hash)):
+            fingerprints[image_path]["sha256"] = content_hash
+
+
+def _adopt_moved_files(
+    cached_files: MutableMapping[str, Any],
+    fingerprints: dict[str, dict[str, Any]],
+    image_paths: list[str],
+) -> int:
+    """
+    Give new paths the content_id of a cached entry with the same content.
+
+    Entries of files that no longer exist are moved to the new path, so a
+    renamed or reorganized library is not uploaded again.
+    """
+    paths_by_hash: dict[str, str] = {}
+    for cached_path, cached_entry in cached_files.items():
+        if not isinstance(cached_entry, dict):
+            continue
+        content_hash = cached_entry.get("sha256")
+        if isinstance(content_hash, str) and isinstance(
+            cached_entry.get("content_id"), str
+        ):
+            paths_by_hash.setdefault(content_hash, cached_path)
+
+    adopted_count = 0
+    for image_path in image_paths:
+        fingerprint = fingerprints[image_path]
+        old_path = paths_by_hash.get(fingerprint.get("sha256", ""))
+        if image_path in cached_files or old_path is None:
+            continue
+
+        content_id = cached_files[old_path]["content_id"]
+        if os.path.exists(old_path):
+            typer.echo(f"OK: copied {old_path} -> {image_path} ({content_id})")
+        else:
+            cached_files.pop(old_path)
+            typer.echo(f"OK: moved {old_path} -> {image_path} ({content_id})")
+        cached_files[image_path] = {"content_id": content_id, **fingerprint}
+        paths_by_hash[fingerprint["sha256"]] = image_path
+        adopted_count += 1
+
+    return adopted_count
 
 
 def _resolve_pick_mode(
@@ -184,38 +363,35 @@ def _resolve_show_flag(show: bool | None, pick_random: bool) -> bool:
 
 def _handle_random_pick(
     art: Any,
-    image_paths: list[str],
-    cached_files: dict[str, Any],
+    chosen_path: str,
+    chosen_fingerprint: dict[str, Any],
+    cached_files: MutableMapping[str, Any],
     refresh: bool,
     upload_arguments: dict[str, Any],
     show_flag: bool,
 ) -> tuple[int, int]:
     uploaded_count = 0
     skipped_count = 0
-    chosen_path = random.choice(image_paths)
-    chosen_fingerprint = _file_fingerprint(chosen_path)
-
-    cached_entry = cached_files.get(chosen_path)
-    if (
-        not refresh
-        and isinstance(cached_entry, dict)
-        and _fingerprint_matches(cached_entry, chosen_fingerprint)
-        and isinstance(cached_entry.get("content_id"), str)
-    ):
-        content_id_to_display = cached_entry["content_id"]
+
+    cached_id = _cached_content_id(
+        cached_files, chosen_path, chosen_fingerprint, refresh=refresh
+    )
+    if cached_id is not None:
+        content_id_to_display = cached_id
         skipped_count = 1
         typer.echo(f"OK: cached {chosen_path} -> {content_id_to_display}")
     else:
-        uploaded_content_id = art.upload(chosen_path, **upload_arguments)
+        content_id_to_display = art.upload(
+            chosen_path,
+            **_source_arguments(chosen_path, chosen_fingerprint, upload_arguments),
+        )
         uploaded_count = 1
-        typer.echo(f"OK: uploaded {chosen_path} -> {uploaded_content_id}")
+        typer.echo(f"OK: uploaded {chosen_path} -> {content_id_to_display}")
 
-        cached_files[chosen_path] = {
-            "content_id": uploaded_content_id,
-            **chosen_fingerprint,
-        }
-
-        content_id_to_display = uploaded_content_id
+    cached_files[chosen_path] = {
+        "content_id": content_id_to_display,
+        **chosen_fingerprint,
+    }
 
     art.select_image(content_id_to_display, show=show_flag)
     typer.echo(f"OK: displayed {content_id_to_display}")
@@ -223,48 +399,214 @@ def _handle_random_pick(
     return (uploaded_count, skipped_count)
 
 
-def _handle_sync_removal(art: Any, cached_files: dict[str, Any]) -> tuple[int, int]:
-    deleted_count = 0
-    delete_failed_count = 0
+def _tv_content_ids(art: Any) -> set[str]:
+    return {
+        item["content_id"] for item in art.available(_MY_PHOTOS_CATEGORY, refresh=True)
+    }
+
+
+def _reconcile_with_tv(art: Any, cached_files: MutableMapping[str, Any]) -> set[str]:
+    """
+    Drop cache entries whose artwork is no longer on the TV.
+
+    The uploaded photos are listed with a single request, the files of
+    dropped entries are uploaded again. Returns the content ids on the TV.
+    """
+    tv_content_ids = _tv_content_ids(art)
 
     for cached_path, cached_entry in list(cached_files.items()):
-        if os.path.exists(cached_path):
-            continue
         content_id = None
         if isinstance(cached_entry, dict):
-            cid = cached_entry.get("content_id")
-            if isinstance(cid, str):
-                content_id = cid
-
-        if content_id:
-            ok = art.delete(content_id)
-            if not ok:
-                delete_failed_count += 1
+            content_id = cached_entry.get("content_id")
+        if isinstance(content_id, str) and content_id in tv_content_ids:
+            continue
+        typer.echo(f"OK: forgot {cached_path} -> {content_id} (not on the TV)")
+        cached_files.pop(cached_path)
+
+    return tv_content_ids
+
+
+def _handle_sync_removal(
+    art: Any, cached_files: MutableMapping[str, Any]
+) -> tuple[int, int]:
+    # Expects a reconciled cache: every entry holds a content_id on the TV
+    missing_paths: dict[str, list[str]] = {}
+    # Copies share a content_id, keep it while one of them is left
+    kept_content_ids: set[str] = set()
+    for cached_path, cached_entry in cached_files.items():
+        content_id = cached_entry["content_id"]
+        if os.path.exists(cached_path):
+            kept_content_ids.add(content_id)
+        else:
+            missing_paths.setdefault(content_id, []).append(cached_path)
+
+    to_delete = [cid for cid in missing_paths if cid not in kept_content_ids]
+    if to_delete and not art.delete_list(to_delete):
+        for content_id in to_delete:
+            for cached_path in missing_paths[content_id]:
                 typer.echo(
                     f"ERROR: failed to delete missing {cached_path} -> {content_id}",
                     err=True,
                 )
-                continue
-            typer.echo(f"OK: deleted missing {cached_path} -> {content_id}")
-            deleted_count += 1
+        return (0, len(to_delete))
+
+    for content_id, cached_paths in missing_paths.items():
+        for cached_path in cached_paths:
+            if content_id not in kept_content_ids:
+                typer.echo(f"OK: deleted missing {cached_path} -> {content_id}")
+            cached_files.pop(cached_path)
+    return (len(to_delete), 0)
+
+
+def _describe_progress(progress: Any) -> str | None:
+    if progress is None:
+        return None
+    return f"{progress.bytes_per_second / (1024 * 1024):.1f} MiB/s"
+
+
+class _TransferProgressBar:
+    """
+    Draw the TransferProgress reports of SamsungTVArt on stderr, one bar
+    per file. `label` replaces the file name reported by the TV.
+    """
+
+    def __init__(self, label: str | None = None) -> None:
+        self.label = label
+        self._bar: Any = None
+        self._name: str | None = None
+        self._done = 0
+
+    def __call__(self, progress: Any) -> None:
+        # A new file, or the same one sent again after a failure
+        if (
+            self._bar is None
+            or progress.name != self._name
+            or progress.bytes_done < self._done
+        ):
+            self._open(progress)
+        self._bar.current_item = progress
+        self._bar.update(progress.bytes_done - self._done)
+        self._done = progress.bytes_done
+        if progress.bytes_done >= progress.bytes_total:
+            self.close()
+
+    def _open(self, progress: Any) -> None:
+        self.close()
+        label = self.label or progress.name
+        if progress.files_total > 1:
+            label = f"[{progress.files_done + 1}/{progress.files_total}] {label}"
+        self._bar = typer.progressbar(
+            length=progress.bytes_total,
+            label=label,
+            file=sys.stderr,
+            show_eta=False,
+            item_show_func=_describe_progress,
+        )
+        self._bar.__enter__()
+        self._name = progress.name
+        self._done = 0
+
+    def close(self) -> None:
+        if self._bar is not None:
+            self._bar.__exit__(None, None, None)
+            self._bar = None
+
+
+def _create_progress_bar(progress: bool | None) -> _TransferProgressBar | None:
+    # Only draw on a terminal unless asked to
+    if progress is None:
+        progress = sys.stderr.isatty()
+    return _TransferProgressBar() if progress else None
+
+
+def _set_retry_policy(art: Any, retries: int) -> None:
+    from samsungtvws.art.retry import RetryPolicy
+
+    art.retry_policy = RetryPolicy(attempts=retries + 1)
+
+
+def _iter_upload_sources(
+    image_paths: list[str], upload_arguments: dict[str, Any]
+) -> Iterator[tuple[str, str | bytes]]:
+    """
+    Yield (path, what to upload). With a preprocessor, images are shrunk
+    in a process pool while the previous ones are being uploaded.
+    """
+    preprocessor = upload_arguments.get("preprocessor")
+    if preprocessor is None:
+        return ((image_path, image_path) for image_path in image_paths)
+    return cast(Iterator[tuple[str, bytes]], preprocessor.process_files(image_paths))
+
+
+def _source_arguments(
+    source: str | bytes, fingerprint: dict[str, Any], upload_arguments: dict[str, Any]
+) -> dict[str, Any]:
+    # Hashed by the scan already, and the upload index key of the original
+    arguments = {**upload_arguments, "source_hash": fingerprint.get("sha256")}
+    if isinstance(source, str):
+        return arguments
+    # Already preprocessed
+    return {**arguments, "preprocessor": None, "file_type": "jpg"}
+
+
+def _create_preprocessor(preprocess: bool, quality: int) -> Any:
+    if not preprocess:
+        return None
+    from samsungtvws.art.preprocess import ImagePreprocessor
+
+    try:
+        return ImagePreprocessor(quality=quality)
+    except (ImportError, ValueError) as err:
+        raise typer.BadParameter(str(err)) from err
+
+
+def _upload_index_path(cfg: dict[str, Any]) -> str:
+    from samsungtvws.art.preprocess import default_cache_dir
+
+    cache_dir = os.path.dirname(default_cache_dir())
+    return os.path.join(cache_dir, f"uploads-{cfg['host']}-{cfg['port']}.json")
 
-        # Remove from cache even if there was no content_id
-        cached_files.pop(cached_path, None)
-    return (deleted_count, delete_failed_count)
+
+def _attach_upload_index(
+    ctx: typer.Context,
+    art: Any,
+    tv_content_ids: set[str] | None,
+    index_thumbnails: bool,
+) -> None:
+    """Let art.upload() skip images the TV already has."""
+    from samsungtvws.art.dedupe import UploadIndex
+
+    # Thumbnails are only indexed to match similar images
+    index = UploadIndex(_upload_index_path(ctx.obj), match_similar=index_thumbnails)
+    if tv_content_ids is None:
+        tv_content_ids = _tv_content_ids(art)
+    # Artworks deleted from the remote or other clients
+    index.retain(tv_content_ids)
+
+    if index_thumbnails:
+        missing = index.without_thumbnail(sorted(tv_content_ids))
+        if missing:
+            try:
+                index.add_thumbnails(art.get_thumbnail_list(missing))
+            except ImportError as err:
+                raise typer.BadParameter(str(err)) from err
+            typer.echo(f"OK: indexed {len(missing)} thumbnails")
+
+    art.upload_index = index
 
 
 def _handle_upload_all(
     art: Any,
-    image_paths: list[str],
-    cached_files: dict[str, Any],
+    fingerprints: dict[str, dict[str, Any]],
+    cached_files: MutableMapping[str, Any],
     refresh: bool,
     upload_arguments: dict[str, Any],
 ) -> tuple[int, int]:
     uploaded_count = 0
     skipped_count = 0
 
-    for image_path in image_paths:
-        fingerprint = _file_fingerprint(image_path)
+    pending_paths: list[str] = []
+    for image_path, fingerprint in fingerprints.items():
         existing_id = _cached_content_id(
             cached_files,
             image_path,
@@ -273,15 +615,26 @@ def _handle_upload_all(
         )
         if existing_id is not None:
             skipped_count += 1
+            # Keep the inode, mtime and hash current for the next scan
+            cached_files[image_path] = {"content_id": existing_id, **fingerprint}
             continue
-
-        uploaded_content_id = art.upload(image_path, **upload_arguments)
+        pending_paths.append(image_path)
+
+    progress_bar = upload_arguments.get("progress")
+    sources = _iter_upload_sources(pending_paths, upload_arguments)
+    for index, (image_path, source) in enumerate(sources, 1):
+        if progress_bar is not None:
+            progress_bar.label = f"[{index}/{len(pending_paths)}] {image_path}"
+        uploaded_content_id = art.upload(
+            source,
+            **_source_arguments(source, fingerprints[image_path], upload_arguments),
+        )
         uploaded_count += 1
         typer.echo(f"OK: uploaded {image_path} -> {uploaded_content_id}")
 
         cached_files[image_path] = {
             "content_id": uploaded_content_id,
-            **fingerprint,
+            **fingerprints[image_path],
         }
 
     return (uploaded_count, skipped_count)
@@ -362,16 +715,24 @@ def art_thumbnail(
     legacy: bool = typer.Option(
         False, "--legacy", help="Use legacy get_thumbnail instead of get_thumbnail_list"
     ),
+    progress: bool | None = typer.Option(
+        None,
+        "--progress/--no-progress",
+        help="Show transfer progress on stderr (default: when it is a terminal)",
+    ),
 ) -> None:
     """Fetch thumbnail and write it to a file."""
     _require_art_supported(ctx)
     tv = get_tv(ctx)
     art = tv.art()
 
+    progress_bar = _create_progress_bar(progress)
     if legacy:
-        thumbs: dict[str, bytearray] = art.get_thumbnail(content_id, as_dict=True)  # type: ignore[assignment]
+        thumbs: dict[str, bytearray] = art.get_thumbnail(  # type: ignore[assignment]
+            content_id, as_dict=True, progress=progress_bar
+        )
     else:
-        thumbs = art.get_thumbnail_list(content_id)
+        thumbs = art.get_thumbnail_list(content_id, progress=progress_bar)
 
     if not thumbs:
         raise typer.Exit(code=1)
@@ -391,10 +752,10 @@ def art_thumbnail(
 def art_upload(
     ctx: typer.Context,
     file: str | None = typer.Argument(None, help="Path to image file"),
-    url: str | None = typer.Option(
+    url: list[str] | None = typer.Option(  # noqa: B008
         None,
         "--url",
-        help="Image URL to download and upload",
+        help="Image URL to download and upload (repeat to upload several)",
     ),
     matte: str = typer.Option(
         "shadowbox_polar",
@@ -411,47 +772,89 @@ def art_upload(
         "--file-type",
         help="Override file type (png/jpg/jpeg). If omitted, inferred from filename.",
     ),
+    preprocess: bool = typer.Option(
+        False,
+        "--preprocess/--no-preprocess",
+        help="Resize to 3840x2160, recompress to JPEG and strip EXIF before upload (needs Pillow)",
+    ),
+    quality: int = typer.Option(
+        90, "--quality", min=1, max=95, help="JPEG quality used by --preprocess"
+    ),
+    dedupe: bool = typer.Option(
+        True,
+        "--dedupe/--no-dedupe",
+        help="Skip images already uploaded to this TV (by content hash)",
+    ),
+    index_thumbnails: bool = typer.Option(
+        False,
+        "--index-thumbnails",
+        help="Also skip images that look like ones on the TV, by thumbnail (needs Pillow)",
+    ),
+    retries: int = typer.Option(
+        2,
+        "--retries",
+        min=0,
+        help="Retry failed transfers this many times, with backoff",
+    ),
+    progress: bool | None = typer.Option(
+        None,
+        "--progress/--no-progress",
+        help="Show transfer progress on stderr (default: when it is a terminal)",
+    ),
+    downloads: int = typer.Option(
+        4, "--downloads", min=1, help="URLs downloaded at once"
+    ),
 ) -> None:
     """Upload an image and print content_id."""
+    from .art_pipeline import UploadPipeline, UploadResult
+
     _require_art_supported(ctx)
 
-    if file is None and url is None:
+    if file is None and not url:
         raise typer.BadParameter("Provide FILE or --url.")
 
-    if file is not None and url is not None:
+    if file is not None and url:
         raise typer.BadParameter("Use either a file path or --url, not both.")
 
+    if file is not None and not os.path.exists(file):
+        raise typer.BadParameter(f"File not found: {file}")
+
     tv = get_tv(ctx)
     art = tv.art()
+    _set_retry_policy(art, retries)
+    art.upload_index = None
+    if dedupe:
+        _attach_upload_index(ctx, art, None, index_thumbnails)
 
-    upload_arguments = {
+    upload_arguments: dict[str, Any] = {
         "matte": matte,
         "portrait_matte": portrait_matte,
+        "preprocessor": _create_preprocessor(preprocess, quality),
+        "progress": _create_progress_bar(progress),
     }
     if file_type:
         upload_arguments["file_type"] = file_type
 
-    temporary_path: str | None = None
-    try:
-        if url is not None:
-            temporary_path, inferred_file_type = _download_url_to_temp_path(url)
-            upload_path = temporary_path
-            if file_type is None:
-                upload_arguments["file_type"] = inferred_file_type
+    sources = [file] if file is not None else list(url or [])
+    failed_count = 0
+
+    def _report(result: UploadResult) -> None:
+        nonlocal failed_count
+        if result.error is not None:
+            failed_count += 1
+            typer.echo(
+                f"ERROR: failed to upload {result.source}: {result.error}", err=True
+            )
+        elif len(sources) == 1:
+            typer.echo(f"OK: uploaded -> {result.content_id}")
         else:
-            assert file is not None
-            upload_path = file
-            if not os.path.exists(upload_path):
-                raise typer.BadParameter(f"File not found: {upload_path}")
-
-        content_id = art.upload(upload_path, **upload_arguments)
-        typer.echo(f"OK: uploaded -> {content_id}")
-    finally:
-        if temporary_path:
-            try:
-                os.remove(temporary_path)
-            except OSError:
-                pass
+            typer.echo(f"OK: uploaded {result.source} -> {result.content_id}")
+
+    # Downloads and preprocessing overlap the uploads
+    pipeline = UploadPipeline(art, upload_arguments, downloads=downloads)
+    asyncio.run(pipeline.run(sources, _report))
+    if failed_count:
+        raise typer.Exit(code=1)
 
 
 @cli.command("art-sync")
@@ -480,6 +883,9 @@ def art_sync(
         False, "--no-state", help="Do not read/write cache file"
     ),
     refresh: bool = typer.Option(False, "--refresh", help="Ignore cache and re-upload"),
+    workers: int = typer.Option(
+        4, "--workers", min=1, help="Threads used to hash image contents"
+    ),
     show: bool | None = typer.Option(
         None, "--show/--no-show", help="Show when selecting"
     ),
@@ -496,6 +902,35 @@ def art_sync(
         "--file-type",
         help="Override file type (png/jpg/jpeg). If omitted, inferred from filename.",
     ),
+    preprocess: bool = typer.Option(
+        False,
+        "--preprocess/--no-preprocess",
+        help="Resize to 3840x2160, recompress to JPEG and strip EXIF before upload (needs Pillow)",
+    ),
+    quality: int = typer.Option(
+        90, "--quality", min=1, max=95, help="JPEG quality used by --preprocess"
+    ),
+    dedupe: bool = typer.Option(
+        True,
+        "--dedupe/--no-dedupe",
+        help="Skip images already uploaded to this TV (by content hash)",
+    ),
+    index_thumbnails: bool = typer.Option(
+        False,
+        "--index-thumbnails",
+        help="Also skip images that look like ones on the TV, by thumbnail (needs Pillow)",
+    ),
+    retries: int = typer.Option(
+        2,
+        "--retries",
+        min=0,
+        help="Retry failed transfers this many times, with backoff",
+    ),
+    progress: bool | None = typer.Option(
+        None,
+        "--progress/--no-progress",
+        help="Show transfer progress on stderr (default: when it is a terminal)",
+    ),
 ) -> None:
     _require_art_supported(ctx)
 
@@ -514,56 +949,76 @@ def art_sync(
 
     show_flag = _resolve_show_flag(show, pick_random)
 
-    # Prepare file cache
-    resolved_state_file = ""
-    state = _versioned_state()
-    if not no_state:
-        resolved_state_file = state_file or _state_file_path_for_folder(folder)
-        state = _load_state_file(resolved_state_file)
-    cached_files = state["files"]
-    assert isinstance(cached_files, dict)
+    # Prepare file cache, journaled so an interrupted sync can resume
+    state: contextlib.AbstractContextManager[MutableMapping[str, Any]]
+    if no_state:
+        state = contextlib.nullcontext({})
+    else:
+        state = _ArtSyncState(state_file or _state_file_path_for_folder(folder))
 
     # Frame connection
     tv = get_tv(ctx)
     art = tv.art()
+    _set_retry_policy(art, retries)
 
     # Compose upload arguments
     upload_arguments: dict[str, Any] = {
         "matte": matte,
         "portrait_matte": portrait_matte,
+        "preprocessor": _create_preprocessor(preprocess, quality),
+        "progress": _create_progress_bar(progress),
     }
     if file_type is not None:
         upload_arguments["file_type"] = file_type
 
-    # Parse image paths
-    image_paths = _iter_image_paths(
-        folder, recursive=recursive, allowed_extensions=allowed_extensions
-    )
-    if not image_paths and not sync_all:
-        typer.echo("OK: no images found")
-        raise typer.Exit(code=0)
-
-    deleted_count = 0
-    delete_failed_count = 0
-    if sync_all:
-        (deleted_count, delete_failed_count) = _handle_sync_removal(art, cached_files)
-
-    if pick_random:
-        (uploaded_count, skipped_count) = _handle_random_pick(
-            art=art,
-            image_paths=image_paths,
-            cached_files=cached_files,
-            refresh=refresh,
-            upload_arguments=upload_arguments,
-            show_flag=show_flag,
+    with state as cached_files:
+        # Scan images, hashing only what the selected mode needs
+        fingerprints = _scan_image_files(
+            folder, recursive=recursive, allowed_extensions=allowed_extensions
         )
-    else:
-        (uploaded_count, skipped_count) = _handle_upload_all(
-            art, image_paths, cached_files, refresh, upload_arguments
+        if not fingerprints and not sync_all:
+            typer.echo("OK: no images found")
+            raise typer.Exit(code=0)
+
+        tv_content_ids = None
+        if not no_state:
+            tv_content_ids = _reconcile_with_tv(art, cached_files)
+        art.upload_index = None
+        # --refresh re-uploads, the index would hand back the old content_ids
+        if dedupe and not refresh:
+            _attach_upload_index(ctx, art, tv_content_ids, index_thumbnails)
+
+        image_paths = list(fingerprints)
+        if pick_random:
+            image_paths = [random.choice(image_paths)]
+        _hash_image_files(
+            fingerprints, cached_files, image_paths, workers=workers, refresh=refresh
         )
-
-    if not no_state:
-        _save_state_file(resolved_state_file, state)
+        if not refresh:
+            # Before removals, a moved file must not be deleted from the TV
+            _adopt_moved_files(cached_files, fingerprints, image_paths)
+
+        deleted_count = 0
+        delete_failed_count = 0
+        if sync_all:
+            (deleted_count, delete_failed_count) = _handle_sync_removal(
+                art, cached_files
+            )
+
+        if pick_random:
+            (uploaded_count, skipped_count) = _handle_random_pick(
+                art=art,
+                chosen_path=image_paths[0],
+                chosen_fingerprint=fingerprints[image_paths[0]],
+                cached_files=cached_files,
+                refresh=refresh,
+                upload_arguments=upload_arguments,
+                show_flag=show_flag,
+            )
+        else:
+            (uploaded_count, skipped_count) = _handle_upload_all(
+                art, fingerprints, cached_files, refresh, upload_arguments
+            )
 
     typer.echo(
         f"OK: done (uploaded={uploaded_count}, skipped={skipped_count}, deleted={deleted_count})"
@@ -574,6 +1029,130 @@ def art_sync(
     return
 
 
+@cli.command("art-rotate")
+def art_rotate(
+    ctx: typer.Context,
+    folder: str = typer.Argument(..., help="Folder containing images"),
+    interval: float = typer.Option(
+        600, "--interval", min=0, help="Seconds between images"
+    ),
+    lookahead: int = typer.Option(
+        2, "--lookahead", min=0, help="Images uploaded ahead of their tick"
+    ),
+    shuffle: bool = typer.Option(
+        True, "--shuffle/--in-order", help="Shuffle the images on each pass"
+    ),
+    count: int = typer.Option(
+        0, "--count", min=0, help="Stop after this many images (0: run forever)"
+    ),
+    recursive: bool = typer.Option(
+        True, "--recursive/--no-recursive", help="Scan subfolders"
+    ),
+    extensions: str = typer.Option(
+        "jpg,jpeg,png", "--extensions", help="Comma-separated extensions"
+    ),
+    show: bool = typer.Option(True, "--show/--no-show", help="Show when selecting"),
+    matte: str = typer.Option(
+        "shadowbox_polar", "--matte", help="Matte id (use 'none' to disable)"
+    ),
+    portrait_matte: str = typer.Option(
+        "shadowbox_polar",
+        "--portrait-matte",
+        help="Portrait matte id (use 'none' to disable)",
+    ),
+    preprocess: bool = typer.Option(
+        False,
+        "--preprocess/--no-preprocess",
+        help="Resize to 3840x2160, recompress to JPEG and strip EXIF before upload (needs Pillow)",
+    ),
+    quality: int = typer.Option(
+        90, "--quality", min=1, max=95, help="JPEG quality used by --preprocess"
+    ),
+    dedupe: bool = typer.Option(
+        True,
+        "--dedupe/--no-dedupe",
+        help="Skip images already uploaded to this TV (by content hash)",
+    ),
+    retries: int = typer.Option(
+        2,
+        "--retries",
+        min=0,
+        help="Retry failed transfers this many times, with backoff",
+    ),
+) -> None:
+    """Rotate the images of a folder, over one long-lived connection."""
+    from samsungtvws.art.rotation import ArtRotator
+
+    _require_art_supported(ctx)
+
+    folder = os.path.abspath(folder)
+    if not os.path.isdir(folder):
+        raise typer.BadParameter(f"Folder not found: {folder}")
+    allowed_extensions = {
+        ext.strip().lower().lstrip(".") for ext in extensions.split(",") if ext.strip()
+    }
+    images = list(_scan_image_files(folder, recursive, allowed_extensions))
+    if not images:
+        typer.echo("OK: no images found")
+        raise typer.Exit(code=0)
+
+    tv = get_tv(ctx)
+    art = tv.art()
+    _set_retry_policy(art, retries)
+    art.upload_index = None
+    if dedupe:
+        _attach_upload_index(ctx, art, None, False)
+
+    rotator = ArtRotator(
+        art,
+        images,
+        interval=interval,
+        lookahead=lookahead,
+        shuffle=shuffle,
+        show=show,
+        upload_arguments={
+            "matte": matte,
+            "portrait_matte": portrait_matte,
+            "preprocessor": _create_preprocessor(preprocess, quality),
+        },
+    )
+    typer.echo(f"OK: rotating {len(images)} images every {interval:g}s")
+    with contextlib.suppress(KeyboardInterrupt):
+        rotator.run(ticks=count or None)
+    typer.echo(f"OK: stopped on {rotator.current}")
+
+
+@cli.command("art-export")
+def art_export(
+    ctx: typer.Context,
+    dest: str = typer.Argument(
+        ...,
+        help="Output directory, or archive (.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz)",
+    ),
+    category: str | None = typer.Option(None, "--category", help="Category id filter"),
+    chunk_size: int = typer.Option(
+        32, "--chunk-size", min=1, help="Thumbnails fetched per request"
+    ),
+    progress: bool | None = typer.Option(
+        None,
+        "--progress/--no-progress",
+        help="Show transfer progress on stderr (default: when it is a terminal)",
+    ),
+) -> None:
+    """Back up the content list and every thumbnail."""
+    _require_art_supported(ctx)
+    tv = get_tv(ctx)
+    art = tv.art()
+
+    count = art.export_library(
+        dest,
+        category=category,
+        chunk_size=chunk_size,
+        progress=_create_progress_bar(progress),
+    )
+    typer.echo(f"OK: exported {count} artworks -> {dest}")
+
+
 @cli.command("art-delete")
 def art_delete(
     ctx: typer.Context,
@@ -0,0 +1,226 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2025 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+import contextlib
+import logging
+import mimetypes
+import os
+from typing import Any
+import urllib.parse
+
+_LOGGING = logging.getLogger(__name__)
+
+_USER_AGENT = "samsungtvws-cli/1.0"
+_DOWNLOAD_TIMEOUT = 60
+_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def is_url(source: str) -> bool:
+    return urllib.parse.urlparse(source).scheme in ("http", "https")
+
+
+def _normalize_file_type(file_type: str) -> str:
+    file_type = file_type.lower()
+    return "jpg" if file_type in ("jpeg", "jpe") else file_type
+
+
+def url_file_type(url: str, content_type: str | None = None) -> str:
+    """Infer the image type from the URL path, then the Content-Type."""
+    _, extension = os.path.splitext(urllib.parse.urlparse(url).path)
+    if extension:
+        return _normalize_file_type(extension[1:])
+    if content_type:
+        guessed = mimetypes.guess_extension(content_type.split(";")[0].strip())
+        if guessed:
+            return _normalize_file_type(guessed[1:])
+    return "jpg"
+
+
+def _client_session() -> Any:
+    try:
+        import aiohttp
+    except ImportError:
+        return None
+    return aiohttp.ClientSession(
+        headers={"User-Agent": _USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=_DOWNLOAD_TIMEOUT),
+    )
+
+
+def _download_blocking(url: str) -> tuple[bytes, str]:
+    from urllib.request import Request, urlopen
+
+    request = Request(url, headers={"User-Agent": _USER_AGENT}, method="GET")
+    with urlopen(request, timeout=_DOWNLOAD_TIMEOUT) as response:
+        return response.read(), url_file_type(url, response.headers.get("Content-Type"))
+
+
+class UploadResult:
+    """Outcome of one source of an upload pipeline."""
+
+    __slots__ = ("content_id", "error", "source")
+
+    def __init__(
+        self,
+        source: str,
+        content_id: str | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        self.source = source
+        self.content_id = content_id
+        self.error = error
+
+
+class UploadPipeline:
+    """
+    Upload files and URLs to the Frame, overlapping the stages.
+
+    Up to `prefetch` sources are downloaded (at most `downloads` at once)
+    and preprocessed in a process pool while earlier ones are sent. URLs
+    are read into memory and handed to art.upload() without a temporary
+    file. Uploads go one at a time, in order, through the blocking
+    SamsungTVArt in a worker thread: the TV takes one transfer at a time.
+    Downloads use aiohttp when it is installed (the async extra), urllib
+    in threads otherwise.
+    """
+
+    def __init__(
+        self,
+        art: Any,
+        upload_arguments: dict[str, Any],
+        downloads: int = 4,
+        prefetch: int = 4,
+    ) -> None:
+        if downloads < 1 or prefetch < 1:
+            raise ValueError("downloads and prefetch must be at least 1")
+        self.art = art
+        self.upload_arguments = upload_arguments
+        self.downloads = downloads
+        self.prefetch = prefetch
+        self._session: Any = None
+        self._executor: Executor | None = None
+        self._download_slots: asyncio.Semaphore | None = None
+
+    async def run(
+        self,
+        sources: Sequence[str],
+        on_result: Callable[[UploadResult], None] | None = None,
+    ) -> list[UploadResult]:
+        """Upload every source, returning the results in source order."""
+        results = []
+        async with self._resources():
+            async for result in self._pipeline(sources):
+                if on_result is not None:
+                    on_result(result)
+                results.append(result)
+        return results
+
+    @contextlib.asynccontextmanager
+    async def _resources(self) -> AsyncIterator[None]:
+        preprocessor = self.upload_arguments.get("preprocessor")
+        self._download_slots = asyncio.Semaphore(self.downloads)
+        try:
+            self._session = _client_session()
+            if preprocessor is not None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=preprocessor.max_workers
+                )
+            yield
+        finally:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    async def _pipeline(self, sources: Sequence[str]) -> AsyncIterator[UploadResult]:
+        # Bounds the sources prepared ahead of the upload
+        queue: asyncio.Queue[tuple[str, asyncio.Task[tuple[Any, dict[str, Any]]]]]
+        queue = asyncio.Queue(maxsize=self.prefetch)
+
+        async def _produce() -> None:
+            for source in sources:
+                task = asyncio.create_task(self._prepare(source))
+                try:
+                    await queue.put((source, task))
+                except asyncio.CancelledError:
+                    task.cancel()
+                    raise
+
+        producer = asyncio.create_task(_produce())
+        try:
+            for _ in sources:
+                source, prepared = await queue.get()
+                try:
+                    data, arguments = await prepared
+                    content_id = await asyncio.to_thread(
+                        self.art.upload, data, **arguments
+                    )
+                except Exception as err:
+                    _LOGGING.debug("Upload of %s failed: %s", source, err)
+                    yield UploadResult(source, error=err)
+                else:
+                    yield UploadResult(source, content_id=content_id)
+        finally:
+            producer.cancel()
+            while not queue.empty():
+                queue.get_nowait()[1].cancel()
+
+    async def _prepare(self, source: str) -> tuple[Any, dict[str, Any]]:
+        """Return what to pass to art.upload() and its keyword arguments."""
+        from samsungtvws.art.dedupe import content_hash, file_hash
+
+        arguments = dict(self.upload_arguments)
+        data: Any
+        preprocessor = arguments.get("preprocessor")
+        loop = asyncio.get_running_loop()
+
+        if not is_url(source):
+            if preprocessor is None:
+                return source, arguments
+            # The upload index is keyed on the original, not the JPEG sent
+            data, source_hash = await asyncio.gather(
+                loop.run_in_executor(self._executor, preprocessor.process_file, source),
+                asyncio.to_thread(file_hash, source),
+            )
+            return data, {
+                **arguments,
+                "preprocessor": None,
+                "file_type": "jpg",
+                "source_hash": source_hash,
+            }
+
+        assert self._download_slots is not None
+        async with self._download_slots:
+            data, file_type = await self._download(source)
+        arguments.setdefault("file_type", file_type)
+        if preprocessor is not None:
+            arguments["source_hash"] = content_hash(data)
+            data = await loop.run_in_executor(
+                self._executor, preprocessor.process, data
+            )
+            arguments.update(preprocessor=None, file_type="jpg")
+        return data, arguments
+
+    async def _download(self, url: str) -> tuple[bytes | bytearray, str]:
+        if self._session is None:
+            return await asyncio.to_thread(_download_blocking, url)
+
+        async with self._session.get(url) as response:
+            response.raise_for_status()
+            # Straight into memory, no temporary file
+            data = bytearray()
+            async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                data += chunk
+            return data, url_file_type(url, response.headers.get("Content-Type"))
@@ -0,0 +1,210 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2025 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+from typing import Any
+
+import typer
+
+from samsungtvws import exceptions
+
+from .main import cli
+
+_LOGGING = logging.getLogger(__name__)
+
+SOCKET_ENV = "SAMSUNGTV_DAEMON_SOCKET"
+NO_DAEMON_ENV = "SAMSUNGTV_NO_DAEMON"
+# Commands that must run in the calling process (run may read stdin and
+# already shares one connection, art-rotate runs until interrupted)
+LOCAL_COMMANDS = {"art-rotate", "daemon", "run"}
+
+# Unix only, the daemon command refuses to start elsewhere
+_UnixStreamServer: Any = getattr(
+    socketserver, "UnixStreamServer", socketserver.TCPServer
+)
+
+
+def default_socket_path() -> str:
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(runtime_dir, f"samsungtv-{uid}.sock")
+
+
+def _run_once(
+    args: list[str], obj: dict[str, Any]
+) -> tuple[int, str, str, Exception | None]:
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    code = 0
+    error = None
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            cli(args, prog_name="samsungtv", obj=obj, standalone_mode=True)
+        except SystemExit as err:
+            code = err.code if isinstance(err.code, int) else int(err.code is not None)
+        except Exception as err:
+            error = err
+            code = 1
+    return code, stdout.getvalue(), stderr.getvalue(), error
+
+
+def run_command(args: list[str], obj: dict[str, Any]) -> tuple[int, str, str]:
+    """Run one CLI command line in this process, capturing its output."""
+    from .pool import RECONNECT_ERRORS
+
+    code, stdout, stderr, error = _run_once(args, obj)
+    if isinstance(error, RECONNECT_ERRORS) and not isinstance(
+        error, exceptions.UnauthorizedError
+    ):
+        # The TV drops idle connections, which is only noticed on use: run
+        # the command again, once, on a new connection
+        _LOGGING.debug("Connection lost (%s), running again", error)
+        obj["pool"].close()
+        code, stdout, stderr, error = _run_once(args, obj)
+    if error is not None:
+        # The connection may be broken, start from scratch next time
+        obj["pool"].close()
+        stderr += f"ERROR: {error}\n"
+    return code, stdout, stderr
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            args = [str(arg) for arg in request["args"]]
+        except (ValueError, KeyError, TypeError) as err:
+            self._reply(2, "", f"ERROR: invalid daemon request: {err}\n")
+            return
+
+        if LOCAL_COMMANDS.intersection(args):
+            self._reply(2, "", "ERROR: this command can not run in the daemon\n")
+            return
+
+        _LOGGING.info("Running: %s", " ".join(args))
+        cwd = os.getcwd()
+        try:
+            # Relative paths (art-upload, run-macro) belong to the client
+            os.chdir(request.get("cwd") or cwd)
+            code, stdout, stderr = run_command(args, {"pool": self.server.pool})
+        finally:
+            os.chdir(cwd)
+        self._reply(code, stdout, stderr)
+
+    def _reply(self, code: int, stdout: str, stderr: str) -> None:
+        response = {"exit_code": code, "stdout": stdout, "stderr": stderr}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class DaemonServer(_UnixStreamServer):
+    """
+    Serve CLI command lines over a Unix socket with warm TV connections.
+
+    Requests are handled one at a time: commands share the process wide
+    stdout, working directory and connections.
+    """
+
+    def __init__(self, path: str) -> None:
+        from .pool import ConnectionPool
+
+        self.path = path
+        self.pool = ConnectionPool()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        # The daemon acts on the TV with the owner's credentials: the socket
+        # is created owner only, not chmod-ed once other users could connect
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+
+def forward_to_daemon(args: list[str], path: str | None = None) -> int | None:
+    """
+    Run `args` in a running daemon and print its output.
+
+    Returns the exit code, or None when there is no daemon to talk to.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or not hasattr(socket, "AF_UNIX"):
+        return None
+    if not args or LOCAL_COMMANDS.intersection(args) or "--help" in args:
+        return None
+
+    path = path or default_socket_path()
+    if not os.path.exists(path):
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Stale socket left by a daemon that is gone
+            return None
+        request = {"args": args, "cwd": os.getcwd()}
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+
+    if not line:
+        typer.echo("ERROR: daemon closed the connection", err=True)
+        return 1
+    response = json.loads(line)
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return int(response["exit_code"])
+
+
+@cli.command("daemon")
+def daemon(
+    ctx: typer.Context,
+    socket_path: str = typer.Option(
+        "",
+        "--socket",
+        help=f"Unix socket path (default: ${SOCKET_ENV} or a per-user runtime path)",
+    ),
+) -> None:
+    """
+    Keep warm TV connections and serve CLI commands over a Unix socket.
+
+    While it runs, samsungtv invocations are handed to the daemon, which skips
+    the per-command websocket handshake. Set SAMSUNGTV_NO_DAEMON=1 to bypass it.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise typer.BadParameter("daemon mode requires Unix sockets")
+
+    path = socket_path or default_socket_path()
+    with DaemonServer(path) as server:
+        # Warm up the connection to the TV given on the command line
+        server.pool.get(ctx.obj).open()
+        typer.echo(f"Listening on {path}", err=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -8,18 +8,110 @@ SPDX-License-Identifier: LGPL-3.0
 
 from __future__ import annotations
 
+import importlib
 import logging
+from typing import TYPE_CHECKING, Any
 
 import typer
 from typer.core import TyperGroup
-
-from samsungtvws import SamsungTVWS
+import typer.main
+
+if TYPE_CHECKING:
+    from samsungtvws import SamsungTVWS
+
+# Command modules are only imported when one of their commands is used (or
+# listed by --help), so `samsungtv <command>` loads just what it needs.
+# tests/test_cli.py checks this table against the registered commands.
+COMMAND_MODULES: dict[str, tuple[str, ...]] = {
+    "apps": ("apps", "app-run-ws", "open-browser"),
+    "daemon": ("daemon",),
+    "art": (
+        "art-supported",
+        "art-mode",
+        "art-api-version",
+        "art-current",
+        "art-available",
+        "art-display",
+        "art-thumbnail",
+        "art-upload",
+        "art-sync",
+        "art-export",
+        "art-rotate",
+        "art-delete",
+        "art-delete-list",
+        "art-matte-list",
+        "art-matte-set",
+        "art-photo-filters",
+        "art-photo-filter-set",
+        "art-slideshow-status",
+        "art-slideshow-set",
+        "art-categories",
+    ),
+    "remote": (
+        "send-key",
+        "hold-key",
+        "move-cursor",
+        "mouse-click",
+        "factory",
+        "send-text",
+        "end-text",
+        "run-macro",
+    ),
+    "script": ("run",),
+    "rest": ("device-info", "app-status", "app-run", "app-close", "app-install"),
+    "shortcuts": (
+        "power",
+        "home",
+        "menu",
+        "source",
+        "back",
+        "up",
+        "down",
+        "left",
+        "right",
+        "enter",
+        "volume-up",
+        "volume-down",
+        "mute",
+        "channel-up",
+        "channel-down",
+        "channel",
+    ),
+    "wol": ("wol",),
+}
+_COMMAND_MODULE = {
+    command: module
+    for module, commands in COMMAND_MODULES.items()
+    for command in commands
+}
 
 
 # this helper is for typer to list the commands correctly
 class SortedTyperGroup(TyperGroup):
-    def list_commands(self, ctx: typer.Context) -> list[str]:
-        return sorted(self.commands)
+    def list_commands(self, ctx: typer.Context) -> list[str]:  # type: ignore[override]
+        return sorted({*self.commands, *_COMMAND_MODULE})
+
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> Any:  # type: ignore[override]
+        module = _COMMAND_MODULE.get(cmd_name)
+        if cmd_name not in self.commands and module is not None:
+            importlib.import_module(f"{__package__}.{module}")
+            self._add_registered_commands()
+        return super().get_command(ctx, cmd_name)
+
+    def _add_registered_commands(self) -> None:
+        for info in cli.registered_commands:
+            name = info.name or typer.main.get_command_name(
+                info.callback.__name__ if info.callback else ""
+            )
+            if name not in self.commands:
+                self.add_command(
+                    typer.main.get_command_from_info(
+                        info,
+                        pretty_exceptions_short=cli.pretty_exceptions_short,
+                        rich_markup_mode=cli.rich_markup_mode,
+                    ),
+                    name,
+                )
 
 
 def setup_logging(verbose: int) -> None:
@@ -33,6 +125,13 @@ def setup_logging(verbose: int) -> None:
 
 def get_tv(ctx: typer.Context) -> SamsungTVWS:
     cfg = ctx.obj
+    pool = cfg.get("pool")
+    if pool is not None:
+        # daemon / script mode: reuse a warm connection
+        return pool.get(cfg)  # type: ignore[no-any-return]
+
+    from samsungtvws import SamsungTVWS
+
     return SamsungTVWS(
         host=cfg["host"],
         port=cfg["port"],
@@ -57,6 +156,9 @@ def bootstrap_token_if_needed(ctx: typer.Context) -> None:
     if ctx.obj.get("token") is not None:
         return
 
+    if ctx.obj.get("pool") is not None:
+        return
+
     tv = get_tv(ctx)
     try:
         tv.open()
@@ -115,6 +217,8 @@ def main(
     normalized_timeout = None if timeout == 0 else timeout
 
     ctx.obj = {
+        # set by the daemon and script mode, see pool.ConnectionPool
+        "pool": (ctx.obj or {}).get("pool"),
         "host": host,
         "port": port,
         "token": token,
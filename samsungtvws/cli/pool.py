@@ -0,0 +1,95 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2025 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import websocket
+
+from samsungtvws import SamsungTVArt, SamsungTVWS, exceptions
+
+_LOGGING = logging.getLogger(__name__)
+
+# Failures of a pooled connection that a new connection may not have.
+# is_alive() only knows a connection is gone once a send or recv failed.
+RECONNECT_ERRORS = (
+    exceptions.ConnectionFailure,
+    OSError,
+    websocket.WebSocketException,
+)
+
+# ctx.obj entries that identify a connection
+_KEY_FIELDS = ("host", "port", "token", "token_file", "timeout", "name")
+
+
+class WarmSamsungTVWS(SamsungTVWS):
+    """SamsungTVWS that also keeps its Art channel open between commands."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._art: SamsungTVArt | None = None
+
+    def art(self) -> SamsungTVArt:
+        if self._art is None:
+            self._art = super().art()
+        elif self._art.connection is not None and not self._art.is_alive():
+            self._art.close()
+        return self._art
+
+    def close(self) -> None:
+        if self._art is not None:
+            self._art.close()
+            self._art = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Connections shared by the commands run in one process.
+
+    get_tv() returns pooled connections when ctx.obj carries a "pool", which
+    is how the daemon and script mode reuse one handshake for many commands.
+    """
+
+    def __init__(self) -> None:
+        self._tvs: dict[tuple[Any, ...], WarmSamsungTVWS] = {}
+
+    def __len__(self) -> int:
+        return len(self._tvs)
+
+    def get(self, cfg: dict[str, Any]) -> WarmSamsungTVWS:
+        key = tuple(cfg[field] for field in _KEY_FIELDS)
+        tv = self._tvs.get(key)
+        if tv is None:
+            tv = self._tvs[key] = WarmSamsungTVWS(
+                host=cfg["host"],
+                port=cfg["port"],
+                token=cfg["token"],
+                token_file=cfg["token_file"],
+                timeout=cfg["timeout"],
+                key_press_delay=cfg["key_press_delay"],
+                name=cfg["name"],
+            )
+        elif tv.connection is not None and not tv.is_alive():
+            _LOGGING.debug("Reconnecting to %s", cfg["host"])
+            tv.close()
+
+        # Not part of the key: one connection serves every delay setting
+        tv.key_press_delay = cfg["key_press_delay"]
+        return tv
+
+    def close(self) -> None:
+        """Close every connection, they are reopened on next use."""
+        for tv in self._tvs.values():
+            try:
+                tv.close()
+            except Exception as err:
+                _LOGGING.debug("Failed to close %s: %s", tv.host, err)
+        self._tvs.clear()
@@ -126,3 +126,21 @@ def end_text(ctx: typer.Context) -> None:
     End current text input session (SendInputEnd).
     """
     get_tv(ctx).end_text()
+
+
+@cli.command("run-macro")
+def run_macro(
+    ctx: typer.Context,
+    path: str = typer.Argument(..., help="Macro file (.json, .yaml or .yml)"),
+) -> None:
+    """
+    Run a macro file (keys, holds, text, app launch, event waits).
+    """
+    from samsungtvws.macro import SamsungTVMacro
+
+    try:
+        macro = SamsungTVMacro.load(path)
+    except (ImportError, OSError, ValueError) as err:
+        raise typer.BadParameter(f"Invalid macro {path}: {err}") from err
+
+    get_tv(ctx).run_macro(macro)
@@ -0,0 +1,121 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2025 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import shlex
+import sys
+import time
+
+import typer
+
+from .main import cli
+
+# Commands that make no sense inside a script
+_SCRIPT_EXCLUDED = {"run", "daemon"}
+
+
+def parse_script(lines: Iterable[str]) -> Iterator[tuple[int, list[str]]]:
+    """Yield (line number, argv) for every command line, skipping # comments."""
+    for number, line in enumerate(lines, 1):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as err:
+            raise typer.BadParameter(f"line {number}: {err}") from err
+        if args:
+            yield number, args
+
+
+def _run_line(ctx: typer.Context, args: list[str]) -> None:
+    root = ctx.find_root()
+    name = args[0]
+    if name in _SCRIPT_EXCLUDED:
+        raise typer.BadParameter(f"{name} can not be used in a script")
+    command = root.command.get_command(root, name)  # type: ignore[attr-defined]
+    if command is None:
+        raise typer.BadParameter(f"unknown command {name}")
+
+    # The sub context inherits ctx.obj, so get_tv() hands out pooled connections
+    with command.make_context(name, args[1:], parent=root) as sub_ctx:
+        command.invoke(sub_ctx)
+
+
+@cli.command("run")
+def run(
+    ctx: typer.Context,
+    script: str = typer.Option(
+        "-", "--script", help="File with one command per line ('-' reads stdin)"
+    ),
+    keep_going: bool = typer.Option(
+        False, "--keep-going", help="Run the remaining commands after a failure"
+    ),
+    timing: bool = typer.Option(
+        True, "--timing/--no-timing", help="Print per-command timing to stderr"
+    ),
+) -> None:
+    """
+    Run many commands (send-key, send-text, app-run-ws, art-*, ...) over one
+    shared connection.
+    """
+    from .pool import ConnectionPool
+
+    if script == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        try:
+            with open(script, encoding="utf-8") as file:
+                lines = file.read().splitlines()
+        except OSError as err:
+            raise typer.BadParameter(f"Can not read {script}: {err}") from err
+
+    commands = list(parse_script(lines))
+    pool = ctx.obj.get("pool")
+    if pool is None:
+        pool = ctx.obj["pool"] = ConnectionPool()
+        owns_pool = True
+    else:
+        owns_pool = False
+
+    failures = 0
+    done = 0
+    start = time.monotonic()
+    try:
+        for number, args in commands:
+            done += 1
+            command_start = time.monotonic()
+            error = None
+            try:
+                _run_line(ctx, args)
+            except typer.Exit as err:
+                if err.exit_code:
+                    error = f"exit code {err.exit_code}"
+            except Exception as err:
+                format_message = getattr(err, "format_message", None)
+                error = format_message() if format_message else str(err)
+
+            elapsed = (time.monotonic() - command_start) * 1000
+            if timing:
+                status = "ok" if error is None else "FAILED"
+                typer.echo(
+                    f"[{elapsed:9.1f} ms] {status:6} {shlex.join(args)}", err=True
+                )
+            if error is not None:
+                failures += 1
+                typer.echo(f"ERROR: line {number}: {error}", err=True)
+                if not keep_going:
+                    break
+    finally:
+        if owns_pool:
+            pool.close()
+
+    if timing:
+        total = (time.monotonic() - start) * 1000
+        typer.echo(f"[{total:9.1f} ms] {done}/{len(commands)} commands", err=True)
+    if failures:
+        raise typer.Exit(code=1)
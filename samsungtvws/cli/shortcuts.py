@@ -6,12 +6,17 @@ Copyright (C) 2025 DSR! <xchwarze@gmail.com>
 SPDX-License-Identifier: LGPL-3.0
 """
 
-import typer
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
-from samsungtvws.shortcuts import SamsungTVShortcuts
+import typer
 
 from .main import cli, get_tv
 
+if TYPE_CHECKING:
+    from samsungtvws.shortcuts import SamsungTVShortcuts
+
 
 def _sc(ctx: typer.Context) -> SamsungTVShortcuts:
     return get_tv(ctx).shortcuts()
@@ -35,3 +35,20 @@ class SamsungTVSleepCommand(SamsungTVCommand):
 
     def get_payload(self) -> str:
         raise NotImplementedError("Cannot use get_payload on SamsungTVSleepCommand")
+
+
+class SamsungTVWaitForEventCommand(SamsungTVCommand):
+    """Pause a command sequence until `event` arrives or `timeout` expires."""
+
+    def __init__(self, event: str, timeout: float | None = None) -> None:
+        super().__init__("wait_for_event", {})
+        self.event = event
+        self.timeout = timeout
+
+    def as_dict(self) -> dict[str, Any]:
+        raise NotImplementedError("Cannot use as_dict on SamsungTVWaitForEventCommand")
+
+    def get_payload(self) -> str:
+        raise NotImplementedError(
+            "Cannot use get_payload on SamsungTVWaitForEventCommand"
+        )
@@ -20,13 +20,19 @@ import websocket
 from yarl import URL
 
 from . import exceptions, helper
-from .command import SamsungTVCommand, SamsungTVSleepCommand
+from .command import (
+    SamsungTVCommand,
+    SamsungTVSleepCommand,
+    SamsungTVWaitForEventCommand,
+)
 from .event import (
     IGNORE_EVENTS_AT_STARTUP,
     MS_CHANNEL_CONNECT_EVENT,
     MS_CHANNEL_UNAUTHORIZED,
     MS_ERROR_EVENT,
 )
+from .framelog import log_frame
+from .instrumentation import ConnectionStats
 
 _LOGGING = logging.getLogger(__name__)
 
@@ -54,6 +60,9 @@ class SamsungTVWSBaseConnection:
         self.endpoint = endpoint
         self.connection: Any | None = None
         self._recv_loop: Any | None = None
+        self._last_events: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._last_command_sent = time.monotonic()
+        self.stats = ConnectionStats(f"{host}:{port}/{endpoint}")
 
     def _is_ssl_connection(self) -> bool:
         return self.port == 8002
@@ -110,8 +119,14 @@ class SamsungTVWSBaseConnection:
             _LOGGING.debug("Got token %s", token)
             self._set_token(token)
 
+    def _parse_frame(self, data: str | bytes) -> dict[str, Any]:
+        """Decode a received websocket frame, counting it in stats."""
+        self.stats.record_frame_received(len(data))
+        return helper.process_api_response(data)
+
     def _websocket_event(self, event: str, response: dict[str, Any]) -> None:
         """Handle websocket event."""
+        self._last_events[event] = (time.monotonic(), response)
         if event == MS_ERROR_EVENT:
             _LOGGING.warning("SamsungTVWS websocket error message: %s", response)
             message = response.get("data", {}).get("message")
@@ -120,13 +135,44 @@ class SamsungTVWSBaseConnection:
                     "Your TV does not seem to support v2 API, please try v1 API"
                 )
         else:
-            _LOGGING.debug("SamsungTVWS websocket event: %s", response)
+            log_frame(_LOGGING, "SamsungTVWS websocket event: %s", response)
+
+    def _seen_event(self, event: str, since: float) -> dict[str, Any] | None:
+        """Return the last `event` payload if it was received after `since`."""
+        seen = self._last_events.get(event)
+        if seen is not None and seen[0] >= since:
+            return seen[1]
+        return None
 
 
 class SamsungTVWSConnection(SamsungTVWSBaseConnection):
     connection: websocket.WebSocket | None
     _recv_loop: threading.Thread | None
 
+    def __init__(
+        self,
+        host: str,
+        *,
+        endpoint: str,
+        token: str | None = None,
+        token_file: str | None = None,
+        port: int = 8001,
+        timeout: float | None = None,
+        key_press_delay: float = 1,
+        name: str = "SamsungTvRemote",
+    ):
+        super().__init__(
+            host,
+            endpoint=endpoint,
+            token=token,
+            token_file=token_file,
+            port=port,
+            timeout=timeout,
+            key_press_delay=key_press_delay,
+            name=name,
+        )
+        self._event_condition = threading.Condition()
+
     def __enter__(self) -> SamsungTVWSConnection:
         return self
 
@@ -147,6 +193,7 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
         sslopt = {"cert_reqs": ssl.CERT_NONE} if self._is_ssl_connection() else {}
 
         _LOGGING.debug("WS url %s", url)
+        start = time.monotonic()
         # Only for debug use!
         # websocket.enableTrace(True)
         connection = websocket.create_connection(
@@ -161,7 +208,7 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
         event: str | None = None
         while event is None or event in IGNORE_EVENTS_AT_STARTUP:
             data = connection.recv()
-            response = helper.process_api_response(data)
+            response = self._parse_frame(data)
             event = response.get("event", "*")
             assert event
             self._websocket_event(event, response)
@@ -176,6 +223,7 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
             raise exceptions.ConnectionFailure(response)
 
         self._check_for_token(response)
+        self.stats.record_handshake(time.monotonic() - start)
 
         self.connection = connection
         return connection
@@ -204,12 +252,73 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
             data = connection.recv()
             if not data:
                 return
-            response = helper.process_api_response(data)
+            response = self._parse_frame(data)
             event = response.get("event", "*")
             self._websocket_event(event, response)
             if callback:
                 callback(event, response)
 
+    def _websocket_event(self, event: str, response: dict[str, Any]) -> None:
+        """Handle websocket event and wake up any event waiter."""
+        with self._event_condition:
+            super()._websocket_event(event, response)
+            self._event_condition.notify_all()
+
+    def wait_for_event(
+        self,
+        event: str,
+        timeout: float | None = None,
+        since: float | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Wait until `event` is received from the TV.
+
+        Events received after `since` (a time.monotonic() value, defaults to now)
+        are accepted, so callers can pass the time a command was sent to avoid
+        missing a fast reply. Returns the event payload, or None on timeout.
+        """
+        if self.connection is None:
+            self.connection = self.open()
+
+        start = time.monotonic()
+        if since is None:
+            since = start
+        deadline = None if timeout is None else start + timeout
+
+        if self._recv_loop:
+            # The listening thread dispatches every event, just wait for it
+            with self._event_condition:
+                self._event_condition.wait_for(
+                    lambda: self._seen_event(event, since) is not None,
+                    None if deadline is None else max(deadline - time.monotonic(), 0),
+                )
+                return self._seen_event(event, since)
+
+        previous_timeout = self.connection.gettimeout()
+        try:
+            while True:
+                response = self._seen_event(event, since)
+                if response is not None:
+                    return response
+
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+
+                self.connection.settimeout(remaining)
+                try:
+                    data = self.connection.recv()
+                except websocket.WebSocketTimeoutException:
+                    return None
+                if not data:
+                    return None
+                frame = self._parse_frame(data)
+                self._websocket_event(frame.get("event", "*"), frame)
+        finally:
+            self.connection.settimeout(previous_timeout)
+
     def close(self) -> None:
         if self.connection:
             self.connection.close()
@@ -237,8 +346,8 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
 
         self._send_command(self.connection, command, delay)
 
-    @staticmethod
     def _send_command(
+        self,
         connection: websocket.WebSocket,
         command: SamsungTVCommand | dict[str, Any],
         delay: float,
@@ -247,14 +356,29 @@ class SamsungTVWSConnection(SamsungTVWSBaseConnection):
             time.sleep(command.delay)
             return
 
+        if isinstance(command, SamsungTVWaitForEventCommand):
+            # Accept the event if it already arrived after the previous command
+            response = self.wait_for_event(
+                command.event, command.timeout, since=self._last_command_sent
+            )
+            if response is None:
+                _LOGGING.debug("Timeout waiting for event %s", command.event)
+            return
+
         if isinstance(command, SamsungTVCommand):
             payload = command.get_payload()
         else:
             payload = json.dumps(command)
-        _LOGGING.debug("SamsungTVWS websocket command: %s", payload)
-        connection.send(payload)
+        self._send_payload(connection, payload)
 
         time.sleep(delay)
 
+    def _send_payload(self, connection: websocket.WebSocket, payload: str) -> None:
+        """Send an already serialized command frame."""
+        log_frame(_LOGGING, "SamsungTVWS websocket command: %s", payload)
+        connection.send(payload)
+        self.stats.record_frame_sent(len(payload))
+        self._last_command_sent = time.monotonic()
+
     def is_alive(self) -> bool:
         return self.connection is not None and self.connection.connected
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
 import re
 import struct
+from typing import Any
 
 import aiohttp
 from cryptography.hazmat.primitives.ciphers import (
@@ -25,29 +27,29 @@ TRANS_KEY = "6c9474469ddf7578f3e5ad8a4c703d99"
 PRIME = "b361eb0ab01c3439f2c16ffda7b05e3e320701ebee3e249123c3586765fd5bf6c1dfa88bb6bb5da3fde74737cd88b6a26c5ca31d81d18e3515533d08df619317063224cf0943a2f29a5fe60c1c31ddf28334ed76a6478a1122fb24c4a94c8711617ddfe90cf02e643cd82d4748d6d4a7ca2f47d88563aa2baf6482e124acd7dd"
 
 
-def _encrypt_parameter_data_with_aes(data: bytes) -> bytes:
-    iv = b"\x00" * BLOCK_SIZE
-    output = b""
-    for num in range(0, 128, 16):
-        cipher = Cipher(algorithms.AES(bytes.fromhex(WB_KEY)), modes.CBC(iv))
-        encryptor: CipherContext = cipher.encryptor()
-        output += encryptor.update(data[num : num + 16]) + encryptor.finalize()
+# Key material never changes: decode it once at import time
+_ZERO_IV = b"\x00" * BLOCK_SIZE
+_PUBLIC_KEY_BYTES = bytes.fromhex(PUBLIC_KEY)
+_PRIVATE_KEY_INT = int(PRIVATE_KEY, 16)
+_PRIME_INT = int(PRIME, 16)
+# Each 16 bytes block is CBC-encrypted on its own with a zero IV, which is
+# exactly AES-ECB over the whole buffer, so one cipher handles all 8 blocks.
+_WB_CIPHER = Cipher(algorithms.AES(bytes.fromhex(WB_KEY)), modes.ECB())
 
-    return output
 
+def _encrypt_parameter_data_with_aes(data: bytes) -> bytes:
+    encryptor: CipherContext = _WB_CIPHER.encryptor()
+    return encryptor.update(data[:128]) + encryptor.finalize()
 
-def _decrypt_parameter_data_with_aes(data: bytes) -> bytes:
-    iv = b"\x00" * BLOCK_SIZE
-    output = b""
-    for num in range(0, 128, 16):
-        cipher = Cipher(algorithms.AES(bytes.fromhex(WB_KEY)), modes.CBC(iv))
-        decryptor: CipherContext = cipher.decryptor()
-        output += decryptor.update(data[num : num + 16]) + decryptor.finalize()
 
-    return output
+def _decrypt_parameter_data_with_aes(data: bytes) -> bytes:
+    decryptor: CipherContext = _WB_CIPHER.decryptor()
+    return decryptor.update(data[:128]) + decryptor.finalize()
 
 
-def _apply_samy_go_key_transform(data: bytes) -> bytes:
+@functools.cache
+def _get_samy_go_cipher() -> Any:
+    """Build the custom 3-rounds Rijndael used for the key transform (once)."""
     from copy import deepcopy
 
     from py3rijndael.constants import U1, U2, U3, U4, S, num_rounds, r_con
@@ -134,8 +136,11 @@ def _apply_samy_go_key_transform(data: bytes) -> bytes:
             self.Ke = k_e
             self.Kd = k_d
 
-    r = _CustomRijndael(bytes.fromhex(TRANS_KEY))
-    return r.encrypt(data)  # type: ignore[no-any-return]
+    return _CustomRijndael(bytes.fromhex(TRANS_KEY))
+
+
+def _apply_samy_go_key_transform(data: bytes) -> bytes:
+    return _get_samy_go_cipher().encrypt(data)  # type: ignore[no-any-return]
 
 
 def _generate_server_hello(user_id: str, pin: str) -> dict[str, bytes]:
@@ -145,10 +150,9 @@ def _generate_server_hello(user_id: str, pin: str) -> dict[str, bytes]:
     aes_key = pin_hash[:16]
     LOGGER.debug("AES key: %s", aes_key.hex())
 
-    iv = b"\x00" * BLOCK_SIZE
-    cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv))
+    cipher = Cipher(algorithms.AES(aes_key), modes.CBC(_ZERO_IV))
     encryptor: CipherContext = cipher.encryptor()
-    encrypted = encryptor.update(bytes.fromhex(PUBLIC_KEY)) + encryptor.finalize()
+    encrypted = encryptor.update(_PUBLIC_KEY_BYTES) + encryptor.finalize()
     LOGGER.debug("AES encrypted: %s", encrypted.hex())
 
     swapped = _encrypt_parameter_data_with_aes(encrypted)
@@ -199,17 +203,14 @@ def _parse_client_hello(
     pEncGx = _decrypt_parameter_data_with_aes(pEncWBGx)
     LOGGER.debug("pEncGx: %s", pEncGx.hex())
 
-    iv = b"\x00" * BLOCK_SIZE
-    cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv))
+    cipher = Cipher(algorithms.AES(aes_key), modes.CBC(_ZERO_IV))
     decryptor: CipherContext = cipher.decryptor()
     pGx = decryptor.update(pEncGx) + decryptor.finalize()
     LOGGER.debug("pGx: %s", pGx.hex())
 
-    bnPGx = int(pGx.hex(), 16)
-    bnPrime = int(PRIME, 16)
-    bnPrivateKey = int(PRIVATE_KEY, 16)
+    bnPGx = int.from_bytes(pGx, "big")
     secret = bytes.fromhex(
-        hex(pow(bnPGx, bnPrivateKey, bnPrime)).rstrip("L").lstrip("0x")
+        hex(pow(bnPGx, _PRIVATE_KEY_INT, _PRIME_INT)).rstrip("L").lstrip("0x")
     )
     LOGGER.debug("secret: %s", secret.hex())
 
@@ -250,9 +251,7 @@ def _parse_client_hello(
     dest_hash = sha1.digest()
     LOGGER.debug("dest_hash: %s", dest_hash.hex())
 
-    finalBuffer = (
-        userId + user_id.encode("utf-8") + pGx + bytes.fromhex(PUBLIC_KEY) + secret
-    )
+    finalBuffer = userId + user_id.encode("utf-8") + pGx + _PUBLIC_KEY_BYTES + secret
     sha1 = hashlib.sha1()
     sha1.update(finalBuffer)
     SKPrime = sha1.digest()
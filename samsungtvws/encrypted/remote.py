@@ -15,11 +15,18 @@ from websockets.protocol import State
 from yarl import URL
 
 from ..exceptions import ConnectionFailure
+from ..framelog import log_frame
+from ..instrumentation import ConnectionStats
 from .command import SamsungTVEncryptedCommand
 from .session import SamsungTVEncryptedSession
 
 LOGGER = logging.getLogger(__name__)
 
+SOCKET_IO_HEARTBEAT = "2::"
+SOCKET_IO_DISCONNECT = "0::"
+# Used when the TV handshake does not announce a heartbeat timeout
+DEFAULT_HEARTBEAT_TIMEOUT = 60.0
+
 
 class SendRemoteKey:
     @staticmethod
@@ -41,6 +48,7 @@ class SendRemoteKey:
 class SamsungTVEncryptedWSAsyncRemote:
     _connection: ClientConnection | None
     _recv_loop: asyncio.Task[None] | None
+    _watchdog: asyncio.Task[None] | None
 
     def __init__(
         self,
@@ -52,6 +60,7 @@ class SamsungTVEncryptedWSAsyncRemote:
         port: int = 8000,
         timeout: float | None = None,
         key_press_delay: float = 1,
+        keep_alive: bool = True,
     ) -> None:
         self._host = host
         self._key_press_delay = key_press_delay
@@ -64,6 +73,13 @@ class SamsungTVEncryptedWSAsyncRemote:
         self._web_session = web_session
         self._connection = None
         self._recv_loop = None
+        self._send_lock: asyncio.Lock | None = None
+        self._next_send_at = 0.0
+        self._keep_alive = keep_alive
+        self._watchdog = None
+        self._heartbeat_timeout = DEFAULT_HEARTBEAT_TIMEOUT
+        self._last_seen = 0.0
+        self.stats = ConnectionStats(f"{host}:{port}/socket.io")
 
     async def __aenter__(self) -> SamsungTVEncryptedWSAsyncRemote:
         return self
@@ -103,6 +119,7 @@ class SamsungTVEncryptedWSAsyncRemote:
             # someone else already created a new connection
             return
 
+        start = time.monotonic()
         millis = int(round(time.time() * 1000))
         step4_url = self._format_rest_url(f"socket.io/1/?t={millis}")
         LOGGER.debug("Tx: GET %s", step4_url)
@@ -111,13 +128,49 @@ class SamsungTVEncryptedWSAsyncRemote:
             LOGGER.debug("Rx: %s", await response.text())
             step4_response = await response.text()
 
-        url = self._format_websocket_url(step4_response.split(":")[0])
+        # socket.io handshake: "sid:heartbeat_timeout:close_timeout:transports"
+        handshake = step4_response.split(":")
+        if len(handshake) > 1 and handshake[1].strip().isdigit():
+            self._heartbeat_timeout = float(handshake[1])
+
+        url = self._format_websocket_url(handshake[0])
         LOGGER.debug("WS url %s", url)
 
         connection = await connect(url, open_timeout=self._timeout)
         await connection.send("1::/com.samsung.companion")
+        self.stats.record_handshake(time.monotonic() - start)
 
         self._connection = connection
+        self._last_seen = time.monotonic()
+
+    def _get_send_lock(self) -> asyncio.Lock:
+        if self._send_lock is None:
+            self._send_lock = asyncio.Lock()
+        return self._send_lock
+
+    async def _reconnect(self) -> None:
+        """Reopen the socket.io channel, keeping the encrypted session."""
+        LOGGER.debug("Reconnecting SamsungTVEncryptedWS channel")
+        listening = self._recv_loop is not None
+        await self._drop_connection()
+
+        await self._open()
+        assert self._connection
+        if listening:
+            self._recv_loop = asyncio.ensure_future(
+                self._do_start_listening(self._connection)
+            )
+
+    async def _drop_connection(self) -> None:
+        connection = self._connection
+        self._connection = None
+        if connection:
+            with contextlib.suppress(Exception):
+                await connection.close()
+        if self._recv_loop:
+            with contextlib.suppress(Exception):
+                await self._recv_loop
+            self._recv_loop = None
 
     async def start_listening(self) -> None:
         """Open, and start listening."""
@@ -130,16 +183,49 @@ class SamsungTVEncryptedWSAsyncRemote:
         self._recv_loop = asyncio.ensure_future(
             self._do_start_listening(self._connection)
         )
+        if self._keep_alive and self._watchdog is None:
+            self._watchdog = asyncio.ensure_future(self._do_watchdog())
 
-    @staticmethod
     async def _do_start_listening(
+        self,
         connection: ClientConnection,
     ) -> None:
-        """Do start listening."""
+        """Do start listening, answering socket.io heartbeats."""
         with contextlib.suppress(ConnectionClosed):
             while True:
                 data = await connection.recv()
-                LOGGER.debug("SamsungTVEncryptedWS websocket event: %s", data)
+                self._last_seen = time.monotonic()
+                self.stats.record_frame_received(len(data))
+                log_frame(LOGGER, "SamsungTVEncryptedWS websocket event: %s", data)
+
+                if data == SOCKET_IO_HEARTBEAT:
+                    await connection.send(SOCKET_IO_HEARTBEAT)
+                elif data == SOCKET_IO_DISCONNECT:
+                    LOGGER.debug("SamsungTVEncryptedWS channel closed by TV")
+                    await connection.close()
+                    return
+
+    async def _do_watchdog(self) -> None:
+        """Keep the channel warm and reopen it before the next command needs it."""
+        while True:
+            await asyncio.sleep(self._heartbeat_timeout / 2)
+            try:
+                await self._check_liveness()
+            except Exception as err:
+                # Keep watching, the next tick (or command) will retry
+                LOGGER.debug("SamsungTVEncryptedWS reconnect failed: %s", err)
+
+    async def _check_liveness(self) -> None:
+        async with self._get_send_lock():
+            idle = time.monotonic() - self._last_seen
+            if not self.is_alive() or idle > self._heartbeat_timeout:
+                await self._reconnect()
+                return
+
+            if idle > self._heartbeat_timeout / 2:
+                # Nothing heard for a while: ping so the TV keeps the session
+                assert self._connection
+                await self._connection.send(SOCKET_IO_HEARTBEAT)
 
     async def send_command(
         self,
@@ -154,30 +240,54 @@ class SamsungTVEncryptedWSAsyncRemote:
         key_press_delay: float | None = None,
     ) -> None:
         assert self._session
-        if self._connection is None:
-            await self._open()
-            assert self._connection
-
         delay = self._key_press_delay if key_press_delay is None else key_press_delay
+
+        # Encrypt the whole batch up front so frames go out back to back
+        frames = []
         for command in commands:
-            await self._send_command(self._connection, command, self._session, delay)
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                log_frame(
+                    LOGGER,
+                    "SamsungTVEncryptedWS websocket command: %s",
+                    command.as_dict(),
+                )
+            frames.append(self._session.encrypt_command(command))
+
+        async with self._get_send_lock():
+            if not self.is_alive():
+                # Reuse the session, but the socket.io channel must be reopened
+                await self._reconnect()
+            assert self._connection
 
-    @staticmethod
-    async def _send_command(
+            for frame in frames:
+                await self._send_frame(self._connection, frame, delay)
+
+    async def _send_frame(
+        self,
         connection: ClientConnection,
-        command: SamsungTVEncryptedCommand,
-        session: SamsungTVEncryptedSession,
+        frame: str,
         delay: float,
     ) -> None:
-        LOGGER.debug("SamsungTVEncryptedWS websocket command: %s", command.as_dict())
-        payload = session.encrypt_command(command)
-
-        LOGGER.debug("SamsungTVEncryptedWS websocket command (encrypted): %s", payload)
-        await connection.send(payload)
-
-        await asyncio.sleep(delay)
+        # The key press delay only spaces consecutive frames: callers are not
+        # blocked after their last command, the next send waits if needed.
+        wait = self._next_send_at - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        log_frame(
+            LOGGER, "SamsungTVEncryptedWS websocket command (encrypted): %s", frame
+        )
+        await connection.send(frame)
+        self.stats.record_frame_sent(len(frame))
+        self._next_send_at = time.monotonic() + delay
 
     async def close(self) -> None:
+        if self._watchdog:
+            self._watchdog.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watchdog
+            self._watchdog = None
+
         if self._connection:
             await self._connection.close()
             if self._recv_loop:
@@ -1,11 +1,16 @@
 """SamsungTV Encrypted."""
 
 import binascii
+from collections import OrderedDict
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from .command import SamsungTVEncryptedCommand
 
+# Decimal representation of every byte value, used to build the socket.io body
+_BYTE_STRINGS = tuple(str(i) for i in range(256))
+FRAME_CACHE_SIZE = 128
+
 
 # Padding for the input string --not related to encryption itself.
 class Padding:
@@ -23,10 +28,21 @@ class Padding:
 
 
 class SamsungTVEncryptedSession:
-    def __init__(self, token: str, session_id: str) -> None:
+    def __init__(
+        self, token: str, session_id: str, cache_size: int = FRAME_CACHE_SIZE
+    ) -> None:
         self._token = binascii.unhexlify(token)
         self._session_id = session_id
         self._cipher = Cipher(algorithms.AES(self._token), modes.ECB())
+        self._frame_prefix = (
+            '5::/com.samsung.companion:{"name":"callCommon","args":[{"Session_Id":'
+            + session_id
+            + ',"body":"['
+        )
+        # AES-ECB is deterministic, so a given payload always encrypts to the
+        # same frame: keep the most recent ones for repeated key presses.
+        self._cache_size = cache_size
+        self._frame_cache: OrderedDict[str, str] = OrderedDict()
 
     def _decrypt(self, enc: bytes) -> str:
         decryptor = self._cipher.decryptor()
@@ -41,14 +57,20 @@ class SamsungTVEncryptedSession:
             + encryptor.finalize()
         )
 
+    def _encode_frame(self, command_bytes: bytes) -> str:
+        int_array = ",".join(map(_BYTE_STRINGS.__getitem__, command_bytes))
+        return self._frame_prefix + int_array + ']"}]}'
+
     def encrypt_command(self, command: SamsungTVEncryptedCommand) -> str:
-        command_bytes = self._encrypt(command.get_payload())
+        payload = command.get_payload()
+        frame = self._frame_cache.get(payload)
+        if frame is not None:
+            self._frame_cache.move_to_end(payload)
+            return frame
 
-        int_array = ",".join(list(map(str, command_bytes)))
-        return (
-            '5::/com.samsung.companion:{"name":"callCommon","args":[{"Session_Id":'
-            + self._session_id
-            + ',"body":"['
-            + int_array
-            + ']"}]}'
-        )
+        frame = self._encode_frame(self._encrypt(payload))
+        if self._cache_size > 0:
+            self._frame_cache[payload] = frame
+            if len(self._frame_cache) > self._cache_size:
+                self._frame_cache.popitem(last=False)
+        return frame
@@ -0,0 +1,111 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+from typing import Any
+
+DEFAULT_MAX_LENGTH = 512
+
+_max_length: int | None = DEFAULT_MAX_LENGTH
+_sample_every = 1
+_counter = itertools.count()
+
+
+def set_frame_logging(
+    max_length: int | None = DEFAULT_MAX_LENGTH, sample_every: int = 1
+) -> None:
+    """
+    Configure DEBUG logging of websocket frames and payloads.
+
+    Logged frames are truncated to `max_length` characters (None logs them in
+    full) and only one frame out of `sample_every` is logged.
+    """
+    global _max_length, _sample_every, _counter
+    if max_length is not None and max_length < 0:
+        raise ValueError("max_length must be >= 0")
+    if sample_every < 1:
+        raise ValueError("sample_every must be >= 1")
+    _max_length = max_length
+    _sample_every = sample_every
+    _counter = itertools.count()
+
+
+def summarize_binary(data: bytes | bytearray) -> str:
+    """Describe binary data by its length and a short hash."""
+    digest = hashlib.sha1(data, usedforsecurity=False).hexdigest()[:12]
+    return f"<{len(data)} bytes sha1:{digest}>"
+
+
+def _truncate(text: str) -> str:
+    if _max_length is None or len(text) <= _max_length:
+        return text
+    return f"{text[:_max_length]}... ({len(text)} chars)"
+
+
+def _bytes_to_text(data: bytes | bytearray) -> str:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+
+    # JSON header followed by a binary tail (Art API 0.97 thumbnails)
+    end = data.find(b"}\n") if data.startswith(b"{") else -1
+    if end < 0:
+        return summarize_binary(data)
+    try:
+        header = data[: end + 1].decode("utf-8")
+    except UnicodeDecodeError:
+        return summarize_binary(data)
+    return f"{header} + {summarize_binary(data[end + 2 :])}"
+
+
+def format_frame(data: Any) -> str:
+    """Return a log friendly, truncated representation of a frame or payload."""
+    if isinstance(data, (bytes, bytearray)):
+        text = _bytes_to_text(data)
+    elif isinstance(data, str):
+        text = data
+    else:
+        try:
+            text = json.dumps(
+                data,
+                default=lambda value: (
+                    summarize_binary(value)
+                    if isinstance(value, (bytes, bytearray))
+                    else repr(value)
+                ),
+            )
+        except (TypeError, ValueError):
+            text = repr(data)
+    return _truncate(text)
+
+
+class _LazyFrame:
+    """Defer formatting until a handler actually emits the record."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+    def __str__(self) -> str:
+        return format_frame(self.data)
+
+
+def log_frame(logger: logging.Logger, msg: str, data: Any) -> None:
+    """Log `data` at DEBUG level, truncated, summarized and sampled."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if _sample_every > 1 and next(_counter) % _sample_every:
+        return
+    logger.debug(msg, _LazyFrame(data))
@@ -16,6 +16,7 @@ import ssl
 from typing import Any, cast
 
 from . import exceptions
+from .framelog import log_frame
 
 _LOGGING = logging.getLogger(__name__)
 _SSL_CONTEXT: ssl.SSLContext | None = None
@@ -57,7 +58,7 @@ def _split_json_and_tail(buf: bytes) -> tuple[bytes, bytes]:
 
 
 def process_api_response(response: str | bytes) -> dict[str, Any]:
-    _LOGGING.debug("Processing API response: %s", response)
+    log_frame(_LOGGING, "Processing API response: %s", response)
     try:
         if isinstance(response, str):
             return cast(dict[str, Any], json.loads(response))
@@ -0,0 +1,426 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+import logging
+import time
+from typing import Any, Callable
+
+_LOGGING = logging.getLogger(__name__)
+
+HANDSHAKE_SECONDS = "handshake_seconds"
+FRAMES_SENT = "frames_sent"
+BYTES_SENT = "bytes_sent"
+FRAMES_RECEIVED = "frames_received"
+BYTES_RECEIVED = "bytes_received"
+D2D_BYTES = "d2d_bytes"
+D2D_THROUGHPUT = "d2d_throughput_bytes_per_second"
+REQUEST_SECONDS = "request_seconds"
+RECONNECTS = "reconnects"
+
+# metric -> (kind, description, attribute names besides "connection")
+METRICS: dict[str, tuple[str, str, tuple[str, ...]]] = {
+    HANDSHAKE_SECONDS: ("histogram", "Websocket connect + handshake time", ()),
+    FRAMES_SENT: ("counter", "Websocket frames sent", ()),
+    BYTES_SENT: ("counter", "Websocket payload bytes sent", ()),
+    FRAMES_RECEIVED: ("counter", "Websocket frames received", ()),
+    BYTES_RECEIVED: ("counter", "Websocket payload bytes received", ()),
+    D2D_BYTES: ("counter", "Bytes moved over D2D sockets", ("direction",)),
+    D2D_THROUGHPUT: ("histogram", "D2D transfer throughput", ("direction",)),
+    REQUEST_SECONDS: ("histogram", "Request round trip time", ("request",)),
+    RECONNECTS: ("counter", "Connections reopened after the first one", ()),
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+THROUGHPUT_BUCKETS = (1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+
+class Histogram:
+    """Fixed buckets histogram, cheap enough for the hot path."""
+
+    __slots__ = ("bounds", "buckets", "count", "total", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        # one extra bucket for values above the last bound
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "buckets": dict(zip([*self.bounds, float("inf")], self.buckets)),
+        }
+
+
+class InstrumentationHook:
+    """Receives every measurement recorded by a connection."""
+
+    def record(
+        self,
+        stats: ConnectionStats,
+        metric: str,
+        value: float,
+        attributes: Mapping[str, str],
+    ) -> None:
+        raise NotImplementedError
+
+
+_HOOKS: list[InstrumentationHook] = []
+
+
+def add_hook(hook: InstrumentationHook) -> None:
+    """Report measurements of every connection to `hook`."""
+    _HOOKS.append(hook)
+
+
+def remove_hook(hook: InstrumentationHook) -> None:
+    _HOOKS.remove(hook)
+
+
+class ConnectionStats:
+    """
+    Counters and histograms of one connection.
+
+    Connections update these on the hot path, measurements are only forwarded
+    when a hook is registered (here or globally with add_hook). Text frame
+    sizes are counted in characters, which is their byte size for the ASCII
+    JSON the TVs use.
+    """
+
+    def __init__(self, connection: str) -> None:
+        self.connection = connection
+        self.hooks: list[InstrumentationHook] = []
+        self.connects = 0
+        self.reconnects = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.d2d_bytes: dict[str, int] = {}
+        self.handshake = Histogram(LATENCY_BUCKETS)
+        self.d2d_throughput: dict[str, Histogram] = {}
+        self.requests: dict[str, Histogram] = {}
+
+    def __repr__(self) -> str:
+        return f"ConnectionStats({self.connection!r})"
+
+    def add_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: InstrumentationHook) -> None:
+        self.hooks.remove(hook)
+
+    def _emit(self, metric: str, value: float, **attributes: str) -> None:
+        for hook in (*self.hooks, *_HOOKS):
+            try:
+                hook.record(self, metric, value, attributes)
+            except Exception:
+                _LOGGING.exception("Instrumentation hook %r failed", hook)
+
+    def record_handshake(self, seconds: float) -> None:
+        self.connects += 1
+        self.handshake.observe(seconds)
+        if self.hooks or _HOOKS:
+            self._emit(HANDSHAKE_SECONDS, seconds)
+        if self.connects > 1:
+            self.record_reconnect()
+
+    def record_reconnect(self) -> None:
+        self.reconnects += 1
+        if self.hooks or _HOOKS:
+            self._emit(RECONNECTS, 1)
+
+    def record_frame_sent(self, size: int) -> None:
+        self.frames_sent += 1
+        self.bytes_sent += size
+        if self.hooks or _HOOKS:
+            self._emit(FRAMES_SENT, 1)
+            self._emit(BYTES_SENT, size)
+
+    def record_frame_received(self, size: int) -> None:
+        self.frames_received += 1
+        self.bytes_received += size
+        if self.hooks or _HOOKS:
+            self._emit(FRAMES_RECEIVED, 1)
+            self._emit(BYTES_RECEIVED, size)
+
+    def record_d2d_transfer(self, direction: str, size: int, seconds: float) -> None:
+        """Record a D2D socket transfer, direction is "send" or "recv"."""
+        self.d2d_bytes[direction] = self.d2d_bytes.get(direction, 0) + size
+        throughput = size / seconds if seconds > 0 else 0.0
+        histogram = self.d2d_throughput.get(direction)
+        if histogram is None:
+            histogram = self.d2d_throughput[direction] = Histogram(THROUGHPUT_BUCKETS)
+        histogram.observe(throughput)
+        if self.hooks or _HOOKS:
+            self._emit(D2D_BYTES, size, direction=direction)
+            self._emit(D2D_THROUGHPUT, throughput, direction=direction)
+
+    def record_request(self, request: str, seconds: float) -> None:
+        histogram = self.requests.get(request)
+        if histogram is None:
+            histogram = self.requests[request] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+        if self.hooks or _HOOKS:
+            self._emit(REQUEST_SECONDS, seconds, request=request)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "connection": self.connection,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "frames_received": self.frames_received,
+            "bytes_received": self.bytes_received,
+            "d2d_bytes": dict(self.d2d_bytes),
+            "handshake": self.handshake.as_dict(),
+            "d2d_throughput": {
+                direction: histogram.as_dict()
+                for direction, histogram in self.d2d_throughput.items()
+            },
+            "requests": {
+                request: histogram.as_dict()
+                for request, histogram in self.requests.items()
+            },
+        }
+
+
+class Span:
+    """One timed phase of a traced operation."""
+
+    __slots__ = ("name", "parent", "attributes", "start", "end", "error")
+
+    def __init__(
+        self, name: str, parent: Span | None, attributes: dict[str, Any]
+    ) -> None:
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.start = time.monotonic()
+        self.end: float | None = None
+        self.error: str | None = None
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, duration={self.duration!r})"
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.monotonic()) - self.start
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+
+class Trace:
+    """
+    Spans recorded while a `trace()` block of a connection is active.
+
+    Spans are appended when they finish, so nested phases come before the
+    operation that contains them. `callback` is called with every finished
+    span, e.g. to forward it to a tracing backend.
+    """
+
+    def __init__(self, callback: Callable[[Span], None] | None = None) -> None:
+        self.callback = callback
+        self.spans: list[Span] = []
+        self._stack: list[Span] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        span = Span(name, self._stack[-1] if self._stack else None, attributes)
+        self._stack.append(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = repr(err)
+            raise
+        finally:
+            span.end = time.monotonic()
+            self._stack.pop()
+            self.spans.append(span)
+            _LOGGING.debug("span %s: %.3fs %s", name, span.duration, attributes)
+            if self.callback is not None:
+                try:
+                    self.callback(span)
+                except Exception:
+                    _LOGGING.exception("Trace callback %r failed", self.callback)
+
+    def find(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+    def breakdown(self) -> dict[str, float]:
+        """Total seconds spent per span name."""
+        result: dict[str, float] = {}
+        for span in self.spans:
+            result[span.name] = result.get(span.name, 0.0) + span.duration
+        return result
+
+    def as_list(self) -> list[dict[str, Any]]:
+        return [span.as_dict() for span in self.spans]
+
+
+class CallbackHook(InstrumentationHook):
+    """Call `callback(connection, metric, value, attributes)` per measurement."""
+
+    def __init__(
+        self, callback: Callable[[str, str, float, Mapping[str, str]], None]
+    ) -> None:
+        self.callback = callback
+
+    def record(
+        self,
+        stats: ConnectionStats,
+        metric: str,
+        value: float,
+        attributes: Mapping[str, str],
+    ) -> None:
+        self.callback(stats.connection, metric, value, attributes)
+
+
+class OpenTelemetryHook(InstrumentationHook):
+    """Forward measurements to OpenTelemetry metrics (opentelemetry-api)."""
+
+    def __init__(self, meter: Any | None = None, prefix: str = "samsungtvws.") -> None:
+        if meter is None:
+            try:
+                from opentelemetry import metrics
+            except ImportError as err:
+                raise ImportError(
+                    "OpenTelemetryHook requires opentelemetry-api "
+                    "(pip install samsungtvws[opentelemetry])"
+                ) from err
+            meter = metrics.get_meter("samsungtvws")
+
+        self._instruments: dict[str, Any] = {}
+        for metric, (kind, description, _) in METRICS.items():
+            unit = "s" if metric.endswith("_seconds") else "By"
+            if metric.startswith("frames") or metric == RECONNECTS:
+                unit = "1"
+            elif metric == D2D_THROUGHPUT:
+                unit = "By/s"
+            create = (
+                meter.create_histogram if kind == "histogram" else meter.create_counter
+            )
+            self._instruments[metric] = create(
+                prefix + metric, unit=unit, description=description
+            )
+
+    def record(
+        self,
+        stats: ConnectionStats,
+        metric: str,
+        value: float,
+        attributes: Mapping[str, str],
+    ) -> None:
+        instrument = self._instruments[metric]
+        labels = {"connection": stats.connection, **attributes}
+        if METRICS[metric][0] == "histogram":
+            instrument.record(value, labels)
+        else:
+            instrument.add(value, labels)
+
+
+# (registry, namespace) -> metrics, prometheus-client rejects duplicated names
+_PROMETHEUS_METRICS: dict[tuple[Any, str], dict[str, Any]] = {}
+
+
+class PrometheusHook(InstrumentationHook):
+    """
+    Expose measurements as Prometheus metrics (prometheus-client).
+
+    Metrics are registered once per registry and namespace, hooks created
+    later for the same pair share them.
+    """
+
+    def __init__(
+        self, registry: Any | None = None, namespace: str = "samsungtvws"
+    ) -> None:
+        try:
+            import prometheus_client
+        except ImportError as err:
+            raise ImportError(
+                "PrometheusHook requires prometheus-client "
+                "(pip install samsungtvws[prometheus])"
+            ) from err
+
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+
+        metrics = _PROMETHEUS_METRICS.get((registry, namespace))
+        if metrics is None:
+            metrics = _PROMETHEUS_METRICS[registry, namespace] = {}
+            for metric, (kind, description, labels) in METRICS.items():
+                if kind == "histogram":
+                    buckets = (
+                        THROUGHPUT_BUCKETS
+                        if metric == D2D_THROUGHPUT
+                        else LATENCY_BUCKETS
+                    )
+                    metrics[metric] = prometheus_client.Histogram(
+                        metric,
+                        description,
+                        ("connection", *labels),
+                        namespace=namespace,
+                        registry=registry,
+                        buckets=buckets,
+                    )
+                else:
+                    metrics[metric] = prometheus_client.Counter(
+                        metric,
+                        description,
+                        ("connection", *labels),
+                        namespace=namespace,
+                        registry=registry,
+                    )
+        self._metrics = metrics
+
+    def record(
+        self,
+        stats: ConnectionStats,
+        metric: str,
+        value: float,
+        attributes: Mapping[str, str],
+    ) -> None:
+        child = self._metrics[metric].labels(stats.connection, *attributes.values())
+        if METRICS[metric][0] == "histogram":
+            child.observe(value)
+        else:
+            child.inc(value)
@@ -0,0 +1,234 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+import json
+import os
+import time
+from typing import Any
+
+from .command import SamsungTVCommand
+from .remote import ChannelEmitCommand, SendInputEnd, SendInputString, SendRemoteKey
+
+MACRO_STEP_TYPES = ("key", "hold", "text", "app", "sleep", "wait_event")
+
+
+class SamsungTVMacroStep:
+    """
+    One entry of a compiled macro schedule.
+
+    `payload` is the pre-encoded websocket frame (None for pure waits) and
+    `delay` the time to wait before the next step (None means the connection
+    key_press_delay). A step with `wait_event` pauses until that event arrives
+    or `timeout` expires.
+    """
+
+    def __init__(
+        self,
+        payload: str | None = None,
+        delay: float | None = None,
+        wait_event: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.payload = payload
+        self.delay = delay
+        self.wait_event = wait_event
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return (
+            f"SamsungTVMacroStep(payload={self.payload!r}, delay={self.delay!r}, "
+            f"wait_event={self.wait_event!r}, timeout={self.timeout!r})"
+        )
+
+    def resolve_delay(self, key_press_delay: float) -> float:
+        return key_press_delay if self.delay is None else self.delay
+
+
+class SamsungTVMacro:
+    """
+    A command sequence compiled into a pre-encoded schedule.
+
+    Macros are described as a list of steps, each one a dict with exactly one
+    of these keys:
+
+    - {"key": "KEY_HOME", "times": 2, "cmd": "Click"}
+    - {"hold": "KEY_POWER", "seconds": 3}
+    - {"text": "hello", "end": true}
+    - {"app": "3201606009684", "app_type": "DEEP_LINK", "meta_tag": ""}
+    - {"sleep": 1.5}
+    - {"wait_event": "ms.remote.imeStart", "timeout": 5}
+
+    Any step accepts "delay" to override the time waited after it. The macro
+    itself may define a default "delay" used by steps without one.
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[SamsungTVMacroStep],
+        name: str | None = None,
+    ) -> None:
+        self.steps = list(steps)
+        self.name = name
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> Iterator[SamsungTVMacroStep]:
+        return iter(self.steps)
+
+    def schedule(
+        self, key_press_delay: float
+    ) -> Iterator[tuple[float, SamsungTVMacroStep]]:
+        """
+        Yield (seconds to wait, step) for each step, to be run in order.
+
+        Steps are scheduled against a monotonic clock: each delay is measured
+        from when the previous step was due, so time spent sending does not
+        accumulate as drift over long sequences. The clock restarts once a
+        wait_event step has run, so the caller must run each step before
+        asking for the next one.
+        """
+        due = time.monotonic()
+        for step in self.steps:
+            yield max(0.0, due - time.monotonic()), step
+            if step.wait_event:
+                due = time.monotonic()
+            due += step.resolve_delay(key_press_delay)
+
+    @classmethod
+    def compile(
+        cls,
+        steps: Iterable[dict[str, Any]],
+        delay: float | None = None,
+        name: str | None = None,
+    ) -> SamsungTVMacro:
+        """Compile a list of step dicts into a macro schedule."""
+        compiled: list[SamsungTVMacroStep] = []
+        for index, step in enumerate(steps):
+            if not isinstance(step, dict):
+                raise ValueError(f"Macro step {index} must be an object")
+            compiled.extend(_compile_step(step, delay))
+        return cls(compiled, name=name)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | list[Any]) -> SamsungTVMacro:
+        """Build a macro from a decoded document (a list of steps or an object)."""
+        if isinstance(data, list):
+            return cls.compile(data)
+
+        if not isinstance(data, dict) or not isinstance(data.get("steps"), list):
+            raise ValueError("Macro document must be a list of steps or have 'steps'")
+
+        delay = data.get("delay")
+        return cls.compile(
+            data["steps"],
+            delay=None if delay is None else float(delay),
+            name=data.get("name"),
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> SamsungTVMacro:
+        return cls.from_dict(json.loads(text))
+
+    @classmethod
+    def from_yaml(cls, text: str) -> SamsungTVMacro:
+        try:
+            import yaml
+        except ImportError as err:
+            raise ImportError(
+                "Loading YAML macros requires PyYAML (pip install samsungtvws[yaml])"
+            ) from err
+
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as err:
+            raise ValueError(f"Invalid YAML: {err}") from err
+        return cls.from_dict(data)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> SamsungTVMacro:
+        """Load a macro from a .json, .yaml or .yml file."""
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+
+        _, ext = os.path.splitext(os.fspath(path))
+        if ext.lower() in (".yaml", ".yml"):
+            return cls.from_yaml(text)
+        return cls.from_json(text)
+
+
+def _encode(command: SamsungTVCommand, delay: float | None) -> SamsungTVMacroStep:
+    return SamsungTVMacroStep(payload=command.get_payload(), delay=delay)
+
+
+def _compile_step(
+    step: dict[str, Any], default_delay: float | None
+) -> list[SamsungTVMacroStep]:
+    kinds = [kind for kind in MACRO_STEP_TYPES if kind in step]
+    if len(kinds) != 1:
+        raise ValueError(
+            f"Macro step needs exactly one of {', '.join(MACRO_STEP_TYPES)}: {step}"
+        )
+
+    kind = kinds[0]
+    command: SamsungTVCommand
+    delay = step.get("delay", default_delay)
+    if delay is not None:
+        delay = float(delay)
+
+    if kind == "key":
+        cmd = str(step.get("cmd", "Click")).capitalize()
+        if cmd not in ("Click", "Press", "Release"):
+            raise ValueError(f"Invalid key cmd: {cmd}")
+        command = SendRemoteKey(
+            {
+                "Cmd": cmd,
+                "DataOfCmd": step["key"],
+                "Option": "false",
+                "TypeOfRemote": "SendRemoteKey",
+            }
+        )
+        return [_encode(command, delay) for _ in range(int(step.get("times", 1)))]
+
+    if kind == "hold":
+        return [
+            _encode(SendRemoteKey.press(step["hold"]), float(step.get("seconds", 1))),
+            _encode(SendRemoteKey.release(step["hold"]), delay),
+        ]
+
+    if kind == "text":
+        compiled = [
+            _encode(ChannelEmitCommand.text_received(), 0),
+            _encode(SendInputString.send(str(step["text"])), delay),
+        ]
+        if step.get("end"):
+            compiled.append(_encode(SendInputEnd(), delay))
+        return compiled
+
+    if kind == "app":
+        command = ChannelEmitCommand.launch_app(
+            step["app"],
+            step.get("app_type", "DEEP_LINK"),
+            step.get("meta_tag", ""),
+        )
+        return [_encode(command, delay)]
+
+    if kind == "sleep":
+        return [SamsungTVMacroStep(delay=float(step["sleep"]))]
+
+    timeout = step.get("timeout")
+    return [
+        SamsungTVMacroStep(
+            delay=float(step.get("delay", 0)),
+            wait_event=step["wait_event"],
+            timeout=None if timeout is None else float(timeout),
+        )
+    ]
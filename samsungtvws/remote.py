@@ -11,7 +11,7 @@ from __future__ import annotations
 import base64
 import logging
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 import warnings
 
 from samsungtvws.event import (
@@ -21,9 +21,12 @@ from samsungtvws.event import (
     parse_installed_app,
 )
 
-from . import art, connection, helper, rest, shortcuts
+from . import art, connection, rest, shortcuts
 from .command import SamsungTVCommand, SamsungTVSleepCommand
 
+if TYPE_CHECKING:
+    from .macro import SamsungTVMacro
+
 _LOGGING = logging.getLogger(__name__)
 
 REMOTE_ENDPOINT = "samsung.remote.control"
@@ -326,6 +329,23 @@ class SamsungTVWS(connection.SamsungTVWSConnection):
     def hold_key(self, key: str, seconds: float) -> None:
         self.send_command(SendRemoteKey.hold(key, seconds))
 
+    def run_macro(self, macro: SamsungTVMacro) -> None:
+        """Run a compiled macro, on the schedule of SamsungTVMacro.schedule()."""
+        if self.connection is None:
+            self.connection = self.open()
+
+        _LOGGING.debug("Running macro %s (%d steps)", macro.name, len(macro))
+        for delay, step in macro.schedule(self.key_press_delay):
+            if delay > 0:
+                time.sleep(delay)
+
+            if step.wait_event:
+                self.wait_for_event(
+                    step.wait_event, step.timeout, since=self._last_command_sent
+                )
+            elif step.payload is not None:
+                self._send_payload(self.connection, step.payload)
+
     def move_cursor(self, x: int, y: int, duration: int = 0) -> None:
         self._ws_send(
             RemoteControlCommand(
@@ -366,7 +386,7 @@ class SamsungTVWS(connection.SamsungTVWSConnection):
                 attempts_left -= 1
         else:
             assert self.connection
-            response = helper.process_api_response(self.connection.recv())
+            response = self._parse_frame(self.connection.recv())
             if response.get("event") == ED_INSTALLED_APP_EVENT:
                 self._app_list = parse_installed_app(response)
             else:
@@ -0,0 +1,22 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+
+Virtual Samsung TVs for tests, benchmarks and load testing.
+Requires the `async` extra (and `encrypted` for the legacy pairing).
+"""
+
+from .art import ArtStore
+from .conditions import NetworkConditions
+from .farm import SamsungTVSimulatorFarm
+from .tv import SamsungTVSimulator
+
+__all__ = [
+    "ArtStore",
+    "NetworkConditions",
+    "SamsungTVSimulator",
+    "SamsungTVSimulatorFarm",
+]
@@ -0,0 +1,73 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+
+Usage: python -m samsungtvws.simulator --count 100 --base-port 18001
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from .conditions import NetworkConditions
+from .farm import SamsungTVSimulatorFarm
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run simulated Samsung TVs")
+    parser.add_argument("--count", type=int, default=1, help="Number of TVs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--base-port", type=int, default=0, help="First port, 0 for free ports"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument(
+        "--disconnect-rate",
+        type=float,
+        default=0.0,
+        help="Probability of dropping the connection after each frame",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--pin", default="1234", help="Encrypted API pairing PIN")
+    parser.add_argument("--art-api-version", default="4.3.4.0")
+    parser.add_argument("--no-frame", action="store_true", help="Disable Art API")
+    parser.add_argument(
+        "--frames",
+        default=None,
+        help="Directory of recorded frames to replay (such as tests/fixtures)",
+    )
+    args = parser.parse_args(argv)
+
+    conditions = NetworkConditions(
+        args.latency, args.jitter, args.disconnect_rate, args.seed
+    )
+    farm = SamsungTVSimulatorFarm(
+        args.count,
+        args.host,
+        args.base_port,
+        conditions,
+        pin=args.pin,
+        art_api_version=args.art_api_version,
+        frame_tv=not args.no_frame,
+        frames_dir=args.frames,
+    )
+
+    async def _serve() -> None:
+        async with farm:
+            for tv in farm:
+                print(f"{tv.name} listening on {tv.host}:{tv.port}", flush=True)
+            await asyncio.Future()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
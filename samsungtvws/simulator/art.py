@@ -0,0 +1,363 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+import itertools
+import json
+import logging
+from typing import Any
+
+from .. import exceptions
+from ..art.d2d import AsyncD2DTransfer
+
+_LOGGING = logging.getLogger(__name__)
+
+SendD2D = Callable[[dict[str, Any]], Awaitable[None]]
+Reply = Callable[..., Awaitable[None]]
+
+MY_PHOTOS_CATEGORY = "MY-C0002"
+FAVOURITES_CATEGORY = "MY-C0004"
+
+DEFAULT_SETTINGS = {
+    "artmode_status": "off",
+    "auto_rotation_status": "off",
+    "slideshow_status": "off",
+    "brightness": "5",
+    "color_temperature": "0",
+    "brightness_sensor_setting": "off",
+    "motion_timer": "off",
+    "motion_sensitivity": "2",
+}
+MATTE_TYPES = ["none", "modernthin", "modern", "shadowbox", "flexible"]
+MATTE_COLORS = ["polar", "antique", "warm", "neutral", "sand", "black"]
+PHOTO_FILTERS = ["None", "Aqua", "ArtDeco", "Ink", "Wash", "Pastel", "Feuve"]
+
+
+class ArtStore:
+    """In-memory artwork library of a simulated Frame TV."""
+
+    def __init__(self) -> None:
+        self.artworks: dict[str, dict[str, Any]] = {}
+        self.current: str | None = None
+        self.settings = dict(DEFAULT_SETTINGS)
+        self._content_ids = itertools.count(1)
+
+    def add(
+        self,
+        data: bytes,
+        file_type: str = "jpg",
+        matte_id: str = "none",
+        category_id: str = MY_PHOTOS_CATEGORY,
+    ) -> str:
+        content_id = f"MY_F{next(self._content_ids):04d}"
+        self.artworks[content_id] = {
+            "content_id": content_id,
+            "category_id": category_id,
+            "file_type": file_type.lower(),
+            "matte_id": matte_id,
+            "portrait_matte_id": matte_id,
+            "width": 3840,
+            "height": 2160,
+            "image_date": "",
+            "content_type": "mobile",
+            "favorite": "off",
+            "data": data,
+        }
+        return content_id
+
+    def delete(self, content_ids: list[str]) -> None:
+        for content_id in content_ids:
+            self.artworks.pop(content_id, None)
+            if self.current == content_id:
+                self.current = None
+
+    def content_list(self, category: str | None = None) -> list[dict[str, Any]]:
+        return [
+            {key: value for key, value in item.items() if key != "data"}
+            for item in self.artworks.values()
+            if not category or item["category_id"] == category
+        ]
+
+
+class ArtChannel:
+    """
+    `com.samsung.art-app` request handler.
+
+    Replies go through `send`, which wraps them in a d2d_service_message.
+    Uploads and thumbnails use one-shot D2D TCP listeners, like real TVs.
+    """
+
+    def __init__(
+        self,
+        store: ArtStore,
+        host: str,
+        api_version: str = "4.3.4.0",
+        d2d_timeout: float = 30,
+    ) -> None:
+        self.store = store
+        self.host = host
+        self.api_version = api_version
+        self.d2d_timeout = d2d_timeout
+        self._servers: set[asyncio.Server] = set()
+
+    async def close(self) -> None:
+        for server in list(self._servers):
+            server.close()
+        self._servers.clear()
+
+    async def handle(self, request: dict[str, Any], send: SendD2D) -> None:
+        name = str(request.get("request", ""))
+        request_id = request.get("request_id", request.get("id"))
+
+        async def reply(**data: Any) -> None:
+            await send({"id": request_id, "request_id": request_id, **data})
+
+        if name in ("get_thumbnail", "get_thumbnail_list"):
+            await self._send_thumbnails(name, request, send)
+            return
+
+        handler = getattr(self, f"_on_{name}", None)
+        if handler is not None:
+            await handler(request, reply)
+        elif name.startswith(("get_", "set_")) and self._setting(name):
+            setting = self._setting(name)
+            assert setting
+            if name.startswith("set_"):
+                self.store.settings[setting] = str(request.get("value"))
+            await reply(event=name, value=self.store.settings[setting])
+        else:
+            await self._reply_error(reply, request)
+
+    async def _on_api_version(self, request: dict[str, Any], reply: Reply) -> None:
+        await reply(event=request["request"], version=self.api_version)
+
+    _on_get_api_version = _on_api_version
+
+    async def _on_get_device_info(self, request: dict[str, Any], reply: Reply) -> None:
+        await reply(event="get_device_info", value="ok", api_version=self.api_version)
+
+    async def _on_get_content_list(self, request: dict[str, Any], reply: Reply) -> None:
+        content_list = self.store.content_list(request.get("category"))
+        await reply(event="content_list", content_list=json.dumps(content_list))
+
+    async def _on_get_current_artwork(
+        self, request: dict[str, Any], reply: Reply
+    ) -> None:
+        artwork = self.store.artworks.get(self.store.current or "")
+        if not artwork:
+            await reply(event="current_artwork", content_id="")
+            return
+        await reply(
+            event="current_artwork",
+            content_id=artwork["content_id"],
+            matte_id=artwork["matte_id"],
+            portrait_matte_id=artwork["portrait_matte_id"],
+            category_id=artwork["category_id"],
+        )
+
+    async def _on_select_image(self, request: dict[str, Any], reply: Reply) -> None:
+        if request.get("content_id") not in self.store.artworks:
+            await self._reply_error(reply, request)
+            return
+        self.store.current = request["content_id"]
+        await reply(event="image_selected", content_id=self.store.current)
+
+    async def _on_change_favorite(self, request: dict[str, Any], reply: Reply) -> None:
+        artwork = self.store.artworks.get(request.get("content_id", ""))
+        if not artwork:
+            await self._reply_error(reply, request)
+            return
+        artwork["favorite"] = request.get("status", "on")
+        await reply(
+            event="favorite_changed",
+            content_id=artwork["content_id"],
+            status=artwork["favorite"],
+        )
+
+    async def _on_change_matte(self, request: dict[str, Any], reply: Reply) -> None:
+        artwork = self.store.artworks.get(request.get("content_id", ""))
+        if not artwork:
+            await self._reply_error(reply, request)
+            return
+        artwork["matte_id"] = request.get("matte_id", "none")
+        artwork["portrait_matte_id"] = request.get(
+            "portrait_matte_id", artwork["matte_id"]
+        )
+        await reply(event="matte_changed", content_id=artwork["content_id"])
+
+    async def _on_get_matte_list(self, request: dict[str, Any], reply: Reply) -> None:
+        await reply(
+            event="get_matte_list",
+            matte_type_list=json.dumps([{"matte_type": m} for m in MATTE_TYPES]),
+            matte_color_list=json.dumps([{"color": c} for c in MATTE_COLORS]),
+        )
+
+    async def _on_get_photo_filter_list(
+        self, request: dict[str, Any], reply: Reply
+    ) -> None:
+        await reply(
+            event="get_photo_filter_list",
+            filter_list=json.dumps([{"filter_id": f} for f in PHOTO_FILTERS]),
+        )
+
+    async def _on_set_photo_filter(self, request: dict[str, Any], reply: Reply) -> None:
+        await reply(event="filter_changed", content_id=request.get("content_id"))
+
+    async def _on_get_current_rotation(
+        self, request: dict[str, Any], reply: Reply
+    ) -> None:
+        await reply(event="get_current_rotation", current_rotation_status=1)
+
+    async def _on_get_artmode_settings(
+        self, request: dict[str, Any], reply: Reply
+    ) -> None:
+        data = [
+            {"item": item, "value": value}
+            for item, value in self.store.settings.items()
+        ]
+        await reply(event="get_artmode_settings", data=json.dumps(data))
+
+    async def _on_delete_image_list(
+        self, request: dict[str, Any], reply: Reply
+    ) -> None:
+        content_id_list = request.get("content_id_list", [])
+        self.store.delete([item["content_id"] for item in content_id_list])
+        await reply(event="image_deleted", content_id_list=json.dumps(content_id_list))
+
+    async def _on_send_image(self, request: dict[str, Any], reply: Reply) -> None:
+        await self._receive_image(request, reply)
+
+    async def handle_binary_upload(self, message: bytes, send: SendD2D) -> None:
+        """Art API 0.97 upload: uint16 header length + JSON header + image bytes."""
+        header_len = int.from_bytes(message[:2], "big")
+        header = json.loads(message[2 : 2 + header_len])
+        inner = json.loads(header["params"]["data"])
+        file_type = str(inner.get("file_type", "jpg")).lower()
+        content_id = self.store.add(
+            message[2 + header_len :],
+            file_type="jpg" if file_type == "jpeg" else file_type,
+            matte_id=inner.get("matte_id", "none"),
+        )
+        await send(
+            {
+                "id": inner["id"],
+                "request_id": inner["id"],
+                "event": "image_added",
+                "content_id": content_id,
+            }
+        )
+
+    def _setting(self, name: str) -> str | None:
+        setting = name[len("get_") :]
+        if setting in self.store.settings:
+            return setting
+        if setting.endswith("_status") and setting[: -len("_status")] in (
+            self.store.settings
+        ):
+            return setting[: -len("_status")]
+        return None
+
+    async def _reply_error(self, reply: Reply, request: dict[str, Any]) -> None:
+        await reply(event="error", error_code="-1", request_data=json.dumps(request))
+
+    async def _open_d2d_listener(
+        self,
+        handler: Callable[
+            [asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]
+        ],
+    ) -> int:
+        server: asyncio.Server | None = None
+
+        async def _once(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            # One connection per transfer, then the endpoint goes away
+            assert server
+            server.close()
+            self._servers.discard(server)
+            try:
+                await asyncio.wait_for(handler(reader, writer), self.d2d_timeout)
+            except (
+                asyncio.TimeoutError,
+                exceptions.ConnectionFailure,
+                OSError,
+            ) as err:
+                _LOGGING.debug("D2D transfer failed: %s", err)
+            finally:
+                writer.close()
+                with contextlib.suppress(OSError):
+                    await writer.wait_closed()
+
+        server = await asyncio.start_server(_once, self.host, 0)
+        self._servers.add(server)
+        return int(server.sockets[0].getsockname()[1])
+
+    async def _receive_image(self, request: dict[str, Any], reply: Reply) -> None:
+        key = f"{request['id']}-key"
+
+        async def _receive(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            header, data = await AsyncD2DTransfer(reader, writer).recv_file()
+            if header.get("secKey") != key:
+                await self._reply_error(reply, request)
+                return
+
+            content_id = self.store.add(
+                bytes(data),
+                file_type=header.get("fileType", request.get("file_type", "jpg")),
+                matte_id=request.get("matte_id", "none"),
+            )
+            await reply(event="image_added", content_id=content_id)
+
+        port = await self._open_d2d_listener(_receive)
+        await reply(
+            event="ready_to_use",
+            conn_info={"ip": self.host, "port": port, "key": key, "secured": False},
+        )
+
+    async def _send_thumbnails(
+        self, name: str, request: dict[str, Any], send: SendD2D
+    ) -> None:
+        if name == "get_thumbnail":
+            content_ids = [request["content_id"]]
+        else:
+            content_ids = [item["content_id"] for item in request["content_id_list"]]
+
+        async def _send(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            transfer = AsyncD2DTransfer(reader, writer)
+            for num, content_id in enumerate(content_ids):
+                artwork = self.store.artworks.get(content_id)
+                data = artwork["data"] if artwork else b""
+                header = {
+                    "num": num,
+                    "total": len(content_ids),
+                    "fileLength": len(data),
+                    "fileID": content_id,
+                    "fileType": artwork["file_type"] if artwork else "jpg",
+                }
+                await transfer.send_file(header, data)
+
+        port = await self._open_d2d_listener(_send)
+        d2d_id = request["conn_info"]["id"]
+        await send(
+            {
+                "id": d2d_id,
+                "request_id": d2d_id,
+                "event": name,
+                "conn_info": json.dumps(
+                    {"ip": self.host, "port": port, "secured": False}
+                ),
+            }
+        )
@@ -0,0 +1,60 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+
+class NetworkConditions:
+    """
+    Network behaviour applied by a simulated TV.
+
+    Every reply is delayed by `latency` seconds plus a uniform random
+    +/- `jitter`. After each received frame the TV drops the connection with
+    probability `disconnect_rate`. Pass a `seed` for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        disconnect_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be >= 0")
+        if not 0 <= disconnect_rate <= 1:
+            raise ValueError("disconnect_rate must be between 0 and 1")
+
+        self.latency = latency
+        self.jitter = jitter
+        self.disconnect_rate = disconnect_rate
+        self._random = random.Random(seed)
+
+    def __repr__(self) -> str:
+        return (
+            f"NetworkConditions(latency={self.latency!r}, jitter={self.jitter!r}, "
+            f"disconnect_rate={self.disconnect_rate!r})"
+        )
+
+    def delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    async def wait(self) -> None:
+        delay = self.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def should_disconnect(self) -> bool:
+        return (
+            bool(self.disconnect_rate) and self._random.random() < self.disconnect_rate
+        )
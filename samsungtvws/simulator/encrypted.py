@@ -0,0 +1,190 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import secrets
+import struct
+from typing import Any
+
+_LOGGING = logging.getLogger(__name__)
+
+COMPANION_ENDPOINT = "/com.samsung.companion"
+COMMAND_PREFIX = f"5::{COMPANION_ENDPOINT}:"
+
+PIN_PAGE_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<service xmlns="urn:dial-multiscreen-org:schemas:dial" xmlns:atom="http://www.w3.org/2005/Atom">
+    <name>CloudPINPage</name>
+    <options allowStop="true"/>
+    <state>{state}</state>
+    <atom:link rel="run" href="run"/>
+</service>
+"""
+
+
+def _auth_response(**data: str) -> str:
+    return json.dumps({"auth_data": json.dumps(data) if data else ""})
+
+
+class EncryptedPairing:
+    """
+    TV side of the SPC pairing used by the encrypted (H/J series) API.
+
+    The TV answers the client's GeneratorServerHello with its own client
+    hello, derives the same session key (the token) and hands out a
+    session id on acknowledge. Requires the `encrypted` extra.
+    """
+
+    def __init__(self, pin: str = "1234") -> None:
+        self.pin = pin
+        self.pin_page_running = False
+        # session_id -> token (hex), as returned to the client
+        self.sessions: dict[str, str] = {}
+        self._sk_prime: bytes | None = None
+        self._token: str | None = None
+        self._next_session_id = 1
+
+    def pin_page(self) -> str:
+        return PIN_PAGE_TEMPLATE.format(
+            state="running" if self.pin_page_running else "stopped"
+        )
+
+    def server_hello(self, body: str) -> str:
+        """Handle pairing step 1, return the response text."""
+        from ..encrypted.authenticator import (
+            _PUBLIC_KEY_BYTES,
+            _decrypt_parameter_data_with_aes,
+            _parse_client_hello,
+        )
+
+        self._sk_prime = None
+        output = re.search(r'GeneratorServerHello"\s*:\s*"([0-9a-fA-F]+)"', body)
+        if output is None:
+            return _auth_response()
+
+        server_hello = bytes.fromhex(output.group(1))
+        data_len = struct.unpack(">I", server_hello[7:11])[0]
+        data = server_hello[11 : 11 + data_len]
+        user_id_len = struct.unpack(">I", data[:4])[0]
+        user_id = data[4 : 4 + user_id_len]
+        aes_key = hashlib.sha1(self.pin.encode("utf-8")).digest()[:16]
+
+        # The server hello carries the public key encrypted with the PIN
+        swapped = data[4 + user_id_len :]
+        if _aes_cbc(aes_key, _decrypt_parameter_data_with_aes(swapped), False) != (
+            _PUBLIC_KEY_BYTES
+        ):
+            _LOGGING.debug("Pairing rejected: wrong pin")
+            return _auth_response()
+
+        client_hello = self._generate_client_hello(aes_key)
+        result = _parse_client_hello(
+            client_hello,
+            hashlib.sha1(data).digest(),
+            aes_key,
+            user_id.decode("utf-8"),
+        )
+        assert result
+        self._sk_prime = result["SKPrime"]
+        self._token = result["ctx"].hex()
+
+        return _auth_response(
+            auth_type="SPC", request_id="1", GeneratorClientHello=client_hello
+        )
+
+    def acknowledge(self, body: str) -> str:
+        """Handle pairing step 2, return the response text."""
+        from ..encrypted.authenticator import _generate_server_acknowledge
+
+        output = re.search(r'ServerAckMsg"\s*:\s*"([0-9a-fA-F]+)"', body)
+        if (
+            output is None
+            or self._sk_prime is None
+            or self._token is None
+            or output.group(1) != _generate_server_acknowledge(self._sk_prime)
+        ):
+            return _auth_response()
+
+        # Clients only read a single digit session id
+        session_id = str(self._next_session_id)
+        self._next_session_id = self._next_session_id % 9 + 1
+        self.sessions[session_id] = self._token
+
+        client_ack = (
+            "0104000000000000000014"
+            + hashlib.sha1(self._sk_prime + b"\x02").hexdigest().upper()
+            + "0000000000"
+        )
+        self._sk_prime = None
+        return _auth_response(
+            auth_type="SPC",
+            request_id="0",
+            ClientAckMsg=client_ack,
+            session_id=session_id,
+        )
+
+    def decrypt_command(self, frame: str) -> dict[str, Any] | None:
+        """Decode a `5::/com.samsung.companion:` callCommon frame."""
+        if not frame.startswith(COMMAND_PREFIX):
+            return None
+
+        message = json.loads(frame[len(COMMAND_PREFIX) :])
+        args = message["args"][0]
+        token = self.sessions.get(str(args["Session_Id"]))
+        if token is None:
+            _LOGGING.debug("Unknown session id %s", args["Session_Id"])
+            return None
+
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        from ..encrypted.session import Padding
+
+        encrypted = bytes(json.loads(args["body"]))
+        decryptor = Cipher(
+            algorithms.AES(bytes.fromhex(token)), modes.ECB()
+        ).decryptor()
+        payload = Padding.unpad(decryptor.update(encrypted) + decryptor.finalize())
+        return json.loads(payload)  # type: ignore[no-any-return]
+
+    def _generate_client_hello(self, aes_key: bytes) -> str:
+        from ..encrypted.authenticator import (
+            _PRIME_INT,
+            _PRIVATE_KEY_INT,
+            _encrypt_parameter_data_with_aes,
+        )
+
+        while True:
+            p_gx = secrets.randbelow(_PRIME_INT - 3) + 2
+            secret = pow(p_gx, _PRIVATE_KEY_INT, _PRIME_INT)
+            # Clients decode the secret from its hex form, keep it even length
+            if len(f"{secret:x}") % 2 == 0:
+                break
+
+        tv_user_id = b"654321"
+        encrypted_gx = _encrypt_parameter_data_with_aes(
+            _aes_cbc(aes_key, p_gx.to_bytes(128, "big"), True)
+        )
+        secret_bytes = secret.to_bytes((secret.bit_length() + 7) // 8, "big")
+        secret_hash = hashlib.sha1(tv_user_id + secret_bytes).digest()
+        body = (
+            struct.pack(">I", len(tv_user_id)) + tv_user_id + encrypted_gx + secret_hash
+        )
+        hello = b"\x01\x01" + b"\x00" * 5 + struct.pack(">I", len(body)) + body
+        return (hello + b"\x00" * 5).hex().upper()
+
+
+def _aes_cbc(key: bytes, data: bytes, encrypt: bool) -> bytes:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    cipher = Cipher(algorithms.AES(key), modes.CBC(b"\x00" * 16))
+    context = cipher.encryptor() if encrypt else cipher.decryptor()
+    return context.update(data) + context.finalize()
@@ -0,0 +1,121 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+import threading
+from typing import Any
+
+from .conditions import NetworkConditions
+from .tv import SamsungTVSimulator
+
+
+class SamsungTVSimulatorFarm:
+    """
+    N simulated TVs on consecutive localhost ports.
+
+    With `base_port=0` every TV gets a free port. Use it from asyncio with
+    `async with`, or from sync code with `with`, which runs the TVs on a
+    background event loop thread.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        conditions: NetworkConditions | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if count < 1:
+            raise ValueError("count must be >= 1")
+
+        self.tvs = [
+            SamsungTVSimulator(
+                host,
+                base_port + index if base_port else 0,
+                name=f"Samsung TV Simulator {index + 1}",
+                conditions=conditions,
+                **kwargs,
+            )
+            for index in range(count)
+        ]
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self.tvs)
+
+    def __iter__(self) -> Iterator[SamsungTVSimulator]:
+        return iter(self.tvs)
+
+    def __getitem__(self, index: int) -> SamsungTVSimulator:
+        return self.tvs[index]
+
+    @property
+    def ports(self) -> list[int]:
+        return [tv.port for tv in self.tvs]
+
+    async def start(self) -> None:
+        await asyncio.gather(*(tv.start() for tv in self.tvs))
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(tv.stop() for tv in self.tvs))
+
+    async def __aenter__(self) -> SamsungTVSimulatorFarm:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    def start_in_thread(self) -> None:
+        """Serve the TVs from a background event loop (for sync clients)."""
+        if self._thread:
+            raise RuntimeError("Simulator farm already running")
+
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors: list[BaseException] = []
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as err:
+                errors.append(err)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            loop.run_forever()
+            loop.run_until_complete(self.stop())
+            loop.close()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=_run, name="tv-simulator", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._loop = self._thread = None
+            raise errors[0]
+
+    def stop_thread(self) -> None:
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop = self._thread = None
+
+    def __enter__(self) -> SamsungTVSimulatorFarm:
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop_thread()
@@ -0,0 +1,446 @@
+"""
+SamsungTVWS - Samsung Smart TV WS API wrapper
+
+Copyright (C) 2019 DSR! <xchwarze@gmail.com>
+
+SPDX-License-Identifier: LGPL-3.0
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import glob
+import json
+import logging
+import os
+import secrets
+import socket
+from typing import Any
+import uuid
+
+from aiohttp import WSMsgType, web
+
+from ..event import (
+    D2D_SERVICE_MESSAGE_EVENT,
+    ED_APPS_LAUNCH_EVENT,
+    ED_INSTALLED_APP_EVENT,
+    MS_CHANNEL_CONNECT_EVENT,
+    MS_CHANNEL_READY_EVENT,
+)
+from .art import ArtChannel, ArtStore, SendD2D
+from .conditions import NetworkConditions
+from .encrypted import COMPANION_ENDPOINT, EncryptedPairing
+
+_LOGGING = logging.getLogger(__name__)
+
+ART_ENDPOINT = "com.samsung.art-app"
+SOCKET_IO_HEARTBEAT = "2::"
+SOCKET_IO_DISCONNECT = "0::"
+
+# Frames a recording can replace (see `frames_dir`)
+RECORDED_EVENTS = (
+    MS_CHANNEL_CONNECT_EVENT,
+    MS_CHANNEL_READY_EVENT,
+    ED_INSTALLED_APP_EVENT,
+)
+
+DEFAULT_APPS = {
+    "111299001912": "YouTube",
+    "3201907018807": "Netflix",
+    "3201606009684": "Spotify - Music and Podcasts",
+}
+
+
+class SamsungTVSimulator:
+    """
+    A virtual Samsung TV served on one localhost port.
+
+    The same port answers every API, so clients only need `port=tv.port`:
+    - REST `/api/v2/` (device info, applications, IME input)
+    - websocket channels `/api/v2/channels/<app>` (remote control and Art)
+    - encrypted API pairing (`/ws/pairing`, `/ws/apps/CloudPINPage`) and
+      its socket.io command channel (`/socket.io/1/`)
+
+    Received keys and commands are recorded in `keys` and
+    `encrypted_commands` so load tests can assert on them.
+
+    With `frames_dir`, the ms.channel.connect, ms.channel.ready and
+    ed.installedApp.get frames are replayed from the JSON recordings in that
+    directory (such as tests/fixtures) instead of being generated. Only the
+    token of the connect frame is replaced.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        name: str = "Samsung TV Simulator",
+        model: str = "QE55LS03BAUXXN",
+        token: str | None = None,
+        frame_tv: bool = True,
+        art_api_version: str = "4.3.4.0",
+        pin: str = "1234",
+        heartbeat_timeout: int = 60,
+        apps: dict[str, str] | None = None,
+        conditions: NetworkConditions | None = None,
+        frames_dir: str | None = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.name = name
+        self.model = model
+        self.token = token or str(secrets.randbelow(90000000) + 10000000)
+        self.frame_tv = frame_tv
+        self.heartbeat_timeout = heartbeat_timeout
+        self.apps = dict(DEFAULT_APPS if apps is None else apps)
+        self.running_apps: set[str] = set()
+        self.conditions = conditions or NetworkConditions()
+        self.art_store = ArtStore()
+        self.art = ArtChannel(self.art_store, host, api_version=art_api_version)
+        self.pairing = EncryptedPairing(pin)
+        self.keys: list[str] = []
+        self.encrypted_commands: list[dict[str, Any]] = []
+        self.connections = 0
+        self.disconnects = 0
+        self.uuid = str(uuid.uuid4())
+        self._recorded = {} if frames_dir is None else load_recorded_frames(frames_dir)
+        self._sockets: set[web.WebSocketResponse] = set()
+        self._runner: web.AppRunner | None = None
+
+    def __repr__(self) -> str:
+        return f"SamsungTVSimulator(host={self.host!r}, port={self.port!r})"
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=0)
+        app.add_routes(
+            [
+                web.get("/api/v2/", self._rest_device_info),
+                web.route("*", "/api/v2/applications/{app_id}", self._rest_app),
+                web.post("/api/v2/remoteControl/imeInput/{text:.+}", self._rest_ime),
+                web.get("/api/v2/channels/{app}", self._ws_channel),
+                web.get("/socket.io/1/", self._socket_io_handshake),
+                web.get("/socket.io/1/websocket/{sid}", self._socket_io_channel),
+                web.route("*", "/ws/apps/CloudPINPage", self._pin_page),
+                web.delete("/ws/apps/CloudPINPage/run", self._pin_page_close),
+                web.route("*", "/ws/pairing", self._pairing),
+            ]
+        )
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        self._runner = web.AppRunner(app, handle_signals=False, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+        _LOGGING.debug(
+            "Simulator %s listening on %s:%s", self.name, self.host, self.port
+        )
+
+    async def stop(self) -> None:
+        for ws in list(self._sockets):
+            with contextlib.suppress(Exception):
+                await ws.close()
+        await self.art.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> SamsungTVSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "id": f"uuid:{self.uuid}",
+            "name": self.name,
+            "type": "Samsung SmartTV",
+            "uri": f"http://{self.host}:{self.port}/api/v2/",
+            "version": "2.0.25",
+            "device": {
+                "FrameTVSupport": str(self.frame_tv).lower(),
+                "TokenAuthSupport": "true",
+                "PowerState": "on",
+                "id": f"uuid:{self.uuid}",
+                "ip": self.host,
+                "modelName": self.model,
+                "name": self.name,
+                "networkType": "wired",
+                "type": "Samsung SmartTV",
+                "wifiMac": "00:00:00:00:00:00",
+            },
+        }
+
+    # -------------------------
+    # REST
+    # -------------------------
+    async def _rest_device_info(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        return web.json_response(self.device_info())
+
+    async def _rest_app(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        app_id = request.match_info["app_id"]
+        if app_id not in self.apps:
+            return web.json_response({"code": 404, "message": "Not found"}, status=404)
+
+        if request.method == "POST":
+            self.running_apps.add(app_id)
+        elif request.method == "DELETE":
+            self.running_apps.discard(app_id)
+        if request.method != "GET":
+            return web.json_response({"ok": True})
+
+        running = app_id in self.running_apps
+        return web.json_response(
+            {
+                "id": app_id,
+                "name": self.apps[app_id],
+                "running": running,
+                "version": "1.0.0",
+                "visible": running,
+            }
+        )
+
+    async def _rest_ime(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        if request.query.get("token") != self.token:
+            return web.json_response({"code": 401}, status=401)
+        text = base64.b64decode(request.match_info["text"]).decode("utf-8")
+        self.keys.append(f"IME:{text}")
+        return web.json_response({"ok": True})
+
+    # -------------------------
+    # WebSocket channels
+    # -------------------------
+    async def _send(self, ws: web.WebSocketResponse, frame: dict[str, Any]) -> None:
+        await self.conditions.wait()
+        if not ws.closed:
+            await ws.send_str(json.dumps(frame))
+
+    async def _open_socket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0, autoping=True)
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        self.connections += 1
+        return ws
+
+    async def _drop(self, ws: web.WebSocketResponse) -> bool:
+        if not self.conditions.should_disconnect():
+            return False
+        self.disconnects += 1
+        await ws.close()
+        return True
+
+    async def _ws_channel(self, request: web.Request) -> web.WebSocketResponse:
+        app = request.match_info["app"]
+        ws = await self._open_socket(request)
+        try:
+            await self._send(ws, self._connect_frame())
+            if app == ART_ENDPOINT:
+                if not self.frame_tv:
+                    await ws.close()
+                    return ws
+                await self._send(
+                    ws,
+                    self._recorded.get(
+                        MS_CHANNEL_READY_EVENT,
+                        {"data": {}, "event": MS_CHANNEL_READY_EVENT},
+                    ),
+                )
+
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    await self._on_channel_message(ws, app, json.loads(msg.data))
+                elif msg.type == WSMsgType.BINARY and app == ART_ENDPOINT:
+                    await self.art.handle_binary_upload(msg.data, self._d2d_sender(ws))
+                if await self._drop(ws):
+                    break
+        finally:
+            self._sockets.discard(ws)
+        return ws
+
+    def _connect_frame(self) -> dict[str, Any]:
+        recorded = self._recorded.get(MS_CHANNEL_CONNECT_EVENT)
+        if recorded is not None:
+            return {**recorded, "data": {**recorded["data"], "token": self.token}}
+        return {
+            "data": {
+                "clients": [],
+                "id": str(uuid.uuid4()),
+                "token": self.token,
+            },
+            "event": MS_CHANNEL_CONNECT_EVENT,
+        }
+
+    def _d2d_sender(self, ws: web.WebSocketResponse) -> SendD2D:
+        async def _send_d2d(payload: dict[str, Any]) -> None:
+            await self._send(
+                ws,
+                {
+                    "data": json.dumps(payload),
+                    "event": D2D_SERVICE_MESSAGE_EVENT,
+                    "from": "host",
+                },
+            )
+
+        return _send_d2d
+
+    async def _on_channel_message(
+        self, ws: web.WebSocketResponse, app: str, message: dict[str, Any]
+    ) -> None:
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "ms.remote.control":
+            self.keys.append(str(params.get("DataOfCmd")))
+            return
+
+        if method == "ms.channel.emit":
+            event = params.get("event")
+            if event == "art_app_request" and app == ART_ENDPOINT:
+                await self.art.handle(json.loads(params["data"]), self._d2d_sender(ws))
+            elif event == ED_INSTALLED_APP_EVENT:
+                await self._send(ws, self._installed_apps_frame())
+            elif event == ED_APPS_LAUNCH_EVENT:
+                app_id = params.get("data", {}).get("appId")
+                launched = app_id in self.apps
+                if launched:
+                    self.running_apps.add(app_id)
+                await self._send(
+                    ws,
+                    {
+                        "data": 200 if launched else 404,
+                        "event": ED_APPS_LAUNCH_EVENT,
+                        "from": "host",
+                    },
+                )
+            return
+
+        await self._send(
+            ws,
+            {
+                "data": {"message": f"unrecognized method value : {method}"},
+                "event": "ms.error",
+            },
+        )
+
+    def _installed_apps_frame(self) -> dict[str, Any]:
+        recorded = self._recorded.get(ED_INSTALLED_APP_EVENT)
+        if recorded is not None:
+            return recorded
+        return {
+            "data": {
+                "data": [
+                    {
+                        "appId": app_id,
+                        "app_type": 2,
+                        "icon": f"/opt/share/webappservice/apps_icon/FirstScreen/{app_id}/250x250.png",
+                        "is_lock": 0,
+                        "name": name,
+                    }
+                    for app_id, name in self.apps.items()
+                ]
+            },
+            "event": ED_INSTALLED_APP_EVENT,
+            "from": "host",
+        }
+
+    # -------------------------
+    # Encrypted API
+    # -------------------------
+    async def _pin_page(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        if request.method == "POST":
+            self.pairing.pin_page_running = True
+            return web.Response(text="")
+        return web.Response(text=self.pairing.pin_page(), content_type="text/xml")
+
+    async def _pin_page_close(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        self.pairing.pin_page_running = False
+        return web.Response(text="")
+
+    async def _pairing(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        step = request.query.get("step")
+        body = await request.text()
+        if step == "1":
+            text = self.pairing.server_hello(body)
+        elif step == "2":
+            text = self.pairing.acknowledge(body)
+        else:
+            text = json.dumps({"auth_data": {"auth_type": "SPC", "request_id": "0"}})
+        return web.Response(text=text)
+
+    async def _socket_io_handshake(self, request: web.Request) -> web.Response:
+        await self.conditions.wait()
+        sid = secrets.token_hex(10)
+        return web.Response(
+            text=f"{sid}:{self.heartbeat_timeout}:{self.heartbeat_timeout}:websocket"
+        )
+
+    async def _socket_io_channel(self, request: web.Request) -> web.WebSocketResponse:
+        ws = await self._open_socket(request)
+        heartbeat = asyncio.ensure_future(self._socket_io_heartbeat(ws))
+        try:
+            await ws.send_str("1::")
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                if msg.data == f"1::{COMPANION_ENDPOINT}":
+                    await self._send_socket_io(ws, msg.data)
+                elif msg.data.startswith("5::"):
+                    command = self.pairing.decrypt_command(msg.data)
+                    if command is not None:
+                        self.encrypted_commands.append(command)
+                        self._record_encrypted_key(command)
+                if self.conditions.should_disconnect():
+                    self.disconnects += 1
+                    await ws.send_str(SOCKET_IO_DISCONNECT)
+                    await ws.close()
+                    break
+        finally:
+            heartbeat.cancel()
+            self._sockets.discard(ws)
+        return ws
+
+    async def _send_socket_io(self, ws: web.WebSocketResponse, frame: str) -> None:
+        await self.conditions.wait()
+        if not ws.closed:
+            await ws.send_str(frame)
+
+    async def _socket_io_heartbeat(self, ws: web.WebSocketResponse) -> None:
+        with contextlib.suppress(ConnectionError):
+            while not ws.closed:
+                await asyncio.sleep(self.heartbeat_timeout / 2)
+                await self._send_socket_io(ws, SOCKET_IO_HEARTBEAT)
+
+    def _record_encrypted_key(self, command: dict[str, Any]) -> None:
+        body = command.get("body", {})
+        if body.get("api") == "SendRemoteKey":
+            self.keys.append(str(body.get("param3")))
+
+
+def load_recorded_frames(frames_dir: str) -> dict[str, dict[str, Any]]:
+    """Return the RECORDED_EVENTS frames found in the JSON files of a directory."""
+    frames: dict[str, dict[str, Any]] = {}
+    for path in sorted(glob.glob(os.path.join(frames_dir, "*.json"))):
+        try:
+            with open(path, encoding="utf-8") as f:
+                frame = json.load(f)
+        except (OSError, ValueError) as err:
+            _LOGGING.debug("Skipping recorded frame %s: %s", path, err)
+            continue
+        if isinstance(frame, dict) and frame.get("event") in RECORDED_EVENTS:
+            frames[frame["event"]] = frame
+    if not frames:
+        raise ValueError(f"No recorded frames found in {frames_dir}")
+    return frames
@@ -7,6 +7,7 @@ import pytest
 
 from samsungtvws import exceptions
 from samsungtvws.art import SamsungTVArt
+from samsungtvws.art.retry import RetryPolicy
 from samsungtvws.remote import SamsungTVWS
 
 from .const import (
@@ -266,6 +267,63 @@ def test_send_image_success_binary_payload(connection: Mock) -> None:
         assert img_bytes == file_bytes
 
 
+def test_upload_retry_and_transport_fallback() -> None:
+    """Transfer failures are retried with backoff, then over the other transport."""
+    failure = exceptions.ConnectionFailure("connection reset")
+    with (
+        patch.object(SamsungTVArt, "get_api_version", return_value="0.97") as version,
+        patch.object(
+            SamsungTVArt, "_upload_ws_binary_send_image", side_effect=failure
+        ) as ws_binary,
+        patch.object(SamsungTVArt, "_upload_d2d") as d2d,
+        patch.object(
+            SamsungTVArt, "_wait_for_d2d", return_value={"content_id": "MY_F0002"}
+        ) as image_added,
+        patch("samsungtvws.art.art.time.sleep") as sleep,
+    ):
+        tv_art = SamsungTVArt("127.0.0.1")
+        # Off unless asked for
+        with pytest.raises(exceptions.ConnectionFailure):
+            tv_art.upload(b"\xff\xd8image", file_type="jpg")
+        assert ws_binary.call_count == 1
+        sleep.assert_not_called()
+
+        tv_art.retry_policy = RetryPolicy(base_delay=0.5, jitter=0)
+        assert tv_art.upload(b"\xff\xd8image", file_type="jpg") == "MY_F0002"
+        assert ws_binary.call_count == 3
+        assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0]
+
+        # The working transport is kept for the next uploads
+        assert tv_art.upload(b"\xff\xd8other", file_type="jpg") == "MY_F0002"
+        assert ws_binary.call_count == 3
+        assert d2d.call_count == 2
+        assert version.call_count == 1
+
+        # Sent already: the TV may have it, it is not sent again
+        image_added.side_effect = failure
+        with pytest.raises(exceptions.ConnectionFailure):
+            tv_art.upload(b"\xff\xd8image", file_type="jpg")
+        assert d2d.call_count == 3
+        assert sleep.call_count == 2
+
+        d2d.side_effect = failure
+        tv_art.retry_policy = None
+        with pytest.raises(exceptions.ConnectionFailure):
+            tv_art.upload(b"\xff\xd8image", file_type="jpg")
+        assert d2d.call_count == 4
+
+
+def test_retry_policy() -> None:
+    policy = RetryPolicy(attempts=3, base_delay=1, max_delay=3, jitter=0)
+    assert [policy.delay(attempt) for attempt in (1, 2, 3)] == [1, 2, 3]
+    assert policy.should_retry(OSError("timed out"), 2)
+    assert not policy.should_retry(OSError("timed out"), 3)
+    assert not policy.should_retry(exceptions.ResponseError("refused"), 1)
+    assert not policy.should_retry(exceptions.UnauthorizedError("denied"), 1)
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
 def test_get_thumbnail_inline_binary_skips_socket(connection: Mock) -> None:
     """Art API 0.97: thumbnail is returned inline as WS bytes (JSON + \\n + JPEG)."""
     with patch("samsungtvws.art.art.uuid.uuid4", return_value=_UUID):
@@ -286,3 +344,25 @@ def test_get_thumbnail_inline_binary_skips_socket(connection: Mock) -> None:
         # Assert JPEG signature (SOI ... EOI)
         assert bytes(thumb).startswith(b"\xff\xd8")
         assert bytes(thumb).endswith(b"\xff\xd9")
+
+
+def test_available_cache(connection: Mock) -> None:
+    with patch("samsungtvws.art.art.uuid.uuid4", return_value=_UUID):
+        connection.recv.side_effect = [
+            MS_CHANNEL_CONNECT_SAMPLE,
+            MS_CHANNEL_READY_SAMPLE,
+            D2D_SERVICE_MESSAGE_AVAILABLE_SAMPLE,
+        ]
+
+        tv_art = SamsungTVArt("127.0.0.1")
+        content_list = tv_art.available()
+        assert tv_art.available() == content_list
+        category = content_list[0]["category_id"]
+        assert tv_art.available(category) == [
+            item for item in content_list if item["category_id"] == category
+        ]
+        connection.send.assert_called_once()
+
+        # Copies, the cache is not changed through them
+        content_list[0]["category_id"] = "changed"
+        assert tv_art.available()[0]["category_id"] == category
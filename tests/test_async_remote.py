@@ -6,8 +6,10 @@ from unittest.mock import Mock, call, patch
 import pytest
 
 from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.command import SamsungTVWaitForEventCommand
+from samsungtvws.event import ED_APPS_LAUNCH_EVENT
 from samsungtvws.exceptions import ConnectionFailure
-from samsungtvws.remote import SendRemoteKey
+from samsungtvws.remote import ChannelEmitCommand, SendRemoteKey
 
 from .const import (
     ED_APPS_LAUNCH_SAMPLE,
@@ -162,3 +164,27 @@ async def test_send_hold_key(async_connection: Mock) -> None:
 
     assert patch_sleep.call_count == 3
     assert patch_sleep.call_args_list == [call(1), call(3), call(1)]
+
+
+@pytest.mark.asyncio
+async def test_send_wait_for_event(async_connection: Mock) -> None:
+    """Ensure a sequence waits for the TV event instead of sleeping."""
+    async_connection.recv = Mock(
+        side_effect=[
+            create_future_with_result(MS_CHANNEL_CONNECT_SAMPLE),
+            create_future_with_result(ED_APPS_LAUNCH_SAMPLE),
+        ]
+    )
+    async_connection.send = Mock(return_value=create_future_with_result(None))
+
+    tv = SamsungTVWSAsyncRemote("127.0.0.1")
+    await tv.send_commands(
+        [
+            ChannelEmitCommand.launch_app("3201606009684"),
+            SamsungTVWaitForEventCommand(ED_APPS_LAUNCH_EVENT, timeout=10),
+            SendRemoteKey.enter(),
+        ]
+    )
+
+    assert async_connection.send.call_count == 2
+    assert async_connection.recv.call_count == 2
@@ -0,0 +1,53 @@
+"""Tests for the art content catalog."""
+
+import json
+
+from samsungtvws.art.catalog import ArtCatalog
+
+CONTENT_LIST = [
+    {"content_id": "MY_F0001", "category_id": "MY-C0002", "matte_id": "none"},
+    {
+        "content_id": "MY_F0002",
+        "category_id": "MY-C0002",
+        "matte_id": "shadowbox_polar",
+        "favorite": "on",
+    },
+    {"content_id": "SAM-S0001", "category_id": "MY-C0004", "matte_id": "none"},
+]
+
+
+def _ids(items) -> list:
+    return [item["content_id"] for item in items]
+
+
+def test_lookups() -> None:
+    catalog = ArtCatalog(CONTENT_LIST)
+    assert len(catalog) == 3
+    assert "MY_F0001" in catalog
+    assert catalog.get("SAM-S0001") is CONTENT_LIST[2]
+    assert _ids(catalog.items("MY-C0002")) == ["MY_F0001", "MY_F0002"]
+    assert catalog.items("MY-C0008") == []
+    assert _ids(catalog.with_matte("none")) == ["MY_F0001", "SAM-S0001"]
+    assert _ids(catalog.favourites()) == ["MY_F0002"]
+
+
+def test_events() -> None:
+    catalog = ArtCatalog(CONTENT_LIST)
+    catalog.apply_event(
+        {"event": "favorite_changed", "content_id": "MY_F0001", "status": "on"}
+    )
+    assert _ids(catalog.favourites()) == ["MY_F0002", "MY_F0001"]
+    assert "favorite" not in CONTENT_LIST[0]
+
+    catalog.apply_event(
+        {
+            "event": "image_deleted",
+            "content_id_list": json.dumps([{"content_id": "MY_F0002"}]),
+        }
+    )
+    assert _ids(catalog.items("MY-C0002")) == ["MY_F0001"]
+    assert _ids(catalog.with_matte("shadowbox_polar")) == []
+    assert not catalog.stale
+
+    catalog.apply_event({"event": "image_added", "content_id": "MY_F0003"})
+    assert catalog.stale
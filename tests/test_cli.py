@@ -0,0 +1,431 @@
+"""Tests for cli module."""
+
+import functools
+import http.server
+import importlib
+import json
+import os
+import stat
+import subprocess
+import sys
+import tarfile
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from typer.main import get_command_name
+from typer.testing import CliRunner
+
+from samsungtvws import exceptions
+from samsungtvws.art import ImagePreprocessor, SamsungTVArt, UploadIndex
+from samsungtvws.cli import cli
+from samsungtvws.cli.art import _ArtSyncState, _upload_index_path
+from samsungtvws.cli.daemon import DaemonServer, forward_to_daemon, run_command
+from samsungtvws.cli.main import COMMAND_MODULES
+from samsungtvws.simulator import SamsungTVSimulatorFarm
+
+
+def test_import_is_lazy() -> None:
+    code = (
+        "import sys, samsungtvws, samsungtvws.cli;"
+        "assert 'websocket' not in sys.modules, 'websocket';"
+        "assert 'requests' not in sys.modules, 'requests';"
+        "assert 'samsungtvws.cli.art' not in sys.modules, 'cli.art';"
+        "assert samsungtvws.SamsungTVWS.__name__ == 'SamsungTVWS'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_command_modules_table() -> None:
+    for module, commands in COMMAND_MODULES.items():
+        importlib.import_module(f"samsungtvws.cli.{module}")
+        registered = {
+            info.name or get_command_name(info.callback.__name__)
+            for info in cli.registered_commands
+            if info.callback.__module__ == f"samsungtvws.cli.{module}"
+        }
+        assert registered == set(commands), module
+
+
+def test_lazy_commands() -> None:
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--host", "tv", "--no-print-token", "--help"])
+    assert result.exit_code == 0
+    assert "art-upload" in result.output
+    assert "wol" in result.output
+
+    result = runner.invoke(cli, ["--host", "tv", "--no-print-token", "wol", "--help"])
+    assert result.exit_code == 0
+    assert "TV MAC address" in result.output
+
+
+@pytest.fixture(name="farm")
+def get_farm():
+    with SamsungTVSimulatorFarm(1) as farm:
+        yield farm
+
+
+@pytest.fixture(autouse=True)
+def override_asyncio_sleep():
+    """The simulator does real network I/O: keep asyncio.sleep working."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep upload indexes and preprocessed images out of the user's cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+def test_daemon(farm: SamsungTVSimulatorFarm, tmp_path, capsys) -> None:
+    tv = farm[0]
+    path = str(tmp_path / "daemon.sock")
+    server = DaemonServer(path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        args = ["--host", "127.0.0.1", "--port", str(tv.port), "--key-press-delay", "0"]
+        assert forward_to_daemon([*args, "send-key", "KEY_HOME"], path) == 0
+        assert forward_to_daemon([*args, "send-key", "KEY_MENU"], path) == 0
+        assert forward_to_daemon([*args, "send-key"], path) == 2
+        assert "Missing argument" in capsys.readouterr().err
+        assert forward_to_daemon([*args, "daemon"], path) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert tv.keys == ["KEY_HOME", "KEY_MENU"]
+    assert tv.connections == 1
+    assert forward_to_daemon([*args, "send-key", "KEY_HOME"], path) is None
+
+
+def test_daemon_reconnects() -> None:
+    pool = Mock()
+    dropped = exceptions.ConnectionFailure("Connection is already closed.")
+    with patch("samsungtvws.cli.daemon.cli", side_effect=[dropped, None]) as cli_:
+        assert run_command(["send-key", "KEY_HOME"], {"pool": pool}) == (0, "", "")
+    assert cli_.call_count == 2
+    pool.close.assert_called_once()
+
+    # Once only
+    with patch("samsungtvws.cli.daemon.cli", side_effect=[dropped, dropped]):
+        code, _, stderr = run_command(["send-key", "KEY_HOME"], {"pool": pool})
+    assert code == 1
+    assert stderr == "ERROR: Connection is already closed.\n"
+
+
+def test_run_script(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    script = tmp_path / "script.txt"
+    script.write_text(
+        "# navigate\n"
+        "send-key KEY_HOME\n"
+        "send-key KEY_DOWN --times 2\n"
+        "\n"
+        "send-key KEY_ENTER  # select\n"
+        "art-mode --on\n"
+    )
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+    result = CliRunner().invoke(
+        cli, [*args, "--key-press-delay", "0", "run", "--script", str(script)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert tv.keys == ["KEY_HOME", "KEY_DOWN", "KEY_DOWN", "KEY_ENTER"]
+    assert tv.art_store.settings["artmode_status"] == "on"
+    # one remote connection shared by every command, plus the Art channel
+    assert tv.connections == 2
+    assert "4/4 commands" in result.output
+
+
+def test_run_script_failure() -> None:
+    result = CliRunner().invoke(
+        cli,
+        ["--host", "tv", "--no-print-token", "run", "--no-timing"],
+        input="unknown-command\nsend-key KEY_HOME\n",
+    )
+    assert result.exit_code == 1
+    assert "line 1: Invalid value: unknown command" in result.output
+    assert "KEY_HOME" not in result.output
+
+
+def test_art_sync_reuses_moved_files(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    library = tmp_path / "library"
+    (library / "sub").mkdir(parents=True)
+    (library / "a.jpg").write_bytes(b"image a")
+    (library / "b.jpg").write_bytes(b"image b")
+    (library / "notes.txt").write_text("not an image")
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+
+    def sync(*options: str) -> str:
+        result = CliRunner().invoke(cli, [*args, "art-sync", str(library), *options])
+        assert result.exit_code == 0, result.output
+        return result.output
+
+    assert "uploaded=2, skipped=0" in sync("--upload-all")
+    assert len(tv.art_store.artworks) == 2
+
+    # Renamed, and copied with a new mtime: nothing to upload or delete
+    (library / "a.jpg").rename(library / "sub" / "c.jpg")
+    (library / "d.jpg").write_bytes(b"image b")
+    output = sync("--sync-all")
+    assert "moved" in output
+    assert "copied" in output
+    assert "uploaded=0, skipped=3, deleted=0" in output
+    assert len(tv.art_store.artworks) == 2
+
+    # The copy keeps the artwork alive until it is gone too
+    (library / "b.jpg").unlink()
+    assert "deleted=0" in sync("--sync-all")
+    (library / "d.jpg").unlink()
+    assert "deleted=1" in sync("--sync-all")
+    assert len(tv.art_store.artworks) == 1
+
+
+def test_art_sync_state_journal(tmp_path) -> None:
+    path = str(tmp_path / "state.json")
+    state = _ArtSyncState(path, compact_every=3)
+    state["a.jpg"] = {"content_id": "MY_F0001"}
+    state["b.jpg"] = {"content_id": "MY_F0002"}
+    state["a.jpg"] = {"content_id": "MY_F0001"}  # unchanged, not journaled
+
+    # Interrupted before close: the journal alone carries the progress
+    with open(f"{path}.journal", "a", encoding="utf-8") as f:
+        f.write('{"path": "c.jp')
+    resumed = _ArtSyncState(path, compact_every=3)
+    assert dict(resumed) == {
+        "a.jpg": {"content_id": "MY_F0001"},
+        "b.jpg": {"content_id": "MY_F0002"},
+    }
+
+    assert not (tmp_path / "state.json.journal").exists()
+
+    # Compacted into the state file once enough changes pile up
+    resumed.pop("b.jpg")
+    resumed["c.jpg"] = {"content_id": "MY_F0003"}
+    assert (tmp_path / "state.json.journal").exists()
+    resumed.pop("c.jpg")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["files"] == {"a.jpg": {"content_id": "MY_F0001"}}
+    assert not (tmp_path / "state.json.journal").exists()
+
+    with resumed:
+        resumed["d.jpg"] = {"content_id": "MY_F0004"}
+    assert not (tmp_path / "state.json.journal").exists()
+    assert set(_ArtSyncState(path)) == {"a.jpg", "d.jpg"}
+
+
+def test_art_sync_reconciles_with_tv(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    for name in "abc":
+        (tmp_path / f"{name}.jpg").write_bytes(f"image {name}".encode())
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+    sync = [*args, "art-sync", str(tmp_path), "--sync-all"]
+    assert CliRunner().invoke(cli, sync).exit_code == 0
+    assert len(tv.art_store.artworks) == 3
+
+    # Deleted on the TV behind our back, and two files removed locally
+    stale_id = next(iter(tv.art_store.artworks))
+    tv.art_store.delete([stale_id])
+    (tmp_path / "b.jpg").unlink()
+    (tmp_path / "c.jpg").unlink()
+
+    result = CliRunner().invoke(cli, sync)
+    assert result.exit_code == 0, result.output
+    assert f"forgot {tmp_path / 'a.jpg'} -> {stale_id}" in result.output
+    assert "uploaded=1, skipped=0, deleted=2" in result.output
+    assert [item["data"] for item in tv.art_store.artworks.values()] == [b"image a"]
+
+
+def test_art_sync_preprocess(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    image = pytest.importorskip("PIL.Image")
+    library = tmp_path / "library"
+    library.mkdir()
+    for name, color in (("a.png", "red"), ("b.png", "blue")):
+        image.new("RGB", (4000, 3000), color).save(library / name)
+
+    tv = farm[0]
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+    result = CliRunner().invoke(
+        cli, [*args, "art-sync", str(library), "--upload-all", "--preprocess"]
+    )
+    assert result.exit_code == 0, result.output
+    assert len(tv.art_store.artworks) == 2
+    for artwork in tv.art_store.artworks.values():
+        assert artwork["file_type"] == "jpg"
+        assert artwork["data"].startswith(b"\xff\xd8")
+    assert len(list((tmp_path / "cache").rglob("*.jpg"))) == 2
+
+
+def test_art_upload_dedupe(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    image = tmp_path / "image.jpg"
+    image.write_bytes(b"\xff\xd8image")
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+
+    outputs = []
+    for options in ([], [], ["--no-dedupe"]):
+        result = CliRunner().invoke(cli, [*args, "art-upload", str(image), *options])
+        assert result.exit_code == 0, result.output
+        outputs.append(result.output)
+
+    assert outputs[0] == outputs[1]
+    assert outputs[2] != outputs[0]
+    assert len(tv.art_store.artworks) == 2
+
+
+def test_art_upload_dedupe_preprocessed(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    image = pytest.importorskip("PIL.Image")
+    library = tmp_path / "library"
+    library.mkdir()
+    image.new("RGB", (640, 480), "red").save(library / "image.png")
+    path = str(library / "image.png")
+    tv = farm[0]
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+
+    # Preprocessed by the library, with other settings than the CLI
+    with SamsungTVArt("127.0.0.1", port=tv.port) as art:
+        art.upload_index = UploadIndex(
+            _upload_index_path({"host": "127.0.0.1", "port": tv.port})
+        )
+        content_id = art.upload(path, preprocessor=ImagePreprocessor(quality=50))
+
+    # Preprocessed by the CLI before art.upload(): same index entry
+    result = CliRunner().invoke(cli, [*args, "art-upload", path, "--preprocess"])
+    assert result.exit_code == 0, result.output
+    assert f"OK: uploaded -> {content_id}" in result.output
+    result = CliRunner().invoke(
+        cli,
+        [*args, "art-sync", str(library), "--upload-all", "--preprocess", "--no-state"],
+    )
+    assert f"-> {content_id}" in result.output
+    assert len(tv.art_store.artworks) == 1
+
+
+def test_art_sync_refresh(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    (tmp_path / "a.jpg").write_bytes(b"\xff\xd8image a")
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+    sync = [*args, "art-sync", str(tmp_path), "--upload-all"]
+    # Without a state file, only the upload index skips the second transfer
+    for _ in range(2):
+        assert CliRunner().invoke(cli, [*sync, "--no-state"]).exit_code == 0
+    assert len(tv.art_store.artworks) == 1
+
+    result = CliRunner().invoke(cli, [*sync, "--refresh"])
+    assert result.exit_code == 0, result.output
+    assert "uploaded=1" in result.output
+    assert len(tv.art_store.artworks) == 2
+
+
+def test_art_progress(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    library = tmp_path / "library"
+    library.mkdir()
+    (library / "a.jpg").write_bytes(b"\xff\xd8a")
+    (library / "b.jpg").write_bytes(b"\xff\xd8b")
+    args = ["--host", "127.0.0.1", "--port", str(farm[0].port), "--no-print-token"]
+
+    result = CliRunner().invoke(
+        cli, [*args, "art-sync", str(library), "--upload-all", "--progress"]
+    )
+    assert result.exit_code == 0, result.output
+    assert f"[2/2] {library / 'b.jpg'}" in result.stderr
+
+    # Off by default when stderr is not a terminal
+    (library / "c.jpg").write_bytes(b"\xff\xd8c")
+    result = CliRunner().invoke(cli, [*args, "art-sync", str(library), "--upload-all"])
+    assert result.exit_code == 0, result.output
+    assert result.stderr == ""
+
+
+def test_art_export(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    for index in range(3):
+        tv.art_store.add(b"\xff\xd8" + bytes([index]))
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+
+    dest = tmp_path / "backup.tar.gz"
+    result = CliRunner().invoke(
+        cli, [*args, "art-export", str(dest), "--chunk-size", "2"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "OK: exported 3 artworks" in result.output
+    with tarfile.open(dest) as tar:
+        names = tar.getnames()
+        metadata = json.load(tar.extractfile("metadata.json"))
+        thumbnail = tar.extractfile("thumbnails/MY_F0002.jpg").read()
+    assert names[0] == "metadata.json"
+    assert len(names) == 4
+    assert [item["content_id"] for item in metadata["content_list"]] == [
+        "MY_F0001",
+        "MY_F0002",
+        "MY_F0003",
+    ]
+    assert thumbnail == b"\xff\xd8\x01"
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_art_rotate(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    library = tmp_path / "library"
+    library.mkdir()
+    for name in ("a.jpg", "b.jpg"):
+        (library / name).write_bytes(b"\xff\xd8" + name.encode())
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+
+    result = CliRunner().invoke(
+        cli,
+        [*args, "art-rotate", str(library), "--interval", "0", "--count", "3"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "OK: rotating 2 images every 0s" in result.output
+    assert len(tv.art_store.artworks) == 2
+    assert f"OK: stopped on {tv.art_store.current}" in result.output
+
+
+@pytest.mark.parametrize("aiohttp_session", [True, False])
+def test_art_upload_urls(
+    farm: SamsungTVSimulatorFarm, tmp_path, monkeypatch, aiohttp_session: bool
+) -> None:
+    if not aiohttp_session:
+        monkeypatch.setattr(
+            "samsungtvws.cli.art_pipeline._client_session", lambda: None
+        )
+    tv = farm[0]
+    (tmp_path / "a.png").write_bytes(b"\x89PNGa")
+    (tmp_path / "b").write_bytes(b"\xff\xd8b")
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(
+            http.server.SimpleHTTPRequestHandler, directory=str(tmp_path)
+        ),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    args = ["--host", "127.0.0.1", "--port", str(tv.port), "--no-print-token"]
+
+    try:
+        result = CliRunner().invoke(
+            cli,
+            [
+                *args,
+                "art-upload",
+                *("--url", f"{base}/a.png"),
+                *("--url", f"{base}/missing.jpg"),
+                *("--url", f"{base}/b"),
+            ],
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result.exit_code == 1, result.output
+    assert f"OK: uploaded {base}/a.png -> MY_F0001" in result.output
+    assert f"ERROR: failed to upload {base}/missing.jpg" in result.stderr
+    assert f"OK: uploaded {base}/b -> MY_F0002" in result.output
+    artworks = tv.art_store.artworks
+    assert artworks["MY_F0001"]["file_type"] == "png"
+    assert artworks["MY_F0002"]["data"] == b"\xff\xd8b"
@@ -0,0 +1,98 @@
+"""Tests for the D2D transfer engine."""
+
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from samsungtvws import exceptions
+from samsungtvws.art.d2d import (
+    AsyncD2DTransfer,
+    D2DTransfer,
+    ProgressMonitor,
+    file_name,
+)
+from samsungtvws.instrumentation import ConnectionStats
+
+HEADER = {"num": 0, "total": 1, "fileID": "MY_F0001", "fileType": "jpg"}
+DATA = bytes(range(256)) * 4000
+
+
+def test_send_and_recv_file() -> None:
+    left, right = socket.socketpair()
+    stats = ConnectionStats("d2d")
+    sent = []
+    received = []
+    sender = threading.Thread(
+        target=D2DTransfer(left, chunk_size=65536).send_file,
+        args=({**HEADER, "fileLength": len(DATA)}, DATA),
+        kwargs={"progress": lambda done, total: sent.append((done, total))},
+    )
+    sender.start()
+    with D2DTransfer(right, stats) as transfer:
+        header, data = transfer.recv_file(lambda done, total: received.append(done))
+    sender.join()
+    left.close()
+
+    assert file_name(header) == "MY_F0001.jpg"
+    assert data == DATA
+    assert sent[0] == (65536, len(DATA))
+    assert sent[-1] == (len(DATA), len(DATA))
+    assert received[-1] == len(DATA)
+    assert stats.d2d_bytes["recv"] == len(DATA)
+
+
+def test_progress_monitor(monkeypatch) -> None:
+    reports = []
+    now = [100.0]
+    monkeypatch.setattr("samsungtvws.art.d2d.time.monotonic", lambda: now[0])
+    monitor = ProgressMonitor(reports.append, "recv", window=1.0)
+
+    monitor.on_header({**HEADER, "num": 1, "total": 3})
+    for done in (1000, 2000, 4000):
+        now[0] += 0.5
+        monitor(done, 4000)
+
+    assert [report.name for report in reports] == ["MY_F0001.jpg"] * 3
+    assert [report.files_done for report in reports] == [1, 1, 2]
+    assert reports[-1].files_total == 3
+    # Measured over the last second only
+    assert reports[0].bytes_per_second == 2000
+    assert reports[-1].bytes_per_second == 3000
+
+
+def test_recv_closed() -> None:
+    left, right = socket.socketpair()
+    left.sendall(b"\x00\x00")
+    left.close()
+    with D2DTransfer(right) as transfer, pytest.raises(exceptions.ConnectionFailure):
+        transfer.recv_file()
+
+
+@pytest.mark.asyncio
+async def test_async_transfer() -> None:
+    received = asyncio.get_running_loop().create_future()
+
+    async def _serve(reader, writer) -> None:
+        transfer = AsyncD2DTransfer(reader, writer)
+        header, data = await transfer.recv_file()
+        await transfer.send_file(header, data[::-1])
+        received.set_result(data)
+
+    server = await asyncio.start_server(_serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    progress = []
+    async with server:
+        conn_info = {"ip": "127.0.0.1", "port": port, "secured": False}
+        async with await AsyncD2DTransfer.connect(conn_info, timeout=5) as transfer:
+            header = {**HEADER, "fileLength": len(DATA)}
+            await transfer.send_file(
+                header, DATA, lambda done, _: progress.append(done)
+            )
+            echoed_header, echoed = await transfer.recv_file()
+
+    assert await received == DATA
+    assert echoed_header == header
+    assert echoed == DATA[::-1]
+    assert progress[-1] == len(DATA)
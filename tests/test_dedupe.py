@@ -0,0 +1,56 @@
+"""Tests for art upload deduplication."""
+
+import io
+
+import pytest
+
+from samsungtvws.art.dedupe import UploadIndex, perceptual_hash
+
+
+def test_upload_index(tmp_path) -> None:
+    path = str(tmp_path / "index.json")
+    index = UploadIndex(path)
+    index.add(b"image a", "MY_F0001")
+    index.add(b"image b", "MY_F0002")
+    assert index.lookup(b"image a") == "MY_F0001"
+    assert index.lookup(b"image c") is None
+
+    loaded = UploadIndex(path)
+    assert loaded.content_ids() == {"MY_F0001", "MY_F0002"}
+    loaded.retain(["MY_F0002", "MY_F0003"])
+    assert loaded.lookup(b"image a") is None
+    assert UploadIndex(path).content_ids() == {"MY_F0002"}
+
+
+def test_invalid_index_file(tmp_path) -> None:
+    path = tmp_path / "index.json"
+    path.write_text("{")
+    assert len(UploadIndex(str(path))) == 0
+
+
+def test_thumbnails() -> None:
+    image = pytest.importorskip("PIL.Image")
+
+    def encode(size: tuple[int, int], quality: int) -> bytes:
+        picture = image.effect_mandelbrot(size, (-2.0, -1.0, 1.0, 1.0), 64)
+        output = io.BytesIO()
+        picture.save(output, format="JPEG", quality=quality)
+        return output.getvalue()
+
+    original = encode((1920, 1080), 95)
+    thumbnail = encode((320, 180), 60)
+    assert perceptual_hash(original) == perceptual_hash(thumbnail)
+
+    index = UploadIndex()
+    index.add_thumbnails({"MY_F0007.jpg": thumbnail})
+    assert index.without_thumbnail(["MY_F0007", "MY_F0008"]) == ["MY_F0008"]
+    # Exact matches only, unless similar images are asked for
+    assert index.lookup(original) is None
+    index.match_similar = True
+    assert index.lookup(original) == "MY_F0007"
+    assert index.lookup(encode((1920, 1080), 95)[::-1]) is None
+
+    flipped = image.open(io.BytesIO(original)).rotate(180)
+    output = io.BytesIO()
+    flipped.save(output, format="JPEG")
+    assert index.lookup(output.getvalue()) is None
@@ -0,0 +1,115 @@
+"""SamsungTV Encrypted."""
+
+import asyncio
+import time
+from unittest.mock import Mock, call, patch
+
+import pytest
+from websockets.asyncio.client import ClientConnection
+from websockets.exceptions import ConnectionClosed
+
+from samsungtvws.encrypted.remote import SamsungTVEncryptedWSAsyncRemote, SendRemoteKey
+
+TOKEN = "037739871315caef138547b03e348b72"
+SESSION_ID = "1"
+
+
+def create_future_with_result(result) -> asyncio.Future:
+    future = asyncio.Future()
+    future.set_result(result)
+    return future
+
+
+@pytest.mark.asyncio
+async def test_send_commands_pipelined() -> None:
+    connection = Mock(ClientConnection)
+    connection.send = Mock(return_value=create_future_with_result(None))
+
+    remote = SamsungTVEncryptedWSAsyncRemote(
+        "1.2.3.4",
+        web_session=Mock(),
+        token=TOKEN,
+        session_id=SESSION_ID,
+        key_press_delay=0,
+    )
+    remote._connection = connection
+
+    with patch(
+        "samsungtvws.encrypted.remote.asyncio.sleep",
+        return_value=create_future_with_result(None),
+    ) as patch_sleep:
+        await remote.send_commands(
+            [SendRemoteKey.click("KEY_DOWN"), SendRemoteKey.click("KEY_DOWN")]
+        )
+
+    patch_sleep.assert_not_called()
+    assert connection.send.call_count == 2
+    assert connection.send.call_args_list[0] == connection.send.call_args_list[1]
+
+
+@pytest.mark.asyncio
+async def test_send_commands_spacing() -> None:
+    connection = Mock(ClientConnection)
+    connection.send = Mock(return_value=create_future_with_result(None))
+
+    remote = SamsungTVEncryptedWSAsyncRemote(
+        "1.2.3.4", web_session=Mock(), token=TOKEN, session_id=SESSION_ID
+    )
+    remote._connection = connection
+
+    with (
+        patch("samsungtvws.encrypted.remote.time.monotonic", return_value=100.0),
+        patch(
+            "samsungtvws.encrypted.remote.asyncio.sleep",
+            return_value=create_future_with_result(None),
+        ) as patch_sleep,
+    ):
+        await remote.send_commands(
+            [SendRemoteKey.click("KEY_UP"), SendRemoteKey.click("KEY_DOWN")]
+        )
+
+    # Only the gap between the two frames is waited, not after the last one
+    assert patch_sleep.call_args_list == [call(1.0)]
+    assert connection.send.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_is_answered() -> None:
+    connection = Mock(ClientConnection)
+    connection.recv = Mock(
+        side_effect=[
+            create_future_with_result("1::"),
+            create_future_with_result("2::"),
+            ConnectionClosed(None, None),
+        ]
+    )
+    connection.send = Mock(return_value=create_future_with_result(None))
+
+    remote = SamsungTVEncryptedWSAsyncRemote(
+        "1.2.3.4", web_session=Mock(), token=TOKEN, session_id=SESSION_ID
+    )
+    await remote._do_start_listening(connection)
+
+    connection.send.assert_called_once_with("2::")
+
+
+@pytest.mark.asyncio
+async def test_liveness_reconnects_stale_channel() -> None:
+    connection = Mock(ClientConnection)
+    connection.close = Mock(return_value=create_future_with_result(None))
+
+    remote = SamsungTVEncryptedWSAsyncRemote(
+        "1.2.3.4", web_session=Mock(), token=TOKEN, session_id=SESSION_ID
+    )
+    remote._connection = connection
+    remote._last_seen = time.monotonic() - 3600
+
+    async def _open() -> None:
+        remote._connection = Mock(ClientConnection)
+
+    with patch.object(remote, "_open", side_effect=_open) as patch_open:
+        await remote._check_liveness()
+
+    patch_open.assert_called_once()
+    connection.close.assert_called_once()
+    assert remote._connection is not connection
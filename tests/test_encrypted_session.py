@@ -1,6 +1,7 @@
 """SamsungTV Encrypted."""
 
 import binascii
+from unittest.mock import patch
 
 from samsungtvws.encrypted.command import SamsungTVEncryptedCommand
 from samsungtvws.encrypted.session import SamsungTVEncryptedSession
@@ -52,3 +53,20 @@ def test_command_encryption() -> None:
         "5,234,89,212,194,79,28,96,94,86,240,99,19,152,34,38,237,222,8,185,142,127,"
         '73,181]"}]}'
     )
+
+
+def test_command_encryption_cache() -> None:
+    session = SamsungTVEncryptedSession(TOKEN, SESSION_ID, cache_size=1)
+    power = SamsungTVEncryptedCommand("POST", {"param3": "KEY_POWER"})
+    home = SamsungTVEncryptedCommand("POST", {"param3": "KEY_HOME"})
+
+    frame = session.encrypt_command(power)
+    with patch.object(session, "_encrypt") as encrypt:
+        assert session.encrypt_command(power) == frame
+        encrypt.assert_not_called()
+
+    # The oldest frame is evicted once the cache is full
+    session.encrypt_command(home)
+    with patch.object(session, "_encrypt", wraps=session._encrypt) as encrypt:
+        assert session.encrypt_command(power) == frame
+        encrypt.assert_called_once()
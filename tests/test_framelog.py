@@ -0,0 +1,45 @@
+"""Tests for framelog module."""
+
+import logging
+from unittest.mock import Mock
+
+import pytest
+
+from samsungtvws.framelog import format_frame, log_frame, set_frame_logging
+
+
+@pytest.fixture(autouse=True)
+def reset_frame_logging():
+    yield
+    set_frame_logging()
+
+
+def test_format_frame() -> None:
+    jpeg = b"\xff\xd8" + bytes(1000)
+    assert format_frame(jpeg).startswith("<1002 bytes sha1:")
+    assert format_frame(b'{"event": "x"}\n' + jpeg).startswith(
+        '{"event": "x"} + <1002 bytes sha1:'
+    )
+    assert format_frame({"binary": jpeg}).startswith('{"binary": "<1002 bytes')
+
+    set_frame_logging(max_length=10)
+    assert format_frame("a" * 20) == "aaaaaaaaaa... (20 chars)"
+    set_frame_logging(max_length=None)
+    assert format_frame("a" * 600) == "a" * 600
+
+    with pytest.raises(ValueError):
+        set_frame_logging(sample_every=0)
+
+
+def test_log_frame_guard_and_sampling() -> None:
+    logger = Mock(logging.Logger)
+    logger.isEnabledFor.return_value = False
+    log_frame(logger, "frame %s", b"data")
+    logger.debug.assert_not_called()
+
+    logger.isEnabledFor.return_value = True
+    set_frame_logging(sample_every=3)
+    for _ in range(6):
+        log_frame(logger, "frame %s", "data")
+    assert logger.debug.call_count == 2
+    assert str(logger.debug.call_args[0][1]) == "data"
@@ -0,0 +1,126 @@
+"""Tests for instrumentation module."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from samsungtvws import instrumentation
+from samsungtvws.art import SamsungTVArt
+from samsungtvws.instrumentation import (
+    BYTES_SENT,
+    FRAMES_RECEIVED,
+    HANDSHAKE_SECONDS,
+    CallbackHook,
+    ConnectionStats,
+    Histogram,
+    Trace,
+)
+from samsungtvws.remote import SamsungTVWS
+
+from .const import (
+    D2D_SERVICE_MESSAGE_OK_SAMPLE,
+    MS_CHANNEL_CONNECT_SAMPLE,
+    MS_CHANNEL_READY_SAMPLE,
+)
+
+
+def test_histogram() -> None:
+    histogram = Histogram((1, 2))
+    for value in (0.5, 1.5, 3):
+        histogram.observe(value)
+
+    result = histogram.as_dict()
+    assert result["count"] == 3
+    assert result["mean"] == pytest.approx(5 / 3)
+    assert (result["min"], result["max"]) == (0.5, 3)
+    assert list(result["buckets"].values()) == [1, 1, 1]
+    assert Histogram().as_dict()["min"] == 0.0
+
+
+def test_reconnects_and_failing_hook() -> None:
+    stats = ConnectionStats("tv")
+    stats.add_hook(CallbackHook(Mock(side_effect=RuntimeError)))
+    stats.record_handshake(0.1)
+    stats.record_handshake(0.2)
+    assert stats.connects == 2
+    assert stats.reconnects == 1
+
+
+def test_trace() -> None:
+    callback = Mock()
+    trace = Trace(callback)
+    with trace.span("upload", size=3):
+        with trace.span("request"):
+            pass
+        with pytest.raises(RuntimeError), trace.span("d2d_send"):
+            raise RuntimeError("reset")
+
+    assert [span.name for span in trace.spans] == ["request", "d2d_send", "upload"]
+    request, d2d_send, upload = trace.spans
+    assert request.parent is upload and upload.parent is None
+    assert d2d_send.error == "RuntimeError('reset')"
+    assert upload.duration >= request.duration + d2d_send.duration
+    assert set(trace.breakdown()) == {"upload", "request", "d2d_send"}
+    assert trace.as_list()[2]["attributes"] == {"size": 3}
+    assert callback.call_count == 3
+
+
+def test_remote_stats(connection: Mock) -> None:
+    connection.recv = Mock(side_effect=[MS_CHANNEL_CONNECT_SAMPLE])
+    callback = Mock()
+    hook = CallbackHook(callback)
+    instrumentation.add_hook(hook)
+    try:
+        tv = SamsungTVWS("127.0.0.1")
+        tv.send_key("KEY_HOME")
+    finally:
+        instrumentation.remove_hook(hook)
+
+    sent = connection.send.call_args[0][0]
+    assert tv.stats.connects == 1
+    assert tv.stats.frames_sent == 1
+    assert tv.stats.bytes_sent == len(sent)
+    assert tv.stats.frames_received == 1
+    assert tv.stats.bytes_received == len(MS_CHANNEL_CONNECT_SAMPLE)
+
+    metrics = {call[0][1] for call in callback.call_args_list}
+    assert {HANDSHAKE_SECONDS, BYTES_SENT, FRAMES_RECEIVED} <= metrics
+    assert callback.call_args[0][0] == tv.stats.connection
+
+
+def test_art_request_rtt(connection: Mock) -> None:
+    connection.recv.side_effect = [
+        MS_CHANNEL_CONNECT_SAMPLE,
+        MS_CHANNEL_READY_SAMPLE,
+        D2D_SERVICE_MESSAGE_OK_SAMPLE,
+    ]
+    with patch("samsungtvws.art.art.uuid.uuid4") as uuid4:
+        uuid4.return_value = "07e72228-7110-4655-aaa6-d81b5188c219"
+        tv_art = SamsungTVArt("127.0.0.1")
+        with tv_art.trace() as trace:
+            tv_art.set_artmode(True)
+
+    assert tv_art.stats.requests["set_artmode_status"].count == 1
+    assert [span.name for span in trace.spans] == ["request", "response"]
+    assert trace.spans[0].attributes == {"request": "set_artmode_status"}
+
+
+def test_prometheus_hook() -> None:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    stats = ConnectionStats("tv")
+    stats.add_hook(instrumentation.PrometheusHook(registry))
+    stats.record_frame_sent(10)
+    stats.record_request("get_api_version", 0.02)
+    # a second hook on the same registry reuses the metrics
+    instrumentation.PrometheusHook(registry).record(stats, BYTES_SENT, 5, {})
+
+    labels = {"connection": "tv"}
+    assert registry.get_sample_value("samsungtvws_bytes_sent_total", labels) == 15
+    assert (
+        registry.get_sample_value(
+            "samsungtvws_request_seconds_count",
+            {**labels, "request": "get_api_version"},
+        )
+        == 1
+    )
@@ -0,0 +1,150 @@
+"""Tests for macro module."""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.macro import SamsungTVMacro
+from samsungtvws.remote import SamsungTVWS, SendRemoteKey
+
+from .const import ED_APPS_LAUNCH_SAMPLE, MS_CHANNEL_CONNECT_SAMPLE
+
+MACRO_STEPS = [
+    {"key": "KEY_HOME"},
+    {"key": "KEY_DOWN", "times": 2, "delay": 0.2},
+    {"app": "3201606009684"},
+    {"wait_event": "ed.apps.launch", "timeout": 5},
+    {"hold": "KEY_ENTER", "seconds": 3},
+    {"sleep": 1.5},
+    {"text": "hello", "end": True},
+]
+
+
+def create_future_with_result(result) -> asyncio.Future:
+    future = asyncio.Future()
+    future.set_result(result)
+    return future
+
+
+def test_compile() -> None:
+    macro = SamsungTVMacro.compile(MACRO_STEPS, delay=0.5, name="test")
+    assert macro.name == "test"
+    assert len(macro) == 11
+
+    assert macro.steps[0].payload == SendRemoteKey.home().get_payload()
+    assert macro.steps[0].delay == 0.5
+    assert [step.delay for step in macro.steps[1:3]] == [0.2, 0.2]
+    assert macro.steps[4].wait_event == "ed.apps.launch"
+    assert macro.steps[4].timeout == 5
+    assert macro.steps[4].payload is None
+    assert macro.steps[5].payload == SendRemoteKey.press("KEY_ENTER").get_payload()
+    assert macro.steps[5].delay == 3
+    assert macro.steps[7].payload is None
+    assert macro.steps[7].delay == 1.5
+
+
+def test_compile_invalid_step() -> None:
+    with pytest.raises(ValueError):
+        SamsungTVMacro.compile([{"key": "KEY_HOME", "sleep": 1}])
+    with pytest.raises(ValueError):
+        SamsungTVMacro.compile([{"unknown": 1}])
+
+
+def test_load_json(tmp_path) -> None:
+    path = tmp_path / "macro.json"
+    path.write_text(json.dumps({"name": "nav", "delay": 0.1, "steps": MACRO_STEPS}))
+    macro = SamsungTVMacro.load(path)
+    assert macro.name == "nav"
+    assert macro.steps[0].delay == 0.1
+
+
+def test_load_yaml(tmp_path) -> None:
+    pytest.importorskip("yaml")
+    path = tmp_path / "macro.yaml"
+    path.write_text("steps:\n  - key: KEY_HOME\n  - sleep: 2\n")
+    macro = SamsungTVMacro.load(path)
+    assert len(macro) == 2
+    assert macro.steps[1].delay == 2
+
+
+def test_load_invalid_yaml(tmp_path) -> None:
+    pytest.importorskip("yaml")
+    path = tmp_path / "macro.yaml"
+    path.write_text("steps: [key: KEY_HOME\n")
+    with pytest.raises(ValueError, match="Invalid YAML"):
+        SamsungTVMacro.load(path)
+
+
+def test_run_macro(connection: Mock) -> None:
+    connection.recv.side_effect = [MS_CHANNEL_CONNECT_SAMPLE, ED_APPS_LAUNCH_SAMPLE]
+    macro = SamsungTVMacro.compile(
+        [
+            {"key": "KEY_HOME"},
+            {"app": "3201606009684"},
+            {"wait_event": "ed.apps.launch", "timeout": 5},
+            {"sleep": 2},
+            {"key": "KEY_ENTER"},
+        ]
+    )
+
+    tv = SamsungTVWS("127.0.0.1")
+    with patch("samsungtvws.remote.time.sleep") as patch_sleep:
+        tv.run_macro(macro)
+
+    assert connection.send.call_count == 3
+    assert connection.send.call_args_list[0].args[0] == macro.steps[0].payload
+    assert connection.send.call_args_list[2].args[0] == macro.steps[4].payload
+    assert connection.recv.call_count == 2
+    assert tv.stats.frames_sent == 3
+    # home -> app (1s), app -> wait (1s), sleep (2s), never more than requested
+    assert patch_sleep.call_count == 3
+    assert all(0 < c.args[0] <= 2 for c in patch_sleep.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_run_macro_async(async_connection: Mock) -> None:
+    async_connection.recv = Mock(
+        side_effect=[
+            create_future_with_result(MS_CHANNEL_CONNECT_SAMPLE),
+            create_future_with_result(ED_APPS_LAUNCH_SAMPLE),
+        ]
+    )
+    async_connection.send = Mock(return_value=create_future_with_result(None))
+    macro = SamsungTVMacro.compile(
+        [
+            {"app": "3201606009684", "delay": 0},
+            {"wait_event": "ed.apps.launch", "timeout": 5},
+            {"key": "KEY_ENTER", "delay": 0},
+        ]
+    )
+
+    tv = SamsungTVWSAsyncRemote("127.0.0.1")
+    await tv.run_macro(macro)
+
+    assert async_connection.send.call_count == 2
+    assert async_connection.recv.call_count == 2
+
+
+def test_schedule() -> None:
+    macro = SamsungTVMacro.compile(
+        [
+            {"key": "KEY_HOME"},
+            {"wait_event": "ed.apps.launch", "delay": 0.5},
+            {"key": "KEY_ENTER", "delay": 0},
+            {"key": "KEY_ENTER"},
+        ]
+    )
+
+    # Each step takes 0.25s to run, the wait_event one 10s
+    clock = [100.0]
+    with patch("samsungtvws.macro.time.monotonic", side_effect=lambda: clock[0]):
+        delays = []
+        for delay, step in macro.schedule(key_press_delay=1):
+            delays.append(delay)
+            clock[0] += delay + (10 if step.wait_event else 0.25)
+
+    # The send time is taken out of the delay, the clock restarts after the event
+    assert delays == [0, 0.75, 0.5, 0]
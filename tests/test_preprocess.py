@@ -0,0 +1,69 @@
+"""Tests for art image preprocessing."""
+
+import io
+import os
+
+import pytest
+
+from samsungtvws.art.preprocess import ImagePreprocessor
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _image_bytes(width: int, height: int, image_format: str = "PNG") -> bytes:
+    image = Image.new("RGBA" if image_format == "PNG" else "RGB", (width, height))
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    output = io.BytesIO()
+    image.save(output, format=image_format, exif=exif)
+    return output.getvalue()
+
+
+def _open(data: bytes):
+    return Image.open(io.BytesIO(data))
+
+
+def test_shrink_to_panel(tmp_path) -> None:
+    preprocessor = ImagePreprocessor(quality=80, cache_dir=str(tmp_path))
+
+    landscape = _open(preprocessor.process(_image_bytes(7680, 4000)))
+    assert landscape.format == "JPEG"
+    assert landscape.size == (3840, 2000)
+    assert not landscape.getexif()
+
+    portrait = _open(preprocessor.process(_image_bytes(3000, 6000, "JPEG")))
+    assert portrait.size == (1920, 3840)
+
+    # Never enlarged
+    small = _open(preprocessor.process(_image_bytes(640, 480)))
+    assert small.size == (640, 480)
+
+
+def test_cache(tmp_path) -> None:
+    preprocessor = ImagePreprocessor(cache_dir=str(tmp_path))
+    source = _image_bytes(800, 600)
+    first = preprocessor.process(source)
+    (cached,) = os.listdir(tmp_path)
+    assert cached.endswith("-3840x2160-q90.jpg")
+
+    (tmp_path / cached).write_bytes(b"cached")
+    assert preprocessor.process(source) == b"cached"
+    assert ImagePreprocessor(use_cache=False).process(source) == first
+
+
+def test_process_files_in_pool(tmp_path) -> None:
+    paths = []
+    for width in (400, 500, 600):
+        path = tmp_path / f"{width}.png"
+        path.write_bytes(_image_bytes(width, 300))
+        paths.append(str(path))
+
+    preprocessor = ImagePreprocessor(use_cache=False, max_workers=2)
+    results = list(preprocessor.process_files(paths))
+    assert [path for path, _ in results] == paths
+    assert [_open(data).size[0] for _, data in results] == [400, 500, 600]
+
+
+def test_invalid_quality() -> None:
+    with pytest.raises(ValueError):
+        ImagePreprocessor(quality=0)
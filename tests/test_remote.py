@@ -3,9 +3,12 @@
 from unittest.mock import Mock, call, patch
 
 import pytest
+from websocket import WebSocketTimeoutException
 
+from samsungtvws.command import SamsungTVWaitForEventCommand
+from samsungtvws.event import ED_APPS_LAUNCH_EVENT, MS_REMOTE_IME_START_EVENT
 from samsungtvws.exceptions import ConnectionFailure
-from samsungtvws.remote import SamsungTVWS
+from samsungtvws.remote import ChannelEmitCommand, SamsungTVWS, SendRemoteKey
 
 from .const import (
     ED_APPS_LAUNCH_SAMPLE,
@@ -110,3 +113,44 @@ def test_send_hold_key(connection: Mock) -> None:
 
     assert patch_sleep.call_count == 3
     assert patch_sleep.call_args_list == [call(1), call(3), call(1)]
+
+
+def test_send_wait_for_event(connection: Mock) -> None:
+    """Ensure a sequence waits for the TV event instead of sleeping."""
+    connection.recv.side_effect = [MS_CHANNEL_CONNECT_SAMPLE, ED_APPS_LAUNCH_SAMPLE]
+
+    tv = SamsungTVWS("127.0.0.1")
+    with patch("samsungtvws.connection.time.sleep") as patch_sleep:
+        tv.send_command(
+            [
+                ChannelEmitCommand.launch_app("3201606009684"),
+                SamsungTVWaitForEventCommand(ED_APPS_LAUNCH_EVENT, timeout=10),
+                SendRemoteKey.enter(),
+            ],
+            key_press_delay=0,
+        )
+
+    assert connection.send.call_count == 2
+    assert connection.recv.call_count == 2
+    assert patch_sleep.call_args_list == [call(0), call(0)]
+
+
+def test_send_wait_for_event_timeout(connection: Mock) -> None:
+    """Ensure the sequence goes on when the event never arrives."""
+    connection.recv.side_effect = [
+        MS_CHANNEL_CONNECT_SAMPLE,
+        WebSocketTimeoutException(),
+    ]
+
+    tv = SamsungTVWS("127.0.0.1")
+    with patch("samsungtvws.connection.time.sleep") as patch_sleep:
+        tv.send_command(
+            [
+                SamsungTVWaitForEventCommand(MS_REMOTE_IME_START_EVENT, timeout=1),
+                SendRemoteKey.enter(),
+            ],
+            key_press_delay=0,
+        )
+
+    assert connection.send.call_count == 1
+    assert patch_sleep.call_args_list == [call(0)]
@@ -0,0 +1,56 @@
+"""Tests for the Art rotation scheduler."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from samsungtvws import exceptions
+from samsungtvws.art.rotation import ArtRotator
+
+
+def test_run_recovers_from_failures() -> None:
+    art = Mock()
+    art.upload.side_effect = lambda path, **kwargs: f"id-{path}"
+    reset = exceptions.ConnectionFailure("reset")
+    art.select_image.side_effect = [
+        reset,
+        reset,
+        None,
+        exceptions.ResponseError("deleted"),
+        None,
+    ]
+    rotator = ArtRotator(art, ["a", "b"], interval=0, lookahead=1, show=False)
+
+    rotator.run(ticks=4)
+
+    # Not shown images are shown on the next tick, deleted ones skipped
+    assert [call.args[0] for call in art.select_image.call_args_list] == [
+        "id-a",
+        "id-a",
+        "id-a",
+        "id-b",
+        "id-a",
+    ]
+    assert art.close.call_count == 2
+    assert rotator.current == "id-a"
+    # "b" was uploaded again for its next pass
+    assert [call.args[0] for call in art.upload.call_args_list] == ["a", "b", "b"]
+
+
+def test_tick_reconnects() -> None:
+    art = Mock()
+    art.upload.side_effect = lambda path, **kwargs: f"id-{path}"
+    # The connection went idle and was dropped by the TV
+    art.select_image.side_effect = [exceptions.ConnectionFailure("closed"), None]
+    rotator = ArtRotator(art, ["a", "b"], interval=0, lookahead=1)
+
+    assert rotator.tick() == "id-a"
+    assert art.select_image.call_count == 2
+    art.close.assert_called_once()
+
+
+def test_arguments() -> None:
+    with pytest.raises(ValueError):
+        ArtRotator(Mock(), [], interval=60)
+    with pytest.raises(ValueError):
+        ArtRotator(Mock(), ["a"], interval=-1)
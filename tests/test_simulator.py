@@ -0,0 +1,251 @@
+"""Tests for simulator module."""
+
+import json
+
+import aiohttp
+import pytest
+
+from samsungtvws.art import ArtRotator, SamsungTVArt, UploadIndex
+from samsungtvws.async_remote import SamsungTVWSAsyncRemote
+from samsungtvws.encrypted.authenticator import SamsungTVEncryptedWSAsyncAuthenticator
+from samsungtvws.encrypted.remote import (
+    SamsungTVEncryptedWSAsyncRemote,
+    SendRemoteKey as SendEncryptedRemoteKey,
+)
+from samsungtvws.remote import SamsungTVWS, SendRemoteKey
+from samsungtvws.rest import SamsungTVRest
+from samsungtvws.simulator import (
+    NetworkConditions,
+    SamsungTVSimulator,
+    SamsungTVSimulatorFarm,
+)
+
+
+@pytest.fixture(autouse=True)
+def override_asyncio_sleep():
+    """Real network I/O: keep asyncio.sleep working."""
+    yield
+
+
+@pytest.fixture(name="farm")
+def get_farm():
+    with SamsungTVSimulatorFarm(2) as farm:
+        yield farm
+
+
+def test_farm_ports(farm: SamsungTVSimulatorFarm) -> None:
+    assert len(farm) == 2
+    assert len(set(farm.ports)) == 2
+    assert all(farm.ports)
+
+
+def test_remote_and_rest(farm: SamsungTVSimulatorFarm) -> None:
+    tv = farm[0]
+    with SamsungTVWS("127.0.0.1", port=tv.port, key_press_delay=0) as remote:
+        remote.send_command(SendRemoteKey.click("KEY_HOME"))
+        apps = remote.app_list()
+        assert remote.token == tv.token
+
+    assert apps and {app["appId"] for app in apps} == set(tv.apps)
+    assert tv.keys == ["KEY_HOME"]
+    assert farm[1].keys == []
+
+    rest = SamsungTVRest("127.0.0.1", port=tv.port)
+    assert rest.rest_device_info()["device"]["FrameTVSupport"] == "true"
+    rest.rest_app_run("111299001912")
+    assert rest.rest_app_status("111299001912")["running"] is True
+
+
+def test_recorded_frames() -> None:
+    with SamsungTVSimulatorFarm(1, frames_dir="tests/fixtures") as farm:
+        tv = farm[0]
+        with SamsungTVWS("127.0.0.1", port=tv.port, key_press_delay=0) as remote:
+            apps = remote.app_list()
+            assert remote.token == tv.token
+        with SamsungTVArt("127.0.0.1", port=tv.port) as art:
+            assert art.available() == []
+
+    # Replayed from tests/fixtures/event_ed_installedApp_get.json
+    assert apps and [app["name"] for app in apps] == ["YouTube", "Deezer"]
+
+
+def test_art_upload_trace(farm: SamsungTVSimulatorFarm) -> None:
+    with SamsungTVArt("127.0.0.1", port=farm[0].port, key_press_delay=0) as art:
+        with art.trace() as trace:
+            art.upload(b"\xff\xd8image", file_type="jpg")
+
+    upload = trace.find("upload")[0]
+    assert trace.spans[-1] is upload
+    phases = [span.name for span in trace.spans if span.parent is upload]
+    assert phases == [
+        "api_version",
+        "request",
+        "ready_to_use",
+        "d2d_connect",
+        "d2d_send",
+        "image_added",
+    ]
+    assert trace.find("d2d_send")[0].attributes == {"size": 7}
+
+
+def test_art_upload(farm: SamsungTVSimulatorFarm) -> None:
+    tv = farm[0]
+    with SamsungTVArt("127.0.0.1", port=tv.port, key_press_delay=0) as art:
+        assert art.supported()
+        content_id = art.upload(b"\xff\xd8image", file_type="jpg")
+        assert [item["content_id"] for item in art.available()] == [content_id]
+        assert art.get_thumbnail(content_id) == b"\xff\xd8image"
+        art.select_image(content_id)
+        assert art.get_current()["content_id"] == content_id
+        art.set_artmode("on")
+        assert art.get_artmode() == "on"
+        assert art.delete(content_id)
+
+    assert tv.art_store.artworks == {}
+
+
+def test_art_catalog(farm: SamsungTVSimulatorFarm) -> None:
+    tv = farm[0]
+    first = tv.art_store.add(b"first")
+    with SamsungTVArt("127.0.0.1", port=tv.port, key_press_delay=0) as art:
+        assert [item["content_id"] for item in art.available()] == [first]
+        second = art.upload(b"\xff\xd8image", file_type="jpg")
+        art.set_favourite(second)
+        assert art.delete(first)
+
+        # One refetch, after image_added, the other events update the cache
+        assert [item["content_id"] for item in art.catalog().favourites()] == [second]
+        assert [item["content_id"] for item in art.available("MY-C0002")] == [second]
+        assert art.stats.requests["get_content_list"].count == 2
+
+
+def test_art_upload_index(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    path = str(tmp_path / "index.json")
+    with SamsungTVArt("127.0.0.1", port=tv.port, key_press_delay=0) as art:
+        art.upload_index = UploadIndex(path)
+        content_id = art.upload(b"\xff\xd8image", file_type="jpg")
+        assert art.upload(b"\xff\xd8image", file_type="jpg") == content_id
+        assert len(tv.art_store.artworks) == 1
+
+        # Another client, another run: the index is loaded from disk
+        art.upload_index = UploadIndex(path)
+        assert art.upload(bytearray(b"\xff\xd8image")) == content_id
+        assert art.delete(content_id)
+        assert len(art.upload_index) == 0
+        assert art.upload(b"\xff\xd8image") != content_id
+
+    assert len(tv.art_store.artworks) == 1
+
+
+def test_art_progress(farm: SamsungTVSimulatorFarm) -> None:
+    sent = []
+    received = []
+    with SamsungTVArt("127.0.0.1", port=farm[0].port, key_press_delay=0) as art:
+        content_id = art.upload(
+            b"\xff\xd8" * 300000, file_type="jpg", progress=sent.append
+        )
+        art.get_thumbnail([content_id, content_id], progress=received.append)
+
+    assert sent[-1].direction == "send"
+    assert sent[-1].bytes_done == sent[-1].bytes_total == 600000
+    assert (sent[-1].files_done, sent[-1].files_total) == (1, 1)
+    assert len(sent) > 1
+    assert [report.files_done for report in received][-1] == 2
+    assert {report.files_total for report in received} == {2}
+
+
+def test_art_export_library(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    for index in range(5):
+        tv.art_store.add(b"\xff\xd8" + bytes([index]) * 1000)
+    reports = []
+    with SamsungTVArt("127.0.0.1", port=tv.port, key_press_delay=0) as art:
+        count = art.export_library(
+            str(tmp_path / "backup"), chunk_size=2, progress=reports.append
+        )
+
+    assert count == 5
+    thumbnails = sorted((tmp_path / "backup" / "thumbnails").iterdir())
+    assert [path.name for path in thumbnails][-1] == "MY_F0005.jpg"
+    assert thumbnails[-1].read_bytes() == tv.art_store.artworks["MY_F0005"]["data"]
+    metadata = json.loads((tmp_path / "backup" / "metadata.json").read_text())
+    assert len(metadata["content_list"]) == 5
+    assert [report.files_done for report in reports if report.bytes_done] == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+    assert {report.files_total for report in reports} == {5}
+
+
+def test_art_rotator(farm: SamsungTVSimulatorFarm, tmp_path) -> None:
+    tv = farm[0]
+    images = []
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        path = tmp_path / name
+        path.write_bytes(b"\xff\xd8" + name.encode())
+        images.append(str(path))
+
+    with SamsungTVArt("127.0.0.1", port=tv.port, key_press_delay=0) as art:
+        rotator = ArtRotator(art, images, interval=0, lookahead=1)
+        shown = [rotator.tick()]
+        # The next image is uploaded ahead of its tick
+        assert len(tv.art_store.artworks) == 2
+        shown += [rotator.tick() for _ in range(3)]
+
+    assert shown == ["MY_F0001", "MY_F0002", "MY_F0003", "MY_F0001"]
+    assert len(tv.art_store.artworks) == 3
+    assert tv.art_store.current == "MY_F0001"
+
+
+@pytest.mark.asyncio
+async def test_async_remote() -> None:
+    async with SamsungTVSimulator() as tv:
+        remote = SamsungTVWSAsyncRemote("127.0.0.1", port=tv.port, key_press_delay=0)
+        await remote.start_listening()
+        await remote.send_command(SendRemoteKey.click("KEY_VOLUP"))
+        assert await remote.app_list()
+        await remote.close()
+
+    assert tv.keys == ["KEY_VOLUP"]
+
+
+@pytest.mark.asyncio
+async def test_encrypted_pairing() -> None:
+    async with SamsungTVSimulator(pin="0997") as tv, aiohttp.ClientSession() as web:
+        authenticator = SamsungTVEncryptedWSAsyncAuthenticator(
+            "127.0.0.1", web_session=web, port=tv.port
+        )
+        await authenticator.start_pairing()
+        assert tv.pairing.pin_page_running
+        assert await authenticator.try_pin("1234") is None
+        token = await authenticator.try_pin("0997")
+        assert token
+        session_id = await authenticator.get_session_id_and_close()
+        assert not tv.pairing.pin_page_running
+
+        remote = SamsungTVEncryptedWSAsyncRemote(
+            "127.0.0.1",
+            web_session=web,
+            token=token,
+            session_id=session_id,
+            port=tv.port,
+            key_press_delay=0,
+        )
+        await remote.start_listening()
+        await remote.send_command(SendEncryptedRemoteKey.click("KEY_POWEROFF"))
+        await remote.close()
+
+    assert tv.keys == ["KEY_POWEROFF"]
+
+
+def test_network_conditions() -> None:
+    conditions = NetworkConditions(latency=0.1, jitter=0.05, seed=1)
+    assert all(0.05 <= conditions.delay() <= 0.15 for _ in range(100))
+    assert not NetworkConditions().should_disconnect()
+    assert NetworkConditions(disconnect_rate=1).should_disconnect()
+    with pytest.raises(ValueError):
+        NetworkConditions(disconnect_rate=2)